@@ -5,6 +5,7 @@ from flask import Flask, request
 from flask_cors import CORS
 
 from routes import register_routes
+from src.utilities.card_popularity import warm_card_tiles_in_background
 from src.utilities.config import str_to_bool
 
 load_dotenv()
@@ -39,6 +40,13 @@ CORS(
 )
 
 
+@app.before_request
+def warm_card_tiles():
+    # Started by the first request rather than at import, so tests and
+    # scripts that import the app don't decode tiles they'll never use.
+    warm_card_tiles_in_background()
+
+
 @app.before_request
 def handle_preflight():
     if request.method == "OPTIONS":
@@ -1,3 +1,4 @@
+from .deck_sessions import deck_sessions_bp
 from .decklist_images import decklist_images_bp
 from .decklists import decklists_bp
 from .main import main_bp
@@ -7,3 +8,4 @@ def register_routes(app):
     app.register_blueprint(main_bp)
     app.register_blueprint(decklists_bp, url_prefix="/v1")
     app.register_blueprint(decklist_images_bp, url_prefix="/v1")
+    app.register_blueprint(deck_sessions_bp, url_prefix="/v1")
@@ -0,0 +1,94 @@
+import datetime
+import traceback
+
+from flask import Blueprint, jsonify, request
+
+from src.utilities.deck_session import deck_sessions
+
+deck_sessions_bp = Blueprint("deck-sessions", __name__)
+
+
+@deck_sessions_bp.route("/deck-sessions", methods=["POST"])
+def create_deck_session():
+    """Start a live-editing session; optional 'deltas' seed the deck."""
+    try:
+        if not request.is_json:
+            return jsonify({"error": "invalid request"}), 400
+
+        data = request.get_json()
+        if "decklist_type" not in data:
+            return jsonify({"error": "invalid request"}), 400
+
+        deltas = data.get("deltas", [])
+        if not isinstance(deltas, list):
+            return jsonify({"error": "invalid request"}), 400
+
+        session_id, session = deck_sessions.create(data["decklist_type"], deltas)
+        stats = session.to_json()
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "deck session created successfully",
+                    "data": {
+                        "session_id": session_id,
+                        **stats,
+                        "createdAt": datetime.datetime.now().isoformat(),
+                    },
+                }
+            ),
+            201,
+        )
+
+    except AssertionError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print(traceback.format_exc())
+        return (
+            jsonify({"status": "error", "message": "something unexpected happened"}),
+            500,
+        )
+
+
+@deck_sessions_bp.route("/deck-sessions/<session_id>/deltas", methods=["POST"])
+def apply_deck_session_deltas(session_id):
+    """Apply card add/remove deltas and return the updated deck statistics."""
+    try:
+        if not request.is_json:
+            return jsonify({"error": "invalid request"}), 400
+
+        data = request.get_json()
+        if not isinstance(data.get("deltas"), list):
+            return jsonify({"error": "invalid request"}), 400
+
+        stats = deck_sessions.apply_deltas(session_id, data["deltas"])
+        if stats is None:
+            return (
+                jsonify({"status": "error", "message": "deck session not found"}),
+                404,
+            )
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "deck session updated successfully",
+                    "data": {
+                        "session_id": session_id,
+                        **stats,
+                        "createdAt": datetime.datetime.now().isoformat(),
+                    },
+                }
+            ),
+            200,
+        )
+
+    except AssertionError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print(traceback.format_exc())
+        return (
+            jsonify({"status": "error", "message": "something unexpected happened"}),
+            500,
+        )
@@ -6,7 +6,9 @@ from dotenv import load_dotenv
 from flask import Blueprint, jsonify, request
 from supabase import Client, create_client
 
-from src.deck_generators import generate_webp
+from src.deck_generators import generate_proxy_pdf, generate_webp
+from src.utilities.card_popularity import card_image_stats
+from src.utilities.text_to_webp import IMAGE_FORMATS
 
 load_dotenv()
 
@@ -18,10 +20,23 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 decklist_images_bp = Blueprint("decklist-images", __name__)
 
 
+def requested_image_format(data: dict) -> str:
+    """
+    The deck image format the client asked for: the payload's "format", or
+    else the best match for its Accept header, or else WebP.
+    """
+    if data.get("format"):
+        return str(data["format"]).lower()
+    content_types = {
+        content_type: name for name, (_, content_type, _) in IMAGE_FORMATS.items()
+    }
+    best = request.accept_mimetypes.best_match(list(content_types))
+    return content_types.get(best, "webp")
+
+
 @decklist_images_bp.route("/generate-decklist-image", methods=["POST"])
 def generate_decklist():
-    """Take a deck payload and return a link to a webp file."""
-    file_path = None
+    """Take a deck payload and return a link to a deck image (webp by default)."""
     try:
         if not request.is_json:
             return jsonify({"error": "invalid request"}), 400
@@ -30,23 +45,31 @@ def generate_decklist():
         if "decklist" not in data or "decklist_type" not in data:
             return jsonify({"error": "invalid request"}), 400
 
-        # Generate WebP
-        filename, file_path = generate_webp(
+        # Generate the deck image
+        image_format = requested_image_format(data)
+        filename, image_bytes = generate_webp(
             data["decklist"],
             data["decklist_type"],
             n_card_columns=data.get("n_card_columns", 10),
             m_count=data.get("m_count", False),
             aod_count=data.get("aod_count", False),
             is_legal=data.get("is_legal"),
+            size=data.get("size", "full"),
+            card_width=data.get("card_width"),
+            image_format=image_format,
+            profile=data.get("profile", "balanced"),
+            layout=data.get("layout", "grid"),
         )
 
         # Upload to Supabase
-        with open(file_path, "rb") as webp_file:
-            supabase.storage.from_("decklists").upload(
-                path=filename,
-                file=webp_file,
-                file_options={"content-type": "image/webp", "upsert": "true"},
-            )
+        supabase.storage.from_("decklists").upload(
+            path=filename,
+            file=image_bytes,
+            file_options={
+                "content-type": IMAGE_FORMATS[image_format][1],
+                "upsert": "true",
+            },
+        )
 
         # Get public URL
         public_url = supabase.storage.from_("decklists").get_public_url(filename)
@@ -74,6 +97,84 @@ def generate_decklist():
             jsonify({"status": "error", "message": "something unexpected happened"}),
             500,
         )
-    finally:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+
+
+@decklist_images_bp.route("/generate-proxy-sheet", methods=["POST"])
+def generate_proxy_sheet():
+    """Take a deck payload and return a link to a printable proxy sheet pdf."""
+    try:
+        if not request.is_json:
+            return jsonify({"error": "invalid request"}), 400
+
+        data = request.get_json()
+        if "decklist" not in data or "decklist_type" not in data:
+            return jsonify({"error": "invalid request"}), 400
+
+        # Generate PDF
+        filename, pdf_bytes = generate_proxy_pdf(
+            data["decklist"],
+            data["decklist_type"],
+            include_reserve=data.get("include_reserve", True),
+        )
+
+        # Upload to Supabase
+        supabase.storage.from_("decklists").upload(
+            path=filename,
+            file=pdf_bytes,
+            file_options={"content-type": "application/pdf", "upsert": "true"},
+        )
+
+        # Get public URL
+        public_url = supabase.storage.from_("decklists").get_public_url(filename)
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "proxy sheet generated successfully",
+                    "data": {
+                        "filename": filename,
+                        "downloadUrl": public_url,
+                        "createdAt": datetime.datetime.now().isoformat(),
+                    },
+                }
+            ),
+            201,
+        )
+
+    except AssertionError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print(traceback.format_exc())
+        return (
+            jsonify({"status": "error", "message": "something unexpected happened"}),
+            500,
+        )
+
+
+@decklist_images_bp.route("/card-image-stats", methods=["GET"])
+def get_card_image_stats():
+    """Report the card tile cache, the pinned warm set and the most used cards."""
+    try:
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "card image stats retrieved successfully",
+                    "data": {
+                        **card_image_stats(top=int(request.args.get("top", 20))),
+                        "createdAt": datetime.datetime.now().isoformat(),
+                    },
+                }
+            ),
+            200,
+        )
+
+    except ValueError:
+        return jsonify({"error": "invalid request"}), 400
+    except Exception as e:
+        print(traceback.format_exc())
+        return (
+            jsonify({"status": "error", "message": "something unexpected happened"}),
+            500,
+        )
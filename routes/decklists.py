@@ -9,6 +9,7 @@ from supabase import Client, create_client
 from src.deck_generators import (
     calculate_aod_breakdown,
     calculate_aod_count,
+    generate_packet,
     generate_pdf,
 )
 
@@ -25,7 +26,6 @@ decklists_bp = Blueprint("decklists", __name__)
 @decklists_bp.route("/generate-decklist", methods=["POST"])
 def generate_decklist():
     """Take a deck payload and return a link to a deck check pdf."""
-    file_path = None
     try:
         if not request.is_json:
             return jsonify({"error": "invalid request"}), 400
@@ -35,7 +35,7 @@ def generate_decklist():
             return jsonify({"error": "invalid request"}), 400
 
         # Generate PDF
-        filename, file_path = generate_pdf(
+        filename, pdf_bytes = generate_pdf(
             data["decklist"],
             data["decklist_type"],
             name=data.get("name", ""),
@@ -47,12 +47,11 @@ def generate_decklist():
         )
 
         # Upload to Supabase
-        with open(file_path, "rb") as pdf_file:
-            supabase.storage.from_("decklists").upload(
-                path=filename,
-                file=pdf_file,
-                file_options={"content-type": "application/pdf", "upsert": "true"},
-            )
+        supabase.storage.from_("decklists").upload(
+            path=filename,
+            file=pdf_bytes,
+            file_options={"content-type": "application/pdf", "upsert": "true"},
+        )
 
         # Get public URL
         public_url = supabase.storage.from_("decklists").get_public_url(filename)
@@ -80,9 +79,59 @@ def generate_decklist():
             jsonify({"status": "error", "message": "something unexpected happened"}),
             500,
         )
-    finally:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+
+
+@decklists_bp.route("/generate-decklist-packet", methods=["POST"])
+def generate_decklist_packet():
+    """
+    Take an event's decklists and return a link to one PDF holding every
+    player's deck check sheet, in the order given.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({"error": "invalid request"}), 400
+
+        data = request.get_json()
+        if not isinstance(data.get("decklists"), list):
+            return jsonify({"error": "invalid request"}), 400
+
+        filename, pdf_bytes = generate_packet(
+            data["decklists"],
+            event=data.get("event", ""),
+        )
+
+        supabase.storage.from_("decklists").upload(
+            path=filename,
+            file=pdf_bytes,
+            file_options={"content-type": "application/pdf", "upsert": "true"},
+        )
+
+        public_url = supabase.storage.from_("decklists").get_public_url(filename)
+
+        return (
+            jsonify(
+                {
+                    "status": "success",
+                    "message": "decklist packet generated successfully",
+                    "data": {
+                        "filename": filename,
+                        "downloadUrl": public_url,
+                        "sheetCount": len(data["decklists"]),
+                        "createdAt": datetime.datetime.now().isoformat(),
+                    },
+                }
+            ),
+            201,
+        )
+
+    except AssertionError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        print(traceback.format_exc())
+        return (
+            jsonify({"status": "error", "message": "something unexpected happened"}),
+            500,
+        )
 
 
 @decklists_bp.route("/aod-count", methods=["POST"])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Script to build the raw pixel atlas of card tiles (see
+src/utilities/card_atlas.py): every card image decoded once, at each
+requested resolution level, and stored as raw RGB for the deck image
+renderer to memory-map.
+
+    python -m scripts.build_card_atlas --levels full half quarter
+
+Rebuild it after the card images change; tiles whose image has changed since
+are ignored (and decoded as usual) until then. The atlas is large (about
+3 GB at full resolution) and is not committed.
+"""
+
+import argparse
+from pathlib import Path
+
+from PIL import Image
+
+from src.utilities.card_atlas import (
+    CARD_ATLAS_FILE_BYTES,
+    CARD_ATLAS_FOLDER,
+    build_card_atlas,
+)
+from src.utilities.card_images import (
+    CARD_IMAGE_LEVELS,
+    DECKLIST_IMAGES_FOLDER,
+    card_level_folder,
+    downscale_card_image,
+)
+
+
+def atlas_tiles(levels: list):
+    """
+    Yield (image path, source image path, RGB tile) for every card image at
+    each of 'levels'. A level image that hasn't been built is downscaled from
+    the full image, as the renderer would.
+    """
+    image_files = sorted(Path(DECKLIST_IMAGES_FOLDER).glob("*.webp"))
+    for level in levels:
+        print(f"Decoding {len(image_files)} card images at {level} resolution...")
+        for full_path in image_files:
+            image_path = str(Path(card_level_folder(level)) / full_path.name)
+            source = image_path if Path(image_path).exists() else str(full_path)
+            try:
+                with Image.open(source) as image:
+                    tile = image.convert("RGB")
+            except Exception as e:
+                print(f"Error decoding {source}: {str(e)}")
+                continue
+            if source != image_path:
+                tile = downscale_card_image(tile, CARD_IMAGE_LEVELS[level])
+            yield image_path, source, tile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the card tile atlas.")
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        default=["full"],
+        choices=list(CARD_IMAGE_LEVELS),
+        help="resolution levels to include",
+    )
+    parser.add_argument("--output", default=CARD_ATLAS_FOLDER)
+    parser.add_argument(
+        "--file-mb",
+        type=int,
+        default=CARD_ATLAS_FILE_BYTES // (1024 * 1024),
+        help="size at which to start a new atlas file",
+    )
+    args = parser.parse_args()
+
+    if not Path(DECKLIST_IMAGES_FOLDER).exists():
+        print(f"Error: '{DECKLIST_IMAGES_FOLDER}' does not exist!")
+        return
+
+    count = build_card_atlas(
+        atlas_tiles(args.levels), args.output, args.file_mb * 1024 * 1024
+    )
+    print(f"Atlas of {count} tiles written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Script to build a tournament deck check packet: one PDF with every player's
+deck check sheet, for judges to print in one go.
+
+The source is either a directory of decklist .txt files (one per player, the
+player's name taken from the file name) or a .json file shaped like the
+/generate-decklist-packet request body: {"event": ..., "decklists": [...]}.
+
+    python -m scripts.generate_packet tmp/packet --event "Nationals" --type type_1
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from src.deck_generators import generate_packet
+
+
+def load_entries(source: Path, args: argparse.Namespace) -> tuple:
+    """Return (event, entries) for generate_packet from a directory or JSON file."""
+    if source.suffix == ".json":
+        with open(source, "r", encoding="utf-8") as file:
+            payload = json.load(file)
+        return payload.get("event", args.event), payload["decklists"]
+
+    entries = []
+    for decklist_file in sorted(source.glob("*.txt")):
+        entries.append(
+            {
+                "name": decklist_file.stem.replace("_", " "),
+                "decklist": decklist_file.read_text(encoding="utf-8"),
+                "decklist_type": args.type,
+                "show_alignment": args.show_alignment,
+                "m_count": args.m_count,
+                "aod_count": args.aod_count,
+            }
+        )
+    return args.event, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a deck check packet PDF.")
+    parser.add_argument("source", help="directory of .txt decklists or a .json file")
+    parser.add_argument("--event", default="", help="event name printed on each sheet")
+    parser.add_argument(
+        "--type",
+        default="type_1",
+        choices=["type_1", "type_2", "paragon"],
+        help="deck type of .txt decklists",
+    )
+    parser.add_argument("--output", default="tmp/packet.pdf")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("PACKET_WORKERS", os.cpu_count() or 1)),
+        help="worker processes preparing sheets (default: PACKET_WORKERS or CPUs)",
+    )
+    parser.add_argument("--show-alignment", action="store_true")
+    parser.add_argument("--m-count", action="store_true")
+    parser.add_argument("--aod-count", action="store_true")
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"Error: '{source}' does not exist!")
+        return
+
+    event, entries = load_entries(source, args)
+    if not entries:
+        print(f"Error: no decklists found in '{source}'")
+        return
+
+    print(f"Building a packet of {len(entries)} deck check sheets...")
+    _, pdf_bytes = generate_packet(entries, event=event, workers=args.workers)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(pdf_bytes)
+    print(f"Packet written to {output}")
+
+
+if __name__ == "__main__":
+    main()
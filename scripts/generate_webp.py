@@ -1,7 +1,10 @@
+import argparse
 from pathlib import Path
 
 from PIL import Image
 
+from src.utilities.card_images import CARD_IMAGE_LEVELS, downscale_card_image
+
 SOURCE_IMAGE_DIRECTORY = (
     "/Applications/LackeyCCGMac/plugins/Redemption/sets/setimages/general"
 )
@@ -62,6 +65,50 @@ def create_webp_file_dict(target_dir: str, carddata_filenames: set) -> dict:
     return webp_files
 
 
+def save_card_image_levels(
+    image: Image.Image, webp_filename: str, target_dir: str, quality: int = 50
+) -> int:
+    """
+    Save the downscaled resolution levels of a card image (half, quarter, ...)
+    into their subfolders of 'target_dir', skipping levels that already exist.
+
+    Returns:
+        int: Number of level images written
+    """
+    written = 0
+    for level, divisor in CARD_IMAGE_LEVELS.items():
+        if divisor == 1:
+            continue
+        level_path = Path(target_dir) / level / webp_filename
+        if level_path.exists():
+            continue
+        level_path.parent.mkdir(parents=True, exist_ok=True)
+        downscale_card_image(image, divisor).save(
+            level_path, "WebP", quality=quality, optimize=True
+        )
+        written += 1
+    return written
+
+
+def build_card_image_levels(target_dir: str, quality: int = 50) -> None:
+    """
+    Build any missing resolution levels for the .webp card images already in
+    'target_dir'.
+    """
+    webp_files = sorted(Path(target_dir).glob("*.webp"))
+    written = 0
+    for webp_file in webp_files:
+        try:
+            with Image.open(webp_file) as img:
+                written += save_card_image_levels(
+                    img.convert("RGB"), webp_file.name, target_dir, quality
+                )
+        except Exception as e:
+            print(f"Error building levels for {webp_file.name}: {str(e)}")
+
+    print(f"Built {written} level images for {len(webp_files)} card images")
+
+
 def convert_jpg_to_webp(
     source_dir: str,
     target_dir: str,
@@ -125,6 +172,9 @@ def convert_jpg_to_webp(
 
                 # Save as WebP
                 img.save(webp_path, "WebP", quality=quality, optimize=True)
+                save_card_image_levels(
+                    img.convert("RGB"), expected_webp_filename, target_dir, quality
+                )
                 print(f"Converted: {jpg_file.name} -> {expected_webp_filename}")
                 converted_count += 1
 
@@ -170,6 +220,20 @@ def normalize_filename_for_webp(original_filename: str, carddata_filenames: set)
 
 def main():
     """Main function to run the conversion process."""
+    parser = argparse.ArgumentParser(description="Convert card images to WebP.")
+    parser.add_argument(
+        "--levels-only",
+        action="store_true",
+        help="only build missing half/quarter resolution levels from the "
+        "existing .webp images",
+    )
+    args = parser.parse_args()
+
+    if args.levels_only:
+        print(f"Building resolution levels in {TARGET_IMAGE_DIRECTORY}...")
+        build_card_image_levels(TARGET_IMAGE_DIRECTORY)
+        return
+
     print("Starting JPG to WebP conversion...")
     print(f"Source directory: {SOURCE_IMAGE_DIRECTORY}")
     print(f"Target directory: {TARGET_IMAGE_DIRECTORY}")
@@ -1,11 +1,13 @@
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from uuid import uuid4
 
 from src.utilities.config import str_to_bool
 from src.utilities.decklist import Decklist
-from src.utilities.text_to_pdf import make_pdf
-from src.utilities.text_to_webp import make_webp
+from src.utilities.proxy_sheet import make_proxy_pdf
+from src.utilities.text_to_pdf import make_packet_pdf, make_pdf
+from src.utilities.text_to_webp import IMAGE_FORMATS, make_webp
 
 
 def _process_deck_data(deck_data: str, deck_type: str, bypass_assertions: bool = False):
@@ -75,9 +77,14 @@ def generate_webp(
     m_count: bool = False,
     aod_count: bool = False,
     is_legal: bool = None,
+    size: str = "full",
+    card_width: int = None,
+    image_format: str = "webp",
+    profile: str = "balanced",
+    layout: str = "grid",
 ):
     """
-    Generate a WebP image from deck data.
+    Generate a deck image (WebP by default) from deck data.
 
     Args:
         deck_data: Raw deck data string
@@ -85,9 +92,15 @@ def generate_webp(
         n_card_columns: Number of card columns in the image
         m_count: Whether to include m_count in the image
         aod_count: Whether to include aod_count in the image
+        size: Card image resolution preset ("full", "half" or "quarter")
+        card_width: Target card width in pixels, instead of a preset
+        image_format: "webp", "jpeg" or "png"
+        profile: Encoder profile ("preview", "balanced" or "archival")
+        layout: "grid" (a card image per copy) or "stacked" (one per distinct
+            card, badged with its quantity)
 
     Returns:
-        tuple: (filename_with_extension, file_path)
+        tuple: (filename_with_extension, image_bytes)
     """
     # Process deck data using internal utility
     unique_filename, processed_deck_data, decklist_object = _process_deck_data(
@@ -104,25 +117,32 @@ def generate_webp(
     if aod_count:
         aod_count_value = decklist_object.calculate_aod_count()
 
-    # Call make_webp and get the actual file path
-    webp_file_path = make_webp(
+    image_bytes = make_webp(
         deck_type,
         processed_deck_data,
-        filename=unique_filename,
         n_card_columns=n_card_columns,
         m_count_value=m_count_value,
         aod_count_value=aod_count_value,
         is_legal=is_legal,
+        size=size,
+        card_width=card_width,
+        image_format=image_format,
+        profile=profile,
+        layout=layout,
     )
 
-    if not webp_file_path or not os.path.exists(webp_file_path):
+    if not image_bytes:
         raise ValueError("Failed to generate deck image")
 
-    # Return filename with extension and the actual file path
-    return (
-        f"{unique_filename}.webp",
-        webp_file_path,
-    )
+    filename = f"{unique_filename}.{IMAGE_FORMATS[image_format][2]}"
+
+    # Keep a local copy to inspect when debugging; the route uploads the bytes.
+    if str_to_bool(os.getenv("DEBUG")):
+        os.makedirs("tmp", exist_ok=True)
+        with open(f"tmp/{filename}", "wb") as f:
+            f.write(image_bytes)
+
+    return filename, image_bytes
 
 
 def generate_pdf(
@@ -148,7 +168,7 @@ def generate_pdf(
         aod_count: Whether to include aod_count in the PDF
 
     Returns:
-        tuple: (filename, file_path)
+        tuple: (filename, pdf_bytes)
     """
     # Process deck data using internal utility
     unique_filename, processed_deck_data, decklist_object = _process_deck_data(
@@ -165,24 +185,136 @@ def generate_pdf(
     if aod_count:
         aod_count_value = decklist_object.calculate_aod_count()
 
-    make_pdf(
+    pdf_bytes = make_pdf(
         deck_type,
         processed_deck_data,
-        filename=unique_filename,
         name=name,
         event=event,
         show_alignment=show_alignment,
         m_count_value=m_count_value,
         aod_count_value=aod_count_value,
         is_legal=is_legal,
+        compact=True,
     )
 
+    # Keep a local copy to inspect when debugging; the route uploads the bytes.
     if str_to_bool(os.getenv("DEBUG")):
-        output_dir = "tmp"
-    else:
-        output_dir = "/tmp"
+        os.makedirs("tmp", exist_ok=True)
+        with open(f"tmp/{unique_filename}.pdf", "wb") as f:
+            f.write(pdf_bytes)
+
+    return unique_filename, pdf_bytes
+
+
+def generate_proxy_pdf(deck_data: str, deck_type: str, include_reserve: bool = True):
+    """
+    Generate a printable proxy sheet PDF: the deck's card images, one per
+    copy, nine to a letter page.
+
+    Args:
+        deck_data: Raw deck data string
+        deck_type: Type of deck being processed
+        include_reserve: Whether to print the reserve after the main deck
 
-    return (
-        unique_filename,
-        f"{output_dir}/{unique_filename}.pdf",
+    Returns:
+        tuple: (filename, pdf_bytes)
+    """
+    unique_filename, processed_deck_data, _ = _process_deck_data(
+        deck_data, deck_type, bypass_assertions=True
     )
+    pdf_bytes = make_proxy_pdf(processed_deck_data, include_reserve=include_reserve)
+    return unique_filename, pdf_bytes
+
+
+def _prepare_packet_sheet(entry: dict) -> dict:
+    """
+    Parse one packet entry and compute its statistics: everything
+    draw_deck_sheet needs except the event name. Runs in a worker process.
+    """
+    name = entry.get("name", "")
+    try:
+        _, processed_deck_data, decklist_object = _process_deck_data(
+            entry["decklist"], entry["decklist_type"]
+        )
+    except AssertionError as e:
+        raise AssertionError(f"{name or 'Unnamed player'}: {e}") from e
+
+    return {
+        "deck_type": entry["decklist_type"],
+        "deck_data": processed_deck_data,
+        "name": name,
+        "show_alignment": entry.get("show_alignment", False),
+        "m_count_value": (
+            decklist_object.calculate_m_count() if entry.get("m_count") else None
+        ),
+        "aod_count_value": (
+            decklist_object.calculate_aod_count() if entry.get("aod_count") else None
+        ),
+        "is_legal": entry.get("is_legal"),
+    }
+
+
+# Most decklists one packet request may hold (a large event's worth).
+MAX_PACKET_DECKLISTS = int(os.getenv("MAX_PACKET_DECKLISTS", "256"))
+
+
+def generate_packet(entries: list, event: str = "", workers: int = 1):
+    """
+    Generate one deck check packet PDF for an event: every player's sheet
+    (plus any overflow pages) in the order given.
+
+    Decklists are parsed and their M/AoD counts simulated, then drawn onto a
+    single document that embeds each template once. With more than one
+    worker the sheets are prepared in worker processes while earlier ones
+    are drawn; that's for scripts/generate_packet.py only, since forking the
+    threaded web server (tile warm-up, decode pool) isn't safe.
+
+    Args:
+        entries: One dict per player with "name", "decklist" and
+            "decklist_type", and optionally "show_alignment", "m_count",
+            "aod_count" and "is_legal" (as for generate_pdf)
+        event: Event name printed on every sheet
+        workers: Worker processes to use; 1 (the default) prepares the
+            sheets in this process.
+
+    Returns:
+        tuple: (filename, pdf_bytes)
+    """
+    if not entries:
+        raise AssertionError("Please include at least one decklist in the packet.")
+    if len(entries) > MAX_PACKET_DECKLISTS:
+        raise AssertionError(
+            f"Please include {MAX_PACKET_DECKLISTS} or fewer decklists in the packet."
+        )
+    for entry in entries:
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get("decklist"), str)
+            and "decklist_type" in entry
+        ):
+            raise AssertionError(
+                "Each packet entry needs a decklist and a decklist_type."
+            )
+
+    workers = max(1, min(workers, len(entries)))
+
+    def draw(sheets):
+        return make_packet_pdf(
+            ({**sheet, "event": event} for sheet in sheets), compact=True
+        )
+
+    pool = None
+    if workers > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError):
+            # No process support (e.g. serverless sandboxes): stay serial.
+            pool = None
+
+    if pool is None:
+        pdf_bytes = draw(map(_prepare_packet_sheet, entries))
+    else:
+        with pool:
+            pdf_bytes = draw(pool.map(_prepare_packet_sheet, entries))
+
+    return str(uuid4()), pdf_bytes
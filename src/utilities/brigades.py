@@ -1,5 +1,10 @@
 from src.utilities.vars import EVIL_BRIGADES, GOOD_BRIGADES
 
+# Every normalized brigade owns one bit of a 16-bit mask, so brigade sets can be
+# combined with | and counted with a popcount instead of set operations.
+ALL_BRIGADES = GOOD_BRIGADES + EVIL_BRIGADES
+BRIGADE_BITS = {brigade: 1 << index for index, brigade in enumerate(ALL_BRIGADES)}
+
 
 def handle_complex_brigades(card_name: str, brigade: str) -> list:
     complex_brigades = {
@@ -111,3 +116,25 @@ def normalize_brigade_field(brigade: str, alignment: str, card_name: str) -> lis
         ), f"Card {card_name} has an invalid brigade: {brigade}."
 
     return sorted(brigades_list)
+
+
+def brigades_to_mask(brigades: list) -> int:
+    """Bitmask of a list of normalized brigade names."""
+    mask = 0
+    for brigade in brigades:
+        mask |= BRIGADE_BITS[brigade]
+    return mask
+
+
+def mask_to_brigades(mask: int) -> list:
+    """Sorted normalized brigade names set in 'mask'."""
+    return sorted(brigade for brigade, bit in BRIGADE_BITS.items() if mask & bit)
+
+
+def count_brigades(mask: int) -> int:
+    """Number of distinct brigades in 'mask'."""
+    return bin(mask).count("1")
+
+
+GOOD_BRIGADE_MASK = brigades_to_mask(GOOD_BRIGADES)
+EVIL_BRIGADE_MASK = brigades_to_mask(EVIL_BRIGADES)
@@ -0,0 +1,145 @@
+"""
+Atlas of decoded card tiles: raw RGB pixels, stored back to back in large
+atlas files, with an index of where each tile is.
+
+scripts/build_card_atlas.py decodes every card image once and writes the
+atlas. At runtime the atlas files are memory-mapped, so a tile is read
+straight out of the OS page cache, which every worker process shares, instead
+of being decoded from WebP. Building it is optional: card_images falls back
+to decoding any image the atlas doesn't have, or has an older copy of.
+
+Index entries are keyed by image path as card_images.card_image_path gives
+it, so a resolution level's tiles ("assets/cardimages/half/...") live in the
+same atlas as the full-size ones.
+"""
+
+import json
+import mmap
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from PIL import Image
+
+CARD_ATLAS_FOLDER = os.getenv("CARD_ATLAS_FOLDER", "assets/cardatlas")
+CARD_ATLAS_INDEX = "index.json"
+CARD_ATLAS_FILE_BYTES = 1 << 30  # start a new atlas file past 1 GiB
+
+
+class AtlasEntry(NamedTuple):
+    """Where one tile's pixels are, and the image they were decoded from."""
+
+    file: str
+    offset: int
+    width: int
+    height: int
+    source: str
+    source_mtime_ns: int
+
+
+def build_card_atlas(
+    tiles: Iterable[Tuple[str, str, Image.Image]],
+    folder: str = CARD_ATLAS_FOLDER,
+    file_bytes: int = CARD_ATLAS_FILE_BYTES,
+) -> int:
+    """
+    Write an atlas of 'tiles', (image path, source image path, tile) triples,
+    into 'folder', replacing any atlas already there. Returns the number of
+    tiles written.
+    """
+    os.makedirs(folder, exist_ok=True)
+    for name in os.listdir(folder):
+        if name.startswith("atlas_") or name == CARD_ATLAS_INDEX:
+            os.remove(os.path.join(folder, name))
+
+    entries: Dict[str, AtlasEntry] = {}
+    atlas_file, file_name, file_count, offset = None, None, 0, 0
+    try:
+        for image_path, source, tile in tiles:
+            pixels = tile.convert("RGB").tobytes()
+            if atlas_file is None or offset + len(pixels) > file_bytes:
+                if atlas_file is not None:
+                    atlas_file.close()
+                file_name = f"atlas_{file_count:03d}.rgb"
+                atlas_file = open(os.path.join(folder, file_name), "wb")
+                file_count, offset = file_count + 1, 0
+            atlas_file.write(pixels)
+            entries[image_path] = AtlasEntry(
+                file_name,
+                offset,
+                tile.width,
+                tile.height,
+                source,
+                os.stat(source).st_mtime_ns,
+            )
+            offset += len(pixels)
+    finally:
+        if atlas_file is not None:
+            atlas_file.close()
+
+    # The index goes last: a half-written atlas has none and is ignored.
+    index_path = os.path.join(folder, CARD_ATLAS_INDEX)
+    with open(index_path, "w", encoding="utf-8") as file:
+        json.dump({key: list(entry) for key, entry in entries.items()}, file)
+    return len(entries)
+
+
+class CardAtlas:
+    """A built atlas: its index, and its files memory-mapped on first use."""
+
+    def __init__(self, folder: str, entries: Dict[str, AtlasEntry]):
+        self.folder = folder
+        self.entries = entries
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._lock = threading.Lock()
+
+    def _map(self, file_name: str) -> memoryview:
+        with self._lock:
+            if file_name not in self._maps:
+                with open(os.path.join(self.folder, file_name), "rb") as file:
+                    self._maps[file_name] = mmap.mmap(
+                        file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            return memoryview(self._maps[file_name])
+
+    def tile(self, image_path: str) -> Optional[Image.Image]:
+        """
+        The atlas's tile for 'image_path', or None if it has none or the
+        image has changed since the atlas was built.
+        """
+        entry = self.entries.get(image_path)
+        if entry is None:
+            return None
+        try:
+            if os.stat(entry.source).st_mtime_ns != entry.source_mtime_ns:
+                return None
+        except FileNotFoundError:
+            pass  # the atlas is all there is of this image
+        size = entry.width * entry.height * 3
+        pixels = self._map(entry.file)[entry.offset : entry.offset + size]
+        return Image.frombuffer(
+            "RGB", (entry.width, entry.height), pixels, "raw", "RGB", 0, 1
+        )
+
+
+@lru_cache(maxsize=None)
+def load_card_atlas(folder: str = CARD_ATLAS_FOLDER) -> Optional[CardAtlas]:
+    """The atlas built in 'folder', or None if there isn't one."""
+    index_path = os.path.join(folder, CARD_ATLAS_INDEX)
+    try:
+        with open(index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable card atlas in {folder}: {e}")
+        return None
+    entries = {key: AtlasEntry(*entry) for key, entry in index.items()}
+    return CardAtlas(folder, entries)
+
+
+def card_atlas_tile(image_path: str) -> Optional[Image.Image]:
+    """The atlas tile for 'image_path', if an up-to-date atlas has one."""
+    atlas = load_card_atlas(CARD_ATLAS_FOLDER)
+    return atlas.tile(image_path) if atlas is not None else None
@@ -0,0 +1,54 @@
+"""
+Process-wide card database.
+
+carddata.jsonl is constant for the lifetime of a process, so it is parsed once
+and shared by every request instead of being re-read per Decklist. Per-card
+facts that never depend on the deck (the normalized brigade mask, the parsed
+biblical reference and the sort keys) are derived here, once. The returned
+records are shared: callers must copy a record before changing it.
+"""
+
+import json
+from functools import lru_cache
+
+from src.utilities.brigades import brigades_to_mask, normalize_brigade_field
+from src.utilities.references import parse_reference
+from src.utilities.sort import card_sort_keys
+from src.utilities.vars import CARD_DATA_JSON_FILE
+
+
+@lru_cache(maxsize=None)
+def load_card_database(card_data_path: str = CARD_DATA_JSON_FILE) -> dict:
+    """Load 'card_data_path' (JSONL) into a dict keyed by card name."""
+    card_database = {}
+    with open(card_data_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():  # Skip empty lines
+                card_data = json.loads(line.strip())
+                # Data is already processed in the JSONL file
+                # (keys lowercase, values stripped, apostrophes normalized)
+                card_data["brigade_mask"] = brigades_to_mask(
+                    normalize_brigade_field(
+                        brigade=card_data.get("brigade", ""),
+                        alignment=card_data.get("alignment", ""),
+                        card_name=card_data["name"],
+                    )
+                )
+                card_data["parsed_reference"] = parse_reference(
+                    card_data.get("reference", "")
+                )
+                # Sort keys read the original brigade string from "raw_brigade",
+                # which Decklist only sets on mapped cards.
+                card_data["sort_keys"] = card_sort_keys(
+                    card_data["name"],
+                    {**card_data, "raw_brigade": card_data.get("brigade", "")},
+                )
+                card_database[card_data["name"]] = card_data
+
+    return card_database
+
+
+def normalize_card_name(card_name: str) -> str:
+    """Normalize a decklist card name the same way Decklist does before lookup."""
+    card_name = card_name.strip().replace("\u2019", "'")
+    return card_name.replace('""', '"').strip('"')
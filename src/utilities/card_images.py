@@ -0,0 +1,300 @@
+"""
+Where each card's image lives on disk.
+
+Card images are stored as WebP files named after carddata's "imagefile" plus
+".webp". Some carddata entries keep a trailing ".jpg" ("Some-Card.jpg"), and
+their images keep it too ("Some-Card.jpg.webp"), while decklists refer to
+them without it. The index below maps both spellings to the file once per
+process, so resolving a card's image is a dict lookup rather than a scan of
+every imagefile in carddata.
+
+Decoding a card's WebP is the dominant cost of a deck image, and staple cards
+appear in nearly every deck, so decoded tiles are kept in a process-wide
+cache bounded by their total size in bytes. The most popular tiles can also
+be pinned (see card_popularity.py): held outside the cache, never evicted.
+A deck's tiles are decoded concurrently on a thread pool shared by every
+request; Pillow releases the GIL while decoding. When a raw pixel atlas has
+been built (see card_atlas.py), tiles are read from it instead of decoded.
+
+Every image also comes in half and quarter resolution levels, built into
+subfolders of the card image folder by scripts/generate_webp.py, for deck
+images that don't need full-size cards. A level that hasn't been built is
+downscaled from the full image on first use instead.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable
+
+from PIL import Image
+
+from src.utilities.card_atlas import card_atlas_tile
+from src.utilities.vars import CARD_DATA_JSON_FILE
+
+DECKLIST_IMAGES_FOLDER = "assets/cardimages"
+
+# Resolution level -> how many times smaller than the full image it is.
+CARD_IMAGE_LEVELS = {"full": 1, "half": 2, "quarter": 4}
+FULL_CARD_WIDTH = 345  # width of (nearly) every full-size card image
+
+
+def load_carddata_filenames(card_data_path: str = CARD_DATA_JSON_FILE) -> set:
+    """
+    Load all image filenames from carddata.jsonl to preserve original naming.
+
+    Returns:
+        set: Set of original image filenames from carddata.jsonl
+    """
+    carddata_filenames = set()
+
+    try:
+        with open(card_data_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():  # Skip empty lines
+                    continue
+
+                # Parse JSON line and get the imagefile field
+                try:
+                    card_data = json.loads(line.strip())
+                    image_filename = card_data.get("imagefile", "")
+                    if image_filename:  # Only add non-empty filenames
+                        carddata_filenames.add(image_filename)
+                except json.JSONDecodeError as e:
+                    print(f"Error parsing JSON line: {line[:50]}... - {e}")
+                    continue
+
+    except FileNotFoundError:
+        print(f"Warning: {card_data_path} not found. Using fallback logic.")
+    except Exception as e:
+        print(f"Error reading {card_data_path}: {e}")
+
+    return carddata_filenames
+
+
+@lru_cache(maxsize=None)
+def load_card_image_index(card_data_path: str = CARD_DATA_JSON_FILE) -> Dict[str, str]:
+    """imagefile, with or without a trailing ".jpg" -> WebP file name."""
+    carddata_filenames = load_carddata_filenames(card_data_path)
+    index = {name: f"{name}.webp" for name in carddata_filenames}
+    for name in carddata_filenames:
+        if name.endswith(".jpg"):
+            # An exact carddata name wins over the ".jpg" spelling.
+            index.setdefault(name[: -len(".jpg")], f"{name}.webp")
+    return index
+
+
+def card_image_filename(image_file: str) -> str:
+    """WebP file name of the card image 'image_file' (carddata's "imagefile")."""
+    return load_card_image_index().get(image_file, f"{image_file}.webp")
+
+
+def card_level_folder(level: str = "full") -> str:
+    """Folder holding the card images at resolution 'level'."""
+    if level not in CARD_IMAGE_LEVELS:
+        raise AssertionError(f"Unknown card image level: {level}")
+    if level == "full":
+        return DECKLIST_IMAGES_FOLDER
+    return os.path.join(DECKLIST_IMAGES_FOLDER, level)
+
+
+def card_image_path(image_file: str, level: str = "full") -> str:
+    """Path of the card image 'image_file' at resolution 'level'."""
+    return os.path.join(card_level_folder(level), card_image_filename(image_file))
+
+
+def level_for_card_width(card_width: int) -> str:
+    """The smallest resolution level whose cards are at least 'card_width' wide."""
+    for level, divisor in sorted(CARD_IMAGE_LEVELS.items(), key=lambda item: -item[1]):
+        if FULL_CARD_WIDTH // divisor >= card_width:
+            return level
+    return "full"
+
+
+def downscale_card_image(image: Image.Image, divisor: int) -> Image.Image:
+    """'image' made 'divisor' times smaller, as stored in a resolution level."""
+    if divisor == 1:
+        return image
+    size = (max(1, round(image.width / divisor)), max(1, round(image.height / divisor)))
+    return image.resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+
+# Decoded RGB card tiles, most recently used last, by image path.
+CARD_TILE_CACHE_BYTES = int(os.getenv("CARD_TILE_CACHE_BYTES", str(256 * 1024 * 1024)))
+_card_tiles = OrderedDict()
+_card_tile_bytes = 0
+_CARD_TILE_LOCK = threading.Lock()
+
+
+def _tile_bytes(tile: Image.Image) -> int:
+    # What Pillow actually holds: a byte per pixel for 1-band 8-bit modes,
+    # four for everything else, RGB included (padded to RGBX).
+    return tile.width * tile.height * (1 if tile.mode in ("1", "L", "P") else 4)
+
+
+def _decode_tile(image_path: str) -> Image.Image:
+    tile = card_atlas_tile(image_path)
+    if tile is not None:
+        return tile
+    with Image.open(image_path) as image:
+        return image.convert("RGB") if image.mode != "RGB" else image.copy()
+
+
+def _cached_tile(key: str):
+    tile = _pinned_tiles.get(key)
+    if tile is not None:
+        return tile
+    with _CARD_TILE_LOCK:
+        if key in _card_tiles:
+            _card_tiles.move_to_end(key)
+            return _card_tiles[key]
+    return None
+
+
+def _cache_tile(key: str, tile: Image.Image) -> Image.Image:
+    global _card_tile_bytes
+    size = _tile_bytes(tile)
+    if size > CARD_TILE_CACHE_BYTES:
+        return tile
+    with _CARD_TILE_LOCK:
+        if key in _card_tiles:
+            _card_tile_bytes -= _tile_bytes(_card_tiles.pop(key))
+        _card_tiles[key] = tile
+        _card_tile_bytes += size
+        while _card_tile_bytes > CARD_TILE_CACHE_BYTES:
+            _, evicted = _card_tiles.popitem(last=False)
+            _card_tile_bytes -= _tile_bytes(evicted)
+    return tile
+
+
+def load_card_tile(image_path: str) -> Image.Image:
+    """
+    The card image at 'image_path', decoded to RGB only when it isn't pinned
+    or cached. Tiles are shared between requests: paste from them, never draw
+    on them. Raises like Image.open when the image can't be read.
+    """
+    tile = _cached_tile(image_path)
+    if tile is not None:
+        return tile
+    # Decode outside the lock: Pillow releases the GIL while decoding, so
+    # other requests keep going. Two threads may decode the same tile at
+    # once; the second simply replaces the first.
+    return _cache_tile(image_path, _decode_tile(image_path))
+
+
+def load_card_level_tile(image_file: str, level: str = "full") -> Image.Image:
+    """
+    The tile of card image 'image_file' at resolution 'level', downscaled
+    from the full image (and cached) when the level hasn't been built.
+    """
+    image_path = card_image_path(image_file, level)
+    if level == "full":
+        return load_card_tile(image_path)
+    tile = _cached_tile(image_path)
+    if tile is not None:
+        return tile
+    try:
+        return _cache_tile(image_path, _decode_tile(image_path))
+    except FileNotFoundError:
+        full_tile = load_card_tile(card_image_path(image_file))
+        divisor = CARD_IMAGE_LEVELS[level]
+        return _cache_tile(image_path, downscale_card_image(full_tile, divisor))
+
+
+# One decode pool for the whole process, so concurrent requests share its
+# threads instead of each starting their own.
+CARD_DECODE_WORKERS = int(os.getenv("CARD_DECODE_WORKERS", os.cpu_count() or 1))
+_decode_pool = None
+_DECODE_POOL_LOCK = threading.Lock()
+
+
+def decode_executor() -> ThreadPoolExecutor:
+    """The process-wide pool card images are decoded on (CARD_DECODE_WORKERS)."""
+    global _decode_pool
+    with _DECODE_POOL_LOCK:
+        if _decode_pool is None:
+            _decode_pool = ThreadPoolExecutor(
+                max_workers=CARD_DECODE_WORKERS, thread_name_prefix="card-decode"
+            )
+        return _decode_pool
+
+
+def load_card_level_tiles(
+    image_files: Iterable[str], level: str = "full"
+) -> Dict[str, Image.Image]:
+    """
+    image_file -> tile at 'level' for each distinct image in 'image_files',
+    decoded concurrently on the shared decode pool. Images that can't be read
+    are left out; load_card_level_tile reports why when asked for them.
+    """
+    image_files = list(dict.fromkeys(image_files))
+
+    def load(image_file):
+        try:
+            return load_card_level_tile(image_file, level)
+        except Exception:
+            return None
+
+    if CARD_DECODE_WORKERS > 1 and len(image_files) > 1:
+        tiles = decode_executor().map(load, image_files)
+    else:
+        tiles = map(load, image_files)
+    return {
+        image_file: tile
+        for image_file, tile in zip(image_files, tiles)
+        if tile is not None
+    }
+
+
+# Pinned tiles, by image path. Replaced wholesale by pin_card_tiles, so
+# readers never see it half-built.
+_pinned_tiles: Dict[str, Image.Image] = {}
+
+
+def pin_card_tiles(image_paths: Iterable[str], budget: int) -> int:
+    """
+    Decode 'image_paths' in order, until their tiles would exceed 'budget'
+    bytes, and pin them in place of any previously pinned set. Images that
+    can't be read are skipped. Returns the number of tiles pinned.
+    """
+    global _pinned_tiles, _card_tile_bytes
+    pinned, used = {}, 0
+    for image_path in image_paths:
+        if image_path in pinned:
+            continue
+        try:
+            with _CARD_TILE_LOCK:
+                tile = _pinned_tiles.get(image_path) or _card_tiles.get(image_path)
+            if tile is None:
+                tile = _decode_tile(image_path)
+        except OSError as e:
+            print(f"Warning: could not pin card image {image_path}: {e}")
+            continue
+        if used + _tile_bytes(tile) > budget:
+            break
+        pinned[image_path] = tile
+        used += _tile_bytes(tile)
+
+    with _CARD_TILE_LOCK:
+        _pinned_tiles = pinned
+        # Pinned tiles don't need a second copy in the cache.
+        for image_path in pinned:
+            if image_path in _card_tiles:
+                _card_tile_bytes -= _tile_bytes(_card_tiles.pop(image_path))
+    return len(pinned)
+
+
+def card_tile_stats() -> dict:
+    """Sizes of the tile cache and the pinned set."""
+    pinned = _pinned_tiles
+    with _CARD_TILE_LOCK:
+        return {
+            "cached_tiles": len(_card_tiles),
+            "cached_bytes": _card_tile_bytes,
+            "cache_budget_bytes": CARD_TILE_CACHE_BYTES,
+            "pinned_tiles": len(pinned),
+            "pinned_bytes": sum(_tile_bytes(tile) for tile in pinned.values()),
+        }
@@ -0,0 +1,147 @@
+"""
+How often each card appears in rendered deck images, and the warm set of
+card tiles pinned from it.
+
+Deck image traffic is heavily skewed toward a few hundred staple cards. The
+histogram (imagefile -> decks it appeared in) is kept in memory, saved to a
+small JSON file now and then, and read back at startup, where the most used
+cards' tiles are decoded and pinned up front (card_images.pin_card_tiles) so
+the first requests after a restart don't pay for decoding them.
+
+The histogram only survives as long as CARD_POPULARITY_FILE does. Its
+default is under /tmp, which on Vercel is empty after every deploy and cold
+start, so there the warm set starts empty exactly when it would help most.
+Point CARD_POPULARITY_FILE at storage that persists to keep it across them.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from src.utilities.card_images import (
+    card_image_path,
+    card_tile_stats,
+    pin_card_tiles,
+)
+from src.utilities.config import str_to_bool
+
+CARD_POPULARITY_FILE = os.getenv(
+    "CARD_POPULARITY_FILE",
+    os.path.join(
+        "tmp" if str_to_bool(os.getenv("DEBUG")) else "/tmp", "card_popularity.json"
+    ),
+)
+CARD_POPULARITY_SAVE_SECONDS = float(os.getenv("CARD_POPULARITY_SAVE_SECONDS", "60"))
+CARD_TILE_PIN_COUNT = int(os.getenv("CARD_TILE_PIN_COUNT", "300"))
+CARD_TILE_PIN_BYTES = int(os.getenv("CARD_TILE_PIN_BYTES", str(128 * 1024 * 1024)))
+
+_popularity = None  # Counter, loaded from CARD_POPULARITY_FILE on first use
+_last_saved = 0.0
+_POPULARITY_LOCK = threading.Lock()
+_warm_up_thread = None
+
+
+def load_card_popularity(path: str = None) -> Counter:
+    """The histogram saved at 'path', or an empty one if there is none yet."""
+    path = path or CARD_POPULARITY_FILE
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return Counter({name: int(n) for name, n in json.load(file).items()})
+    except FileNotFoundError:
+        return Counter()
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Warning: ignoring unreadable card popularity file {path}: {e}")
+        return Counter()
+
+
+def _histogram() -> Counter:
+    # Callers hold _POPULARITY_LOCK.
+    global _popularity, _last_saved
+    if _popularity is None:
+        _popularity = load_card_popularity()
+        _last_saved = time.monotonic()
+    return _popularity
+
+
+def save_card_popularity(path: str = None):
+    """Write the histogram to 'path' (default CARD_POPULARITY_FILE)."""
+    global _last_saved
+    path = path or CARD_POPULARITY_FILE
+    with _POPULARITY_LOCK:
+        if _popularity is None:
+            return
+        counts = dict(_popularity)
+        _last_saved = time.monotonic()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(counts, file)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Warning: could not save card popularity to {path}: {e}")
+
+
+def record_card_usage(image_files: Iterable[str]):
+    """Count one more rendered deck for each of 'image_files'."""
+    with _POPULARITY_LOCK:
+        _histogram().update(set(image_files))
+        due = time.monotonic() - _last_saved >= CARD_POPULARITY_SAVE_SECONDS
+    if due:
+        save_card_popularity()
+
+
+def top_card_images(n: int) -> List[Tuple[str, int]]:
+    """The 'n' most used imagefiles and their counts, most used first."""
+    with _POPULARITY_LOCK:
+        return _histogram().most_common(n)
+
+
+def warm_card_tiles(count: int = None, budget: int = None) -> int:
+    """
+    Decode and pin the tiles of the 'count' most used cards, within 'budget'
+    bytes (defaults: CARD_TILE_PIN_COUNT and CARD_TILE_PIN_BYTES). Returns the
+    number of tiles pinned.
+    """
+    count = CARD_TILE_PIN_COUNT if count is None else count
+    budget = CARD_TILE_PIN_BYTES if budget is None else budget
+    if count <= 0 or budget <= 0:
+        return 0
+    top = top_card_images(count)
+    return pin_card_tiles((card_image_path(name) for name, _ in top), budget)
+
+
+def warm_card_tiles_in_background() -> threading.Thread:
+    """
+    Run warm_card_tiles on a daemon thread, so serving isn't held up. Only
+    the first call starts it; later ones return the same thread.
+    """
+    global _warm_up_thread
+    if _warm_up_thread is None:
+        with _POPULARITY_LOCK:
+            if _warm_up_thread is None:
+                _warm_up_thread = threading.Thread(
+                    target=warm_card_tiles, name="card-tile-warmup", daemon=True
+                )
+                _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def card_image_stats(top: int = 20) -> dict:
+    """Tile cache and pinned set sizes, plus the 'top' most used cards."""
+    with _POPULARITY_LOCK:
+        histogram = _histogram()
+        tracked_cards = len(histogram)
+        most_used = histogram.most_common(top)
+    return {
+        **card_tile_stats(),
+        "tracked_cards": tracked_cards,
+        "top_cards": [{"imagefile": name, "decks": n} for name, n in most_used],
+    }
+
+
+atexit.register(save_card_popularity)
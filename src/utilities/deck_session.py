@@ -0,0 +1,313 @@
+"""
+Incremental deck statistics for live deck editing.
+
+A DeckSession keeps the count vectors the deck statistics are derived from
+(cards per brigade, Daniel references, cards per sheet section, ...) and
+updates them from card add/remove deltas, so each edit costs O(1) in deck
+size instead of re-parsing and re-mapping the whole list.
+
+M count and the AoD breakdown are computed in closed form from those counts
+(hypergeometric probabilities) rather than by Monte Carlo simulation, so they
+are exact; Decklist's simulated values agree with them to within sampling
+noise.
+
+Sessions live in the memory of one process. They are not shared between
+serverless instances and do not survive a cold start, so a client that gets
+a 404 for its session starts a new one, seeded with the whole deck.
+"""
+
+import threading
+import time
+from functools import lru_cache
+from math import comb
+from typing import Optional
+from uuid import uuid4
+
+from src.utilities.brigades import ALL_BRIGADES, mask_to_brigades
+from src.utilities.card_database import load_card_database, normalize_card_name
+from src.utilities.references import cites_book
+from src.utilities.text_to_pdf import SECTION_TYPES, section_for_type
+
+SECTIONS = list(SECTION_TYPES) + ["Misc"]
+ALIGNMENTS = ["Good", "Evil", "Neutral"]
+
+# Deck type -> (min main deck, max main deck, max reserve), as Decklist checks.
+DECK_SIZE_LIMITS = {
+    "type_1": (40, 70, 10),
+    "type_2": (40, 140, 20),
+    "paragon": (40, 70, 10),
+}
+
+M_COUNT_DRAW_SIZE = 8
+AOD_TRIGGER_CARDS = 3
+AOD_TOP_CARDS = 9
+
+
+def _card_profile(card_name: str) -> Optional[tuple]:
+    """
+    Everything a single copy of 'card_name' contributes to the deck statistics:
+    (is_lost_soul, brigades, is_daniel, in_aod_pool, section, alignment).
+    Returns None for cards missing from the card database.
+    """
+    if card_name not in load_card_database():
+        return None
+    return _known_card_profile(card_name)
+
+
+# Keyed only on names found in the card database, so client-sent names can't
+# grow it past one entry per card.
+@lru_cache(maxsize=None)
+def _known_card_profile(card_name: str) -> tuple:
+    card_data = load_card_database()[card_name]
+    return (
+        card_data.get("type", "").lower() == "lost soul",
+        tuple(mask_to_brigades(card_data["brigade_mask"])),
+        cites_book(card_data, "Daniel"),
+        card_name != "The Ancient of Days",
+        section_for_type(card_data.get("type")),
+        card_data.get("alignment"),
+    )
+
+
+def _probability_none_drawn(population: int, marked: int, draws: int) -> float:
+    """Chance that 'draws' cards taken from 'population' include none of 'marked'."""
+    return comb(population - marked, draws) / comb(population, draws)
+
+
+class DeckSession:
+    """Running deck statistics, updated by card add/remove deltas."""
+
+    def __init__(self, deck_type: str):
+        if deck_type not in DECK_SIZE_LIMITS:
+            raise AssertionError(f"Unknown deck type: {deck_type}")
+        self.deck_type = deck_type
+        self.main_quantities = {}
+        self.reserve_quantities = {}
+        self.deck_size = 0
+        self.reserve_size = 0
+        self.non_lost_soul_count = 0
+        self.brigade_counts = {brigade: 0 for brigade in ALL_BRIGADES}
+        self.aod_pool_count = 0
+        self.daniel_count = 0
+        self.daniel_soul_count = 0
+        self.section_counts = {section: 0 for section in SECTIONS}
+        self.alignment_counts = {alignment: 0 for alignment in ALIGNMENTS}
+        self.last_used = time.monotonic()
+
+    def apply_delta(self, name: str, quantity: int, zone: str = "main") -> bool:
+        """
+        Add (quantity > 0) or remove (quantity < 0) copies of a card.
+
+        Returns False when the card is not in the card database (it is skipped,
+        as Decklist does). Raises AssertionError when removing more copies than
+        the deck holds.
+        """
+        card_name = normalize_card_name(name)
+        profile = _card_profile(card_name)
+        if profile is None:
+            print(f"Could not find {name}. Skipping loading it.")
+            return False
+        if zone not in ("main", "reserve"):
+            raise AssertionError(f"Unknown zone: {zone}")
+
+        quantities = self.main_quantities if zone == "main" else self.reserve_quantities
+        new_quantity = quantities.get(card_name, 0) + quantity
+        if new_quantity < 0:
+            raise AssertionError(
+                f"Cannot remove {-quantity} {card_name}: the {zone} deck has "
+                f"{quantities.get(card_name, 0)}."
+            )
+        if new_quantity:
+            quantities[card_name] = new_quantity
+        else:
+            quantities.pop(card_name, None)
+
+        if zone == "reserve":
+            self.reserve_size += quantity
+            return True
+
+        is_lost_soul, brigades, is_daniel, in_aod_pool, section, alignment = profile
+        self.deck_size += quantity
+        self.section_counts[section] += quantity
+        if alignment in self.alignment_counts:
+            self.alignment_counts[alignment] += quantity
+        if not is_lost_soul:
+            self.non_lost_soul_count += quantity
+            for brigade in brigades:
+                self.brigade_counts[brigade] += quantity
+        if in_aod_pool:
+            self.aod_pool_count += quantity
+            if is_daniel:
+                if is_lost_soul:
+                    self.daniel_soul_count += quantity
+                else:
+                    self.daniel_count += quantity
+        return True
+
+    def calculate_m_count(self) -> float:
+        """
+        Expected number of unique brigades in a random 8-card draw of non-Lost
+        Soul cards: the sum over brigades of the chance at least one is drawn.
+        """
+        population = self.non_lost_soul_count
+        if not population:
+            return 0.0
+        draws = min(M_COUNT_DRAW_SIZE, population)
+        expected = sum(
+            1 - _probability_none_drawn(population, count, draws)
+            for count in self.brigade_counts.values()
+            if count
+        )
+        return round(expected, 2)
+
+    def _expected_top_count(self, daniel: int) -> float:
+        """
+        Expected number of the 'daniel' cards in the top 9 on draws where the
+        chain triggers. A card in the top 3 triggers the chain itself; a card
+        further down needs one of the other Daniel references in the top 3.
+        """
+        if not daniel:
+            return 0.0
+        population = self.aod_pool_count
+        triggers = self.daniel_count + self.daniel_soul_count
+        share = daniel / population
+        trigger_chance = 1 - _probability_none_drawn(
+            population - 1, triggers - 1, AOD_TRIGGER_CARDS
+        )
+        return AOD_TRIGGER_CARDS * share + (
+            AOD_TOP_CARDS - AOD_TRIGGER_CARDS
+        ) * share * trigger_chance
+
+    def calculate_aod_breakdown(self) -> dict:
+        """Same figures as Decklist.calculate_aod_breakdown, computed exactly."""
+        if self.aod_pool_count < AOD_TOP_CARDS:
+            return {"aod_count": 0.0, "soul_aod_count": 0.0, "whiff_percentage": 0.0}
+        triggers = self.daniel_count + self.daniel_soul_count
+        whiff = _probability_none_drawn(
+            self.aod_pool_count, triggers, AOD_TRIGGER_CARDS
+        )
+        return {
+            "aod_count": round(self._expected_top_count(self.daniel_count), 2),
+            "soul_aod_count": round(self._expected_top_count(triggers), 2),
+            "whiff_percentage": round(whiff * 100, 2),
+        }
+
+    def within_size_limits(self) -> bool:
+        """Whether the main deck and reserve sizes are legal for the deck type."""
+        min_main, max_main, max_reserve = DECK_SIZE_LIMITS[self.deck_type]
+        return (
+            min_main <= self.deck_size <= max_main
+            and self.reserve_size <= max_reserve
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "deck_type": self.deck_type,
+            "deck_size": self.deck_size,
+            "reserve_size": self.reserve_size,
+            "within_size_limits": self.within_size_limits(),
+            "m_count": self.calculate_m_count(),
+            **self.calculate_aod_breakdown(),
+            "section_totals": dict(self.section_counts),
+            "alignment_totals": dict(self.alignment_counts),
+        }
+
+
+def _apply_deltas(session: DeckSession, deltas: list):
+    """
+    Apply card deltas to 'session' in order, all or nothing: on an invalid
+    delta the ones already applied are undone and AssertionError is raised.
+    """
+    applied = []
+    try:
+        for delta in deltas:
+            if not isinstance(delta, dict):
+                raise AssertionError(f"Invalid delta: {delta!r}")
+            quantity = int(delta.get("quantity", 1))
+            if quantity < 0:
+                raise AssertionError("Delta quantities must be positive.")
+            op = delta.get("op", "add")
+            if op == "remove":
+                quantity = -quantity
+            elif op != "add":
+                raise AssertionError(f"Unknown delta op: {op}")
+            zone = delta.get("zone", "main")
+            if session.apply_delta(delta["name"], quantity, zone):
+                applied.append((delta["name"], quantity, zone))
+    except (AssertionError, AttributeError, KeyError, TypeError, ValueError) as e:
+        for name, quantity, zone in reversed(applied):
+            session.apply_delta(name, -quantity, zone)
+        if isinstance(e, AssertionError):
+            raise
+        raise AssertionError(f"Invalid delta: {e}") from e
+
+
+class DeckSessionStore:
+    """
+    Thread-safe, in-memory registry of live sessions keyed by session id. A
+    session unused for 'ttl_seconds' is gone, whether or not it was swept yet.
+    """
+
+    def __init__(self, ttl_seconds: int = 30 * 60, max_sessions: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, session: DeckSession, now: float) -> bool:
+        return now - session.last_used > self.ttl_seconds
+
+    def _expire(self, now: float):
+        stale = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if self._expired(session, now)
+        ]
+        for session_id in stale:
+            del self._sessions[session_id]
+
+    def create(self, deck_type: str, deltas: list = ()) -> tuple:
+        """
+        Start a new session, seeded with 'deltas' (as for apply_deltas), and
+        return (session_id, session). Nothing is stored when the deck type or
+        a seed delta is invalid.
+        """
+        session = DeckSession(deck_type)
+        _apply_deltas(session, deltas)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if len(self._sessions) >= self.max_sessions:
+                oldest = min(self._sessions, key=lambda k: self._sessions[k].last_used)
+                del self._sessions[oldest]
+            session_id = str(uuid4())
+            self._sessions[session_id] = session
+            return session_id, session
+
+    def apply_deltas(self, session_id: str, deltas: list) -> Optional[dict]:
+        """
+        Apply card deltas to a session and return its updated statistics, or
+        None when the session does not exist (or has expired).
+
+        Each delta is {"op": "add" | "remove", "name": str, "quantity": int = 1,
+        "zone": "main" | "reserve" = "main"}. Deltas are applied in order and
+        the batch is all-or-nothing.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.monotonic()
+            if self._expired(session, now):
+                del self._sessions[session_id]
+                return None
+            session.last_used = now
+            _apply_deltas(session, deltas)
+            return session.to_json()
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+
+deck_sessions = DeckSessionStore()
@@ -2,7 +2,13 @@ import json
 import random
 import xml.etree.ElementTree as ET
 
-from src.utilities.brigades import normalize_brigade_field
+from src.utilities.brigades import (
+    brigades_to_mask,
+    count_brigades,
+    normalize_brigade_field,
+)
+from src.utilities.card_database import load_card_database
+from src.utilities.references import cites_book
 from src.utilities.vars import CARD_DATA_JSON_FILE
 
 
@@ -137,17 +143,8 @@ class Decklist:
 
     def _load_card_data(self) -> dict:
         """Take the data found in 'card_data_path' and load it from JSONL format."""
-        card_database = {}
-        with open(self.card_data_path, "r", encoding="utf-8") as file:
-            for line in file:
-                if line.strip():  # Skip empty lines
-                    card_data = json.loads(line.strip())
-                    # Data is already processed in the JSONL file
-                    # (keys lowercase, values stripped, apostrophes normalized)
-                    card_name = card_data["name"]
-                    card_database[card_name] = card_data
-
-        return card_database
+        # Parsed once per process; records are copied in _map_card_metadata.
+        return load_card_database(self.card_data_path)
 
     def _map_card_metadata(self, card_list: list[dict]) -> dict:
         """
@@ -209,14 +206,16 @@ class Decklist:
                    Returns 0.0 if there are no non-lost soul cards in the deck.
         """
 
-        # Get all non-lost soul cards with their brigades
+        # Get all non-lost soul cards as brigade bitmasks, so a draw's unique
+        # brigades are an OR of integers rather than a set union
         non_lost_soul_cards = []
         for card_name, card_data in self.mapped_main_deck_list.items():
             if card_data.get("type", "").lower() != "lost soul":
                 quantity = card_data.get("quantity", 1)
-                brigades = card_data.get("brigade", [])
-                for _ in range(quantity):
-                    non_lost_soul_cards.append(brigades)
+                brigade_mask = card_data.get("brigade_mask")
+                if brigade_mask is None:
+                    brigade_mask = brigades_to_mask(card_data.get("brigade", []))
+                non_lost_soul_cards.extend([brigade_mask] * quantity)
 
         # If we have no non-lost soul cards, return 0
         if not non_lost_soul_cards:
@@ -234,11 +233,11 @@ class Decklist:
             sampled_cards = random.sample(non_lost_soul_cards, sample_size)
 
             # Count unique brigades in this sample
-            unique_brigades = set()
+            unique_brigades = 0
             for card_brigades in sampled_cards:
-                unique_brigades.update(card_brigades)
+                unique_brigades |= card_brigades
 
-            total_unique_brigades += len(unique_brigades)
+            total_unique_brigades += count_brigades(unique_brigades)
 
         return round(total_unique_brigades / num_simulations, 2)
 
@@ -278,7 +277,7 @@ class Decklist:
                     the top 3 (the chain never triggers).
             All values are 0.0 when the deck has fewer than 9 cards.
         """
-        # Build a list of all cards in the main deck with their references
+        # Build a list of all cards in the main deck, flagging Daniel references
         # Exclude "The Ancient of Days" card itself from the simulation
         all_cards = []
         for card_name, card_data in self.mapped_main_deck_list.items():
@@ -287,10 +286,10 @@ class Decklist:
                 continue
 
             quantity = card_data.get("quantity", 1)
-            reference = card_data.get("reference", "")
+            is_daniel = cites_book(card_data, "Daniel")
             is_lost_soul = card_data.get("type", "").lower() == "lost soul"
             for _ in range(quantity):
-                all_cards.append((reference, is_lost_soul))
+                all_cards.append((is_daniel, is_lost_soul))
 
         # If we have fewer than 9 cards, everything is 0
         if len(all_cards) < 9:
@@ -308,7 +307,7 @@ class Decklist:
             # Check first 3 cards for any Daniel references
             # (Lost Souls count here — they keep the chain going)
             first_3 = shuffled_deck[0:3]
-            triggered = any(ref and "Daniel" in ref for ref, _ in first_3)
+            triggered = any(is_daniel for is_daniel, _ in first_3)
 
             # If no Daniel cards in first 3, the chain never fires (a whiff)
             if not triggered:
@@ -318,8 +317,8 @@ class Decklist:
             # Chain triggered — tally the Daniel references in the top 9,
             # keeping souls and non-souls separate
             top_9_cards = shuffled_deck[0:9]
-            for ref, is_lost_soul in top_9_cards:
-                if ref and "Daniel" in ref:
+            for is_daniel, is_lost_soul in top_9_cards:
+                if is_daniel:
                     if is_lost_soul:
                         soul_total += 1
                     else:
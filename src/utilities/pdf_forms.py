@@ -0,0 +1,180 @@
+"""
+Embedding existing PDF pages in reportlab documents as form XObjects.
+
+reportlab can only place forms it drew itself, so page_to_form() copies a
+PyPDF2 page (its content stream and the whole resource tree it references)
+into the canvas's document as a Form XObject. The page can then be drawn
+with canvas.doForm() like any other form, underneath or alongside the
+overlay, with no second parse and no PyPDF2 merge.
+
+In compact mode the copy also leaves out resources the page's content never
+names, Flate-compresses any stream the source left unencoded and re-deflates
+Flate streams that a PDF producer compressed lightly.
+"""
+
+import io
+import re
+import zlib
+from functools import lru_cache
+
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    StreamObject,
+)
+from reportlab.pdfbase.pdfdoc import (
+    PDFArray,
+    PDFDictionary,
+    PDFName,
+    PDFObject,
+    PDFObjectReference,
+    PDFStream,
+    PDFZCompress,
+)
+
+# Resource categories whose entries a content stream refers to by name.
+RESOURCE_CATEGORIES = (
+    "/ColorSpace",
+    "/ExtGState",
+    "/Font",
+    "/Pattern",
+    "/Properties",
+    "/Shading",
+    "/XObject",
+)
+_NAME_TOKEN = re.compile(rb"/([^\s/\[\]()<>{}%]+)")
+_FLATE_FILTER_BYTES = len(b"/Filter /FlateDecode ")
+
+
+@lru_cache(maxsize=256)
+def _deflate(data: bytes, inflate: bool) -> bytes:
+    """
+    Best-effort Flate encoding of 'data' (inflated first if 'inflate').
+    Cached: templates hand in the same stream bytes on every request.
+    """
+    return zlib.compress(zlib.decompress(data) if inflate else data, 9)
+
+
+class _RawPDFValue(PDFObject):
+    """A direct value (number, name, string, ...) already serialized by PyPDF2."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def format(self, document):
+        return self.data
+
+
+class _FormConverter:
+    """Copy PyPDF2 objects into one reportlab document, each object once."""
+
+    def __init__(self, document, prefix: str, compress: bool = False):
+        self.document = document
+        self.prefix = prefix
+        self.compress = compress
+        self.references = {}
+
+    def convert(self, obj):
+        if isinstance(obj, IndirectObject):
+            return self._convert_indirect(obj)
+        if isinstance(obj, StreamObject):
+            return self._convert_stream(obj)
+        if isinstance(obj, DictionaryObject):
+            return PDFDictionary(
+                {key[1:]: self.convert(value) for key, value in obj.items()}
+            )
+        if isinstance(obj, ArrayObject):
+            return PDFArray([self.convert(value) for value in obj])
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer, None)
+        return _RawPDFValue(buffer.getvalue())
+
+    def _convert_indirect(self, reference: IndirectObject):
+        key = (reference.idnum, reference.generation)
+        if key not in self.references:
+            # Name the object before converting it so reference cycles resolve.
+            name = f"{self.prefix}.{reference.idnum}.{reference.generation}"
+            self.references[key] = name
+            self.document.Reference(self.convert(reference.get_object()), name)
+        return PDFObjectReference(self.references[key])
+
+    def _convert_stream(self, stream: StreamObject):
+        dictionary = self.convert(DictionaryObject(stream))
+        dictionary.dict.pop("Length", None)
+        # Encoded streams keep their /Filter and are copied byte for byte.
+        data = stream._data
+        if self.compress:
+            data = self._compress(stream, dictionary, data)
+        return PDFStream(dictionary, data)
+
+    @staticmethod
+    def _compress(stream: StreamObject, dictionary: PDFDictionary, data: bytes):
+        if "/Filter" not in stream:
+            packed = _deflate(data, False)
+            # Tiny streams (e.g. Type 3 glyph procedures) grow when deflated.
+            if len(packed) + _FLATE_FILTER_BYTES < len(data):
+                dictionary.dict["Filter"] = PDFName("FlateDecode")
+                return packed
+        elif stream["/Filter"] == "/FlateDecode" and "/DecodeParms" not in stream:
+            try:
+                packed = _deflate(data, True)
+            except zlib.error:
+                return data
+            if len(packed) < len(data):
+                return packed
+        return data
+
+
+def prune_resources(resources: DictionaryObject, content: bytes) -> DictionaryObject:
+    """
+    A copy of a page's 'resources' without the fonts, images, graphics states
+    etc. that its 'content' stream never names. Other entries are kept as is.
+    """
+    names = {"/" + name.decode("latin-1") for name in _NAME_TOKEN.findall(content)}
+    pruned = DictionaryObject()
+    for category, entries in resources.items():
+        entries = entries.get_object()
+        if category in RESOURCE_CATEGORIES and isinstance(entries, DictionaryObject):
+            entries = DictionaryObject(
+                {name: value for name, value in entries.items() if name in names}
+            )
+        pruned[category] = entries
+    return pruned
+
+
+def page_to_form(c, page, form_name: str, compact: bool = False) -> str:
+    """
+    Define 'page' (a PyPDF2 PageObject) as the form 'form_name' in the
+    canvas's document, unless it already is, and return the name to pass to
+    c.doForm(). The form's bounding box is the page's mediabox. 'compact'
+    drops unused resources and compresses unencoded streams.
+    """
+    if c.hasForm(form_name):
+        return form_name
+
+    converter = _FormConverter(c._doc, f"{form_name}.obj", compress=compact)
+    resources = page.get("/Resources", DictionaryObject()).get_object()
+    if compact and page.get_contents() is not None:
+        resources = prune_resources(resources, page.get_contents().get_data())
+    contents = page["/Contents"].get_object()
+    if isinstance(contents, StreamObject):
+        form = converter.convert(contents)
+    else:
+        form = PDFStream(
+            PDFDictionary({}), page.get_contents().get_data(), [PDFZCompress]
+        )
+
+    mediabox = [float(value) for value in page.mediabox]
+    form.dictionary.dict.update(
+        {
+            "Type": PDFName("XObject"),
+            "Subtype": PDFName("Form"),
+            "FormType": 1,
+            "BBox": PDFArray(mediabox),
+            "Matrix": PDFArray([1, 0, 0, 1, -mediabox[0], -mediabox[1]]),
+            "Resources": converter.convert(resources),
+        }
+    )
+    c._doc.addForm(form_name, form)
+    return form_name
@@ -0,0 +1,143 @@
+"""
+Print-and-play proxy sheets: a deck's card images laid out 3 x 3 on letter
+pages at real card size (2.5" x 3.5"), one slot per copy.
+
+Each unique card image is decoded and embedded once, as a form XObject that
+every copy of the card draws, so the PDF grows with the number of different
+cards rather than the number of copies. Preparing those images (WebP decode
+and JPEG encode, both of which release the GIL) is the expensive part and
+runs on the shared card decode pool; laying out the pages afterwards is cheap.
+"""
+
+import io
+from typing import List, Optional, Union
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from src.utilities.card_images import card_image_path, decode_executor, load_card_tile
+from src.utilities.sort import sort_cards
+
+CARD_WIDTH = 2.5 * inch
+CARD_HEIGHT = 3.5 * inch
+GRID_COLUMNS = 3
+GRID_ROWS = 3
+CARDS_PER_PAGE = GRID_COLUMNS * GRID_ROWS
+PROXY_JPEG_QUALITY = 90
+CUT_LINE_GRAY = 0.75
+
+
+def expand_proxy_cards(
+    deck_data: dict,
+    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
+    include_reserve: bool = True,
+) -> list:
+    """
+    [(card_name, card_data), ...] with one entry per copy, in sheet order:
+    the sorted main deck, then the sorted reserve.
+    """
+    zones = ["main_deck", "reserve"] if include_reserve else ["main_deck"]
+    cards = []
+    for zone in zones:
+        for card_name, card_data in sort_cards(deck_data.get(zone, {}), sort_by):
+            cards.extend([(card_name, card_data)] * int(card_data.get("quantity", 1)))
+    return cards
+
+
+def _encode_card_image(image_path: str) -> Optional[bytes]:
+    """The image at 'image_path' as JPEG bytes, or None when it can't be read."""
+    try:
+        buffer = io.BytesIO()
+        load_card_tile(image_path).save(
+            buffer, format="JPEG", quality=PROXY_JPEG_QUALITY, optimize=True
+        )
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not load card image {image_path}: {e}")
+        return None
+    return buffer.getvalue()
+
+
+def _define_card_form(c: canvas.Canvas, form_name: str, jpeg: bytes):
+    """Draw a card image, at card size, into the form 'form_name'."""
+    c.beginForm(form_name, 0, 0, CARD_WIDTH, CARD_HEIGHT)
+    c.drawImage(ImageReader(io.BytesIO(jpeg)), 0, 0, CARD_WIDTH, CARD_HEIGHT)
+    c.endForm()
+
+
+def _draw_placeholder(c: canvas.Canvas, card_name: str):
+    """A labelled blank card for a card whose image is missing."""
+    font_size = 10
+    while font_size > 5 and c.stringWidth(card_name, "Helvetica", font_size) > (
+        CARD_WIDTH - 12
+    ):
+        font_size -= 1
+    c.setFont("Helvetica", font_size)
+    c.drawCentredString(CARD_WIDTH / 2, CARD_HEIGHT / 2, card_name)
+
+
+def make_proxy_pdf(
+    deck_data: dict,
+    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
+    include_reserve: bool = True,
+) -> bytes:
+    """
+    Lay a deck's card images out as a printable 3 x 3 proxy sheet and return
+    the PDF as bytes.
+
+    Args:
+        deck_data: Dictionary containing deck data with 'main_deck' and 'reserve' keys
+        sort_by: Single field or list of fields to sort by (as for make_pdf)
+        include_reserve: Whether to print the reserve after the main deck
+    """
+    cards = expand_proxy_cards(deck_data, sort_by, include_reserve)
+    if not cards:
+        raise AssertionError("The deck has no cards to proxy.")
+
+    image_paths = {}
+    for _, card_data in cards:
+        if card_data.get("imagefile"):
+            image_path = card_image_path(card_data["imagefile"])
+            image_paths.setdefault(image_path, len(image_paths))
+
+    images = dict(
+        zip(image_paths, decode_executor().map(_encode_card_image, image_paths))
+    )
+
+    page_width, page_height = letter
+    margin_x = (page_width - GRID_COLUMNS * CARD_WIDTH) / 2
+    margin_y = (page_height - GRID_ROWS * CARD_HEIGHT) / 2
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
+    for index, (card_name, card_data) in enumerate(cards):
+        slot = index % CARDS_PER_PAGE
+        if index and not slot:
+            c.showPage()
+        column, row = slot % GRID_COLUMNS, slot // GRID_COLUMNS
+        x = margin_x + column * CARD_WIDTH
+        y = page_height - margin_y - (row + 1) * CARD_HEIGHT
+
+        image_file = card_data.get("imagefile")
+        image_path = card_image_path(image_file) if image_file else None
+        jpeg = images.get(image_path)
+        c.saveState()
+        c.translate(x, y)
+        if jpeg:
+            form_name = f"proxy_{image_paths[image_path]}"
+            if not c.hasForm(form_name):
+                _define_card_form(c, form_name, jpeg)
+            c.doForm(form_name)
+        else:
+            _draw_placeholder(c, card_name)
+
+        # Thin cut lines around every slot.
+        c.setStrokeGray(CUT_LINE_GRAY)
+        c.setLineWidth(0.25)
+        c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT)
+        c.restoreState()
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
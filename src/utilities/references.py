@@ -0,0 +1,105 @@
+"""
+Biblical reference parsing.
+
+A card's 'reference' ("II Kings 4:8-37", "Matthew 2:6/Micah 5:2",
+"Hebrews 1:9 (Psalm 45:7)", ...) is parsed once into
+
+    (book_index, chapter, verse, extra_references)
+
+where book_index is the position in BIBLE_BOOKS (len(BIBLE_BOOKS) when the
+book is unknown), chapter/verse are 0 when missing, and extra_references is a
+tuple of (book_index, chapter, verse) for every further reference the string
+cites. The card database stores the result with each card as
+"parsed_reference".
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+# Biblical book order (as book names appear in card data, Roman numerals).
+BIBLE_BOOKS = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua",
+    "Judges", "Ruth", "I Samuel", "II Samuel", "I Kings", "II Kings",
+    "I Chronicles", "II Chronicles", "Ezra", "Nehemiah", "Esther", "Job",
+    "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah",
+    "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
+    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah", "Haggai",
+    "Zechariah", "Malachi", "Matthew", "Mark", "Luke", "John", "Acts",
+    "Romans", "I Corinthians", "II Corinthians", "Galatians", "Ephesians",
+    "Philippians", "Colossians", "I Thessalonians", "II Thessalonians",
+    "I Timothy", "II Timothy", "Titus", "Philemon", "Hebrews", "James",
+    "I Peter", "II Peter", "I John", "II John", "III John", "Jude",
+    "Revelation",
+]
+UNKNOWN_BOOK = len(BIBLE_BOOKS)
+
+# Lowercased book name -> index. "Psalm" is accepted for Psalms.
+_BOOK_INDEX = {book.lower(): i for i, book in enumerate(BIBLE_BOOKS)}
+_BOOK_INDEX["psalm"] = BIBLE_BOOKS.index("Psalms")
+
+# (lowercased prefix, index), longest prefixes first so "II Kings" beats
+# "I Kings" and "I/II/III John" beat "John". Only used for references whose
+# book is not followed directly by a chapter number (e.g. "Genesis (Promo)").
+_BOOK_PREFIXES = sorted(_BOOK_INDEX.items(), key=lambda pair: len(pair[0]), reverse=True)
+
+_BOOK_PART_PATTERN = re.compile(r"[^\d]*")
+_CHAPTER_VERSE_PATTERN = re.compile(r"(\d+)\s*:\s*(\d+)")
+# Separators between the individual references of a multi-reference string.
+_SEGMENT_PATTERN = re.compile(r"[/;()]")
+
+
+def _book_of(text: str) -> Tuple[int, int]:
+    """(book_index, length of the matched book name) for a lowercased reference."""
+    book = _BOOK_PART_PATTERN.match(text).group().strip()
+    index = _BOOK_INDEX.get(book)
+    if index is not None:
+        return index, len(book)
+    for prefix, index in _BOOK_PREFIXES:
+        if text.startswith(prefix):
+            return index, len(prefix)
+    return UNKNOWN_BOOK, 0
+
+
+def _chapter_verse(text: str) -> Tuple[int, int]:
+    match = _CHAPTER_VERSE_PATTERN.search(text)
+    return (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+
+
+@lru_cache(maxsize=8192)
+def parse_reference(reference: str) -> Tuple:
+    """Parse a card reference into (book_index, chapter, verse, extra_references)."""
+    reference = (reference or "").strip()
+    book_index, book_length = _book_of(reference.lower())
+    if book_index == UNKNOWN_BOOK:
+        chapter, verse = 0, 0
+    else:
+        chapter, verse = _chapter_verse(reference[book_length:])
+
+    extra_references = []
+    for segment in _SEGMENT_PATTERN.split(reference)[1:]:
+        segment = segment.strip()
+        segment_book, segment_length = _book_of(segment.lower())
+        if segment_book != UNKNOWN_BOOK:
+            extra_references.append(
+                (segment_book,) + _chapter_verse(segment[segment_length:])
+            )
+
+    return (book_index, chapter, verse, tuple(extra_references))
+
+
+def card_reference(card_data: Dict[str, Any]) -> Tuple:
+    """The card's parsed reference, from the card database when available."""
+    parsed = card_data.get("parsed_reference")
+    if parsed is None:
+        parsed = parse_reference(card_data.get("reference") or "")
+    return parsed
+
+
+def cites_book(card_data: Dict[str, Any], book: str) -> bool:
+    """Whether any of the card's references is from 'book' (e.g. "Daniel")."""
+    book_index = _BOOK_INDEX[book.lower()]
+    parsed = card_reference(card_data)
+    return parsed[0] == book_index or any(
+        extra[0] == book_index for extra in parsed[3]
+    )
@@ -3,6 +3,13 @@ import os
 import PIL.Image as Image
 import PIL.ImageDraw as ImageDraw
 from PIL import ImageFont
+from reportlab.pdfbase.pdfdoc import PDFDictionary, PDFName, PDFResourceDictionary
+
+# Geometry of the seal in generate_seal's default 200px space, shared by the
+# vector version drawn on PDFs.
+SEAL_GEOMETRY_SIZE = 200
+SEAL_FONT = "Helvetica-Bold"
+SEAL_FONT_CAP_HEIGHT = 0.718  # Helvetica-Bold cap height, in ems
 
 
 def generate_seal(
@@ -95,3 +102,113 @@ def generate_seal(
     draw.text((st_x, st_y), status_text, fill=(*color, 210), font=status_font)
 
     return img
+
+
+def _seal_style(valid: bool):
+    if valid:
+        return (34, 139, 34), "LEGAL"  # forest green
+    return (180, 30, 30), "ILLEGAL"  # dark red
+
+
+def draw_seal(c, x: float, y: float, size: float, valid: bool, deck_format: str):
+    """
+    Draw the legality seal on a reportlab canvas with its lower-left corner at
+    (x, y), as vector shapes and text rather than a raster image.
+
+    The seal is defined once per document as a form XObject for each
+    (valid, deck_format) pair and reused, so repeating it (e.g. in a packet of
+    sheets) costs one reference per page. It mirrors generate_seal's layout
+    with the standard Helvetica-Bold font, so nothing is embedded.
+    """
+    form_name = f"seal_{'legal' if valid else 'illegal'}_{deck_format}".replace(
+        " ", "_"
+    )
+    if not c.hasForm(form_name):
+        _define_seal_form(c, form_name, valid, deck_format)
+
+    c.saveState()
+    c.translate(x, y)
+    scale = size / SEAL_GEOMETRY_SIZE
+    c.scale(scale, scale)
+    c.doForm(form_name)
+    c.restoreState()
+
+
+# Opacities (0-255, as generate_seal uses them) the seal is drawn with.
+SEAL_ALPHAS = (210, 180, 35)
+
+
+def _alpha_state_name(alpha: int) -> str:
+    return f"SealAlpha{alpha}"
+
+
+def _alpha_states() -> dict:
+    """The seal form's ExtGState resources: one stroke and fill opacity each."""
+    return {
+        _alpha_state_name(alpha): PDFDictionary(
+            {"Type": PDFName("ExtGState"), "CA": alpha / 255, "ca": alpha / 255}
+        )
+        for alpha in SEAL_ALPHAS
+    }
+
+
+def _define_seal_form(c, form_name: str, valid: bool, deck_format: str):
+    """
+    Define the seal as the form 'form_name'. Its opacities are graphics states
+    named in the form's own resources and selected with a "gs" operator, so
+    the form doesn't depend on reportlab's per-document alpha bookkeeping.
+    """
+    size = SEAL_GEOMETRY_SIZE
+    (red, green, blue), status_text = _seal_style(valid)
+    rgb = (red / 255, green / 255, blue / 255)
+
+    def set_alpha(alpha):
+        c.addLiteral(f"/{_alpha_state_name(alpha)} gs")
+
+    center = size / 2
+    radius = center - 4
+    border_width = max(size // 25, 3)
+    inner_gap = border_width + max(size // 40, 2)
+    inner_radius = radius - inner_gap
+    inner_width = max(border_width // 2, 2)
+    fill_radius = inner_radius - max(size // 50, 1)
+
+    c.beginForm(form_name, 0, 0, size, size)
+    c.saveState()
+
+    # PIL draws ellipse outlines inside the bounding box, so stroke along the
+    # middle of each ring.
+    set_alpha(210)
+    c.setStrokeColorRGB(*rgb)
+    c.setLineWidth(border_width)
+    c.circle(center, center, radius - border_width / 2, stroke=1, fill=0)
+    c.setLineWidth(inner_width)
+    c.circle(center, center, inner_radius - inner_width / 2, stroke=1, fill=0)
+
+    # Semi-transparent fill
+    set_alpha(35)
+    c.setFillColorRGB(*rgb)
+    c.circle(center, center, fill_radius, stroke=0, fill=1)
+
+    # Format label (e.g. "TYPE 1") — top half, bottom edge just above center
+    format_font_size = int(size * 0.12)
+    c.setFont(SEAL_FONT, format_font_size)
+    set_alpha(180)
+    c.drawCentredString(center, center + int(size * 0.06), deck_format.upper())
+
+    # Status text (LEGAL / ILLEGAL) — bottom half, top edge just below center
+    status_font_size = int(size * 0.16) if valid else int(size * 0.13)
+    c.setFont(SEAL_FONT, status_font_size)
+    set_alpha(210)
+    c.drawCentredString(
+        center,
+        center - int(size * 0.02) - SEAL_FONT_CAP_HEIGHT * status_font_size,
+        status_text,
+    )
+
+    c.restoreState()
+
+    resources = PDFResourceDictionary()
+    resources.basicFonts()
+    resources.ExtGState = _alpha_states()
+    c.endForm(Resources=resources)
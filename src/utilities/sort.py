@@ -6,7 +6,12 @@ allowing for customizable sort orders based on alignment, brigade, name, and oth
 """
 
 import re
-from typing import Any, Dict, List, Tuple, Union
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from src.utilities.brigades import BRIGADE_BITS, EVIL_BRIGADE_MASK, GOOD_BRIGADE_MASK
+from src.utilities.references import card_reference
 
 
 # Sort field extractors
@@ -59,43 +64,14 @@ _EVIL_BRIGADE_ORDER = [
     "gray", "multi", "orange", "pale green",
 ]
 
-# Brigade tokens that belong to exactly one alignment (for dual detection).
-_GOOD_ONLY_BRIGADES = {
-    "blue", "clay", "green", "purple", "red",
-    "silver", "teal", "white", "good gold", "goodgold",
-}
-_EVIL_ONLY_BRIGADES = {
-    "black", "brown", "crimson", "gray",
-    "orange", "pale green", "evil gold", "evilgold",
-}
-
-# Biblical book order (as book names appear in card data, Roman numerals).
-_BIBLE_BOOKS = [
-    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy", "Joshua",
-    "Judges", "Ruth", "I Samuel", "II Samuel", "I Kings", "II Kings",
-    "I Chronicles", "II Chronicles", "Ezra", "Nehemiah", "Esther", "Job",
-    "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah",
-    "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel", "Amos",
-    "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah", "Haggai",
-    "Zechariah", "Malachi", "Matthew", "Mark", "Luke", "John", "Acts",
-    "Romans", "I Corinthians", "II Corinthians", "Galatians", "Ephesians",
-    "Philippians", "Colossians", "I Thessalonians", "II Thessalonians",
-    "I Timothy", "II Timothy", "Titus", "Philemon", "Hebrews", "James",
-    "I Peter", "II Peter", "I John", "II John", "III John", "Jude",
-    "Revelation",
-]
-# (lowercased prefix, index), longest prefixes first so "II Kings" beats
-# "I Kings" and "I/II/III John" beat "John". "Psalm" accepted for Psalms.
-_BOOK_PREFIXES = sorted(
-    [(book.lower(), i) for i, book in enumerate(_BIBLE_BOOKS)]
-    + [("psalm", _BIBLE_BOOKS.index("Psalms"))],
-    key=lambda pair: len(pair[0]),
-    reverse=True,
-)
+# Brigade tokens that belong to exactly one alignment (for dual detection),
+# mapped to their brigade bit so a card's sides are a single bitmask.
+_SIDED_BRIGADE_BITS = {brigade.lower(): bit for brigade, bit in BRIGADE_BITS.items()}
+_SIDED_BRIGADE_BITS["goodgold"] = BRIGADE_BITS["Good Gold"]
+_SIDED_BRIGADE_BITS["evilgold"] = BRIGADE_BITS["Evil Gold"]
 
 _PAREN_PATTERN = re.compile(r"\([^)]*\)")
 _INT_PATTERN = re.compile(r"-?\d+")
-_CHAPTER_VERSE_PATTERN = re.compile(r"(\d+)\s*:\s*(\d+)")
 
 # Section ranks
 _SEC_DOMINANT = 0
@@ -165,10 +141,10 @@ def _is_dual(card_data: Dict[str, Any]) -> bool:
     brigade = _strip_parens(_raw_brigade(card_data))
     if " and " in brigade:
         return True
-    tokens = _brigade_tokens(_raw_brigade(card_data))
-    return any(t in _GOOD_ONLY_BRIGADES for t in tokens) and any(
-        t in _EVIL_ONLY_BRIGADES for t in tokens
-    )
+    mask = 0
+    for token in _brigade_tokens(_raw_brigade(card_data)):
+        mask |= _SIDED_BRIGADE_BITS.get(token, 0)
+    return bool(mask & GOOD_BRIGADE_MASK) and bool(mask & EVIL_BRIGADE_MASK)
 
 
 def _primary_brigade_rank(card_data: Dict[str, Any], is_good_section: bool) -> Tuple[int, str]:
@@ -226,14 +202,9 @@ def _strength_key(card_data: Dict[str, Any]) -> Tuple[int, int]:
 
 def _reference_key(card_data: Dict[str, Any], card_name: str) -> Tuple:
     """(book_index, chapter, verse, raw_reference, name) — biblical order for Lost Souls."""
-    reference = (card_data.get("reference") or "").strip()
-    ref_lower = reference.lower()
-    for prefix, index in _BOOK_PREFIXES:
-        if ref_lower.startswith(prefix):
-            match = _CHAPTER_VERSE_PATTERN.search(reference[len(prefix):])
-            chapter, verse = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
-            return (index, chapter, verse, ref_lower, card_name.lower())
-    return (len(_BIBLE_BOOKS), 0, 0, ref_lower, card_name.lower())
+    book_index, chapter, verse, _ = card_reference(card_data)
+    ref_lower = (card_data.get("reference") or "").strip().lower()
+    return (book_index, chapter, verse, ref_lower, card_name.lower())
 
 
 def _section_rank(card_data: Dict[str, Any]) -> int:
@@ -281,6 +252,79 @@ def default_sort_key(card_name: str, card_data: Dict[str, Any]) -> Tuple:
     return (section, name)
 
 
+# Sort spec field -> key extractor taking (card_name, card_data).
+_FIELD_KEYS = {
+    "default": default_sort_key,
+    "alignment": lambda card_name, card_data: _get_alignment_priority(card_data),
+    "brigade": lambda card_name, card_data: _get_brigade(card_data),
+    "type": lambda card_name, card_data: _get_type(card_data),
+    "name": lambda card_name, card_data: _get_name(card_name),
+}
+
+
+def card_sort_keys(card_name: str, card_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Every supported sort key for one card: "default" plus one entry per field
+    in SORT_FIELDS. They depend only on the card, so the card database stores
+    them with each record (as "sort_keys") and sort_cards reuses them.
+    """
+    return {field: key(card_name, card_data) for field, key in _FIELD_KEYS.items()}
+
+
+@lru_cache(maxsize=None)
+def _compile_fields(
+    fields: Tuple[str, ...],
+) -> Callable[[Tuple[str, Dict[str, Any]]], Any]:
+    if fields != ("default",):
+        for field in fields:
+            if field not in SORT_FIELDS:
+                raise ValueError(f"Unknown sort field: {field}")
+    if not fields:
+        # Nothing to sort by: every key ties, so a stable sort keeps the order.
+        return lambda item: ()
+
+    # Precomputed keys are read as columns of the card's "sort_keys"; cards
+    # without them (hand-built dicts) derive the same columns on the fly.
+    columns = itemgetter(*fields)
+    extractors = tuple(_FIELD_KEYS[field] for field in fields)
+    if len(extractors) == 1:
+        extractor = extractors[0]
+
+        def derive(card_name, card_data):
+            return extractor(card_name, card_data)
+
+    else:
+
+        def derive(card_name, card_data):
+            return tuple(key(card_name, card_data) for key in extractors)
+
+    def sort_key(item):
+        card_name, card_data = item
+        sort_keys = card_data.get("sort_keys")
+        if sort_keys is not None:
+            return columns(sort_keys)
+        return derive(card_name, card_data)
+
+    return sort_key
+
+
+def compile_sort_key(
+    sort_by: Union[str, List[str]],
+) -> Callable[[Tuple[str, Dict[str, Any]]], Any]:
+    """
+    Turn a sort spec into a key function over (card_name, card_data) items.
+
+    The spec is validated here, once, and the compiled function is memoized
+    per spec, so every renderer sorting by the same spec shares one key
+    function.
+
+    Raises:
+        ValueError: if the spec names an unknown field.
+    """
+    fields = (sort_by,) if isinstance(sort_by, str) else tuple(sort_by)
+    return _compile_fields(fields)
+
+
 def sort_cards(
     cards_dict: Dict[str, Dict[str, Any]], sort_by: Union[str, List[str]] = "name"
 ) -> List[Tuple[str, Dict[str, Any]]]:
@@ -303,29 +347,7 @@ def sort_cards(
         sort_cards(cards, ["alignment", "brigade", "name"])  # Multi-field sort
         sort_cards(cards, ["type", "alignment", "brigade", "name"])  # Full sort
     """
-    if sort_by == "default":
-        return sorted(
-            cards_dict.items(), key=lambda item: default_sort_key(item[0], item[1])
-        )
-
-    if isinstance(sort_by, str):
-        sort_by = [sort_by]
-
-    def sort_key(item):
-        card_name, card_data = item
-        key_parts = []
-
-        for field in sort_by:
-            if field == "name":
-                key_parts.append(_get_name(card_name))
-            elif field in SORT_FIELDS:
-                key_parts.append(SORT_FIELDS[field](card_data))
-            else:
-                raise ValueError(f"Unknown sort field: {field}")
-
-        return tuple(key_parts)
-
-    return sorted(cards_dict.items(), key=sort_key)
+    return sorted(cards_dict.items(), key=compile_sort_key(sort_by))
 
 
 # Convenience functions for common patterns
@@ -0,0 +1,212 @@
+"""Measure the printable geometry of a deck-check template PDF.
+
+The template layout registry (template_layouts.py) is built from these
+measurements, so the section limits and the positions text is drawn at come
+straight from the PDF instead of being hand-maintained against a binary
+asset.
+
+Uses PyPDF2 only (already a dependency) — no rendering, no system binaries.
+Each ruled line is drawn as a thin filled rectangle, i.e. two horizontal
+path segments ~1pt apart, so near-duplicate segments are merged. Printed
+labels ("Name:", "Dominants: (    )", ...) are located by replaying the
+page's text operators with the font's glyph widths.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import ContentStream
+
+_NUM = r"-?\d+\.?\d*"
+_TOKEN = re.compile(rf"({_NUM})|([A-Za-z'\"*]+)")
+_BFCHAR_BLOCK = re.compile(r"beginbfchar(.*?)endbfchar", re.S)
+_BFCHAR = re.compile(r"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>")
+
+RULE_WIDTH = 221.5  # inner width of every body column rule
+WIDTH_TOL = 3.0
+SECTION_GAP = 25.0  # vertical gap that separates one section from the next
+LINE_MERGE = 2.0  # segments closer than this are the same printed rule
+
+# Sections in top-to-bottom order within each column.
+COLUMN_SECTIONS = [
+    ["Dominant", "Hero", "GE"],
+    ["Lost Soul", "Evil Character", "EE"],
+    ["Artifact", "Fortress", "Misc", "Reserve"],
+]
+
+
+class TextRun(NamedTuple):
+    """One shown string: its text, baseline (from the top) and glyph x positions."""
+
+    text: str
+    baseline: float
+    char_x: Tuple[float, ...]  # left edge of each character
+    end_x: float
+
+
+def _mul(a, b):
+    return (a[0] * b[0] + a[1] * b[2], a[0] * b[1] + a[1] * b[3],
+            a[2] * b[0] + a[3] * b[2], a[2] * b[1] + a[3] * b[3],
+            a[4] * b[0] + a[5] * b[2] + b[4], a[4] * b[1] + a[5] * b[3] + b[5])
+
+
+def _apply(m, x, y):
+    return (m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5])
+
+
+@lru_cache(maxsize=None)
+def _first_page(pdf_path: str):
+    return PdfReader(pdf_path).pages[0]
+
+
+def page_size(pdf_path: str) -> Tuple[float, float]:
+    """(width, height) of the template page in points."""
+    mediabox = _first_page(pdf_path).mediabox
+    return float(mediabox.width), float(mediabox.height)
+
+
+def horizontal_rules(pdf_path: str) -> List[Tuple[float, float]]:
+    """(y_from_top, x_start) for every ruled writing line, top-down."""
+    page = _first_page(pdf_path)
+    height = float(page.mediabox.height)
+    data = page.get_contents().get_data().decode("latin-1")
+
+    ctm, stack, operands, cur = (1, 0, 0, 1, 0, 0), [], [], None
+    found = []
+    for match in _TOKEN.finditer(data):
+        if match.group(1) is not None:
+            operands.append(float(match.group(1)))
+            continue
+        op = match.group(2)
+        if op == "q":
+            stack.append(ctm)
+        elif op == "Q":
+            ctm = stack.pop() if stack else (1, 0, 0, 1, 0, 0)
+        elif op == "cm" and len(operands) >= 6:
+            ctm = _mul(tuple(operands[-6:]), ctm)
+        elif op == "m" and len(operands) >= 2:
+            cur = _apply(ctm, operands[-2], operands[-1])
+        elif op == "l" and len(operands) >= 2:
+            point = _apply(ctm, operands[-2], operands[-1])
+            if cur is not None and abs(point[1] - cur[1]) < 0.4:
+                width = abs(point[0] - cur[0])
+                if abs(width - RULE_WIDTH) <= WIDTH_TOL:
+                    found.append((height - cur[1], min(cur[0], point[0])))
+            cur = point
+        operands = []
+
+    return sorted(found)
+
+
+def section_rules(pdf_path: str) -> Dict[str, List[Tuple[float, float]]]:
+    """Section name -> (y_from_top, x_start) of each ruled writing line, top-down."""
+    rules = horizontal_rules(pdf_path)
+    if not rules:
+        raise AssertionError(
+            f"No ruled lines detected in {pdf_path}. The template's drawing "
+            "style likely changed; re-verify the section limits by hand."
+        )
+
+    # Split into columns by x position.
+    columns: List[List[float]] = []
+    for x_start in sorted({round(x) for _, x in rules}):
+        if columns and x_start - columns[-1][0] < 20:
+            continue
+        columns.append([x_start])
+    column_x = [c[0] for c in columns]
+
+    grouped: Dict[str, List[Tuple[float, float]]] = {}
+    for index, x_ref in enumerate(column_x):
+        column = sorted((y, x) for y, x in rules if abs(x - x_ref) < 20)
+        # Each printed rule is a thin rectangle: two edges ~1pt apart. Merge
+        # them here, per column, since all columns share the same y values.
+        lines: List[Tuple[float, float]] = []
+        for y, x in column:
+            if lines and y - lines[-1][0] <= LINE_MERGE:
+                lines[-1] = (lines[-1][0], min(lines[-1][1], x))
+            else:
+                lines.append((y, x))
+        sections: List[List[Tuple[float, float]]] = []
+        for line in lines:
+            if sections and line[0] - sections[-1][-1][0] <= SECTION_GAP:
+                sections[-1].append(line)
+            else:
+                sections.append([line])
+        # A lone rule is a header underline (e.g. beneath "Reserve:"), not a
+        # writing line.
+        sections = [s for s in sections if len(s) > 1]
+        names = COLUMN_SECTIONS[index] if index < len(COLUMN_SECTIONS) else []
+        for name, section in zip(names, sections):
+            grouped[name] = section
+    return grouped
+
+
+def section_line_counts(pdf_path: str) -> Dict[str, int]:
+    """Section name -> number of ruled writing lines on this template."""
+    return {name: len(lines) for name, lines in section_rules(pdf_path).items()}
+
+
+def _font_metrics(font) -> Tuple[Dict[int, str], Dict[int, float]]:
+    """(code -> character, code -> advance per unit font size) for a simple font."""
+    characters = {}
+    if "/ToUnicode" in font:
+        cmap = font["/ToUnicode"].get_object().get_data().decode("latin-1")
+        for block in _BFCHAR_BLOCK.findall(cmap):
+            for source, target in _BFCHAR.findall(block):
+                characters[int(source, 16)] = bytes.fromhex(target).decode("utf-16-be")
+    scale = float(font.get("/FontMatrix", [0.001])[0])
+    first_char = int(font.get("/FirstChar", 0))
+    widths = font.get("/Widths")
+    widths = widths.get_object() if widths is not None else []
+    advances = {first_char + i: float(w) * scale for i, w in enumerate(widths)}
+    return characters, advances
+
+
+def text_runs(pdf_path: str) -> List[TextRun]:
+    """Every string the page shows, with where each character starts."""
+    page = _first_page(pdf_path)
+    height = float(page.mediabox.height)
+    fonts = page["/Resources"].get("/Font", {})
+    metrics = {}
+
+    ctm, stack = (1, 0, 0, 1, 0, 0), []
+    tm, font, font_size = (1, 0, 0, 1, 0, 0), None, 1.0
+    runs = []
+    for operands, op in ContentStream(page.get_contents(), page.pdf).operations:
+        if op == b"q":
+            stack.append(ctm)
+        elif op == b"Q":
+            ctm = stack.pop() if stack else (1, 0, 0, 1, 0, 0)
+        elif op == b"cm":
+            ctm = _mul(tuple(float(v) for v in operands), ctm)
+        elif op == b"BT":
+            tm = (1, 0, 0, 1, 0, 0)
+        elif op == b"Tm":
+            tm = tuple(float(v) for v in operands)
+        elif op == b"Td":
+            tm = _mul((1, 0, 0, 1, float(operands[0]), float(operands[1])), tm)
+        elif op == b"Tf":
+            name, font_size = operands[0], float(operands[1])
+            if name not in metrics:
+                metrics[name] = _font_metrics(fonts[name].get_object())
+            font = metrics[name]
+        elif op in (b"TJ", b"Tj") and font is not None:
+            items = operands[0] if op == b"TJ" else [operands[0]]
+            characters, advances = font
+            matrix = _mul(tm, ctm)
+            offset, text, char_x = 0.0, "", []
+            for item in items:
+                if isinstance(item, (str, bytes)):
+                    codes = item.original_bytes if hasattr(item, "original_bytes") else item
+                    for code in codes:
+                        char_x.append(_apply(matrix, offset, 0)[0])
+                        text += characters.get(code, "")
+                        offset += advances.get(code, 0.0) * font_size
+                else:
+                    offset -= float(item) / 1000 * font_size
+            x_end, y = _apply(matrix, offset, 0)
+            runs.append(TextRun(text, height - y, tuple(char_x), x_end))
+            tm = _mul((1, 0, 0, 1, offset, 0), tm)
+    return runs
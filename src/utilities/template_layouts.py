@@ -0,0 +1,139 @@
+"""
+Registry of deck check templates and the layout measured from each.
+
+Where the card lists go, how many lines each section holds, where the
+section counts and header fields are printed: all of it is measured from
+the template PDF itself (see template_geometry.py) the first time a
+template is used, then cached for the life of the process. Dropping in a
+re-drawn template needs no code change as long as it keeps the same
+labels and ruled-line style.
+"""
+
+import threading
+from typing import Dict, NamedTuple, Tuple
+
+from src.utilities.template_geometry import (
+    COLUMN_SECTIONS,
+    page_size,
+    section_rules,
+    text_runs,
+)
+
+T1_TEMPLATE = "assets/pdfs/t1_deck_check_v2.pdf"
+T2_TEMPLATE = "assets/pdfs/t2_deck_check_v2.pdf"
+
+DECK_TEMPLATES = {
+    "type_1": T1_TEMPLATE,
+    "paragon": T1_TEMPLATE,
+    "type_2": T2_TEMPLATE,
+}
+
+# Printed section headings ("Dominants: (    )") -> sheet section.
+SECTION_HEADINGS = {
+    "Dominants": "Dominant",
+    "Heroes": "Hero",
+    "Good Enhancements": "GE",
+    "Lost Souls": "Lost Soul",
+    "Evil Characters": "Evil Character",
+    "Evil Enhancements": "EE",
+    "Artifacts/Curses/Covenants": "Artifact",
+    "Sites/Fortresses/Cities": "Fortress",
+    "Misc.": "Misc",
+    "Reserve": "Reserve",
+}
+HEADER_LABELS = ("Name:", "Event:", "Total Cards:")
+
+LIST_INDENT = 5  # card names start this far right of a column's rules
+RESERVE_INDENT = 4  # ...and this far right of the Reserve box's line numbers
+LIST_BASELINE_ABOVE_RULE = 3  # text sits this far above its ruled line
+
+
+class TemplateLayout(NamedTuple):
+    """
+    Everything make_pdf needs to fill in one template. Positions are
+    (x, y from the top of the page); y is a text baseline.
+    """
+
+    width: float
+    height: float
+    limits: Dict[str, int]  # section -> ruled writing lines
+    lists: Dict[str, Tuple[float, float]]  # section -> first card line
+    counts: Dict[str, Tuple[float, float]]  # section -> centre of its "(    )"
+    labels: Dict[str, Tuple[float, float]]  # "Name:" etc. -> label start
+
+
+def template_for_deck_type(deck_type: str) -> str:
+    """Path of the deck check template for 'deck_type'."""
+    if deck_type not in DECK_TEMPLATES:
+        raise AssertionError(f"Unknown deck type: {deck_type}")
+    return DECK_TEMPLATES[deck_type]
+
+
+# Measuring reads the template through a lazily-loading PdfReader, so it is
+# done by one thread at a time. Measured layouts are read without the lock.
+_MEASURE_LOCK = threading.Lock()
+_layouts: Dict[str, TemplateLayout] = {}
+
+
+def template_layout(template_path: str) -> TemplateLayout:
+    """Measure 'template_path' once per process and return its layout."""
+    layout = _layouts.get(template_path)
+    if layout is None:
+        with _MEASURE_LOCK:
+            layout = _layouts.get(template_path)
+            if layout is None:
+                layout = _measure_layout(template_path)
+                _layouts[template_path] = layout
+    return layout
+
+
+def _measure_layout(template_path: str) -> TemplateLayout:
+    width, height = page_size(template_path)
+    rules = section_rules(template_path)
+    runs = text_runs(template_path)
+
+    lists = {}
+    for column in COLUMN_SECTIONS:
+        column_x = min(x for section in column for _, x in rules[section])
+        for section in column:
+            first_line_y = rules[section][0][0]
+            lists[section] = (
+                column_x + LIST_INDENT,
+                first_line_y - LIST_BASELINE_ABOVE_RULE,
+            )
+    line_numbers = [run for run in runs if run.text.rstrip(".").isdigit()]
+    if line_numbers:
+        lists["Reserve"] = (
+            max(run.end_x for run in line_numbers) + RESERVE_INDENT,
+            lists["Reserve"][1],
+        )
+
+    counts, labels = {}, {}
+    for run in runs:
+        heading = run.text.split("(")[0].strip().rstrip(":")
+        if heading in SECTION_HEADINGS and "(" in run.text and ")" in run.text:
+            open_paren = run.text.index("(")
+            inside_start = run.char_x[open_paren + 1]
+            inside_end = run.char_x[run.text.index(")", open_paren)]
+            counts[SECTION_HEADINGS[heading]] = (
+                (inside_start + inside_end) / 2,
+                run.baseline,
+            )
+        elif run.text in HEADER_LABELS:
+            labels[run.text] = (run.char_x[0], run.baseline)
+
+    missing = (set(lists) - set(counts)) | (set(HEADER_LABELS) - set(labels))
+    if missing:
+        raise AssertionError(
+            f"Could not find {sorted(missing)} on {template_path}; the "
+            "template's labels changed."
+        )
+
+    return TemplateLayout(
+        width=width,
+        height=height,
+        limits={section: len(lines) for section, lines in rules.items()},
+        lists=lists,
+        counts=counts,
+        labels=labels,
+    )
@@ -1,16 +1,25 @@
+import hashlib
+import io
 import os
 import re
-from typing import List, Union
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Union
 
-from dotenv import load_dotenv
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import NameObject
 from reportlab.pdfgen import canvas
 
-from src.utilities.config import str_to_bool
-from src.utilities.seal import generate_seal
-from src.utilities.sort import sort_cards
-
-load_dotenv()
+from src.utilities.pdf_forms import page_to_form, prune_resources
+from src.utilities.seal import draw_seal
+from src.utilities.sort import compile_sort_key, sort_cards
+from src.utilities.template_layouts import (  # noqa: F401 (re-exported)
+    T1_TEMPLATE,
+    T2_TEMPLATE,
+    template_for_deck_type,
+    template_layout,
+)
 
 # Precompile regex patterns for efficiency.
 SET_NAME_PATTERN = re.compile(r"(\([^)]*\))\s*$")
@@ -18,61 +27,91 @@ LOST_SOUL_PREFIX_PATTERN = re.compile(r"^Lost Soul\s+")
 BRACKET_PATTERN = re.compile(r"\[([^\]]+)\]")
 HYPHEN_PATTERN = re.compile(r"\s*-\s*[^]]+")
 
-NON_MISC_TYPES = [
-    "Dominant",
-    "Hero",
-    "GE",
-    "Lost Soul",
-    "Evil Character",
-    "EE",
-    "Artifact",
-    "Fortress",
-    "Site",
-    "Curse",
-    "Covenant",
-    "City",
-]
-
-T1_TEMPLATE = "assets/pdfs/t1_deck_check_v2.pdf"
-T2_TEMPLATE = "assets/pdfs/t2_deck_check_v2.pdf"
-
-# The T1 template's Reserve box has exactly this many numbered lines, which
-# matches T1's reserve cap of 10.
-T1_RESERVE_LINE_LIMIT = 10
-
-# Section limits are the number of ruled writing lines each section actually
-# has on the v2 templates. The v2 sheets keep the same total line count as v1
-# but redistribute it: Dominants and Lost Souls were heavily over-allocated
-# (21 lines each on T1) while Heroes/Evil Characters and the Enhancement
-# sections were starved, which is what forced most overflow pages.
-T1_SECTION_LIMITS = {
-    "Dominant": 9,
-    "Hero": 24,
-    "GE": 21,
-    "Lost Soul": 9,
-    "Evil Character": 24,
-    "EE": 21,
-    "Artifact": 16,  # Combined: Artifact, Covenant, Curse
-    "Fortress": 13,  # Combined: Fortress, Site, City
-    "Misc": 10,
+# Deck check sheet section -> the card types listed (and counted) in it. Any
+# type not listed here belongs to "Misc".
+SECTION_TYPES = {
+    "Dominant": ["Dominant"],
+    "Hero": ["Hero"],
+    "GE": ["GE"],
+    "Lost Soul": ["Lost Soul"],
+    "Evil Character": ["Evil Character"],
+    "EE": ["EE"],
+    "Artifact": ["Artifact", "Covenant", "Curse"],
+    "Fortress": ["Fortress", "Site", "City"],
 }
-
-T2_SECTION_LIMITS = {
-    "Dominant": 19,
-    "Hero": 21,
-    "GE": 13,
-    "Lost Soul": 19,
-    "Evil Character": 21,
-    "EE": 13,
-    "Artifact": 13,  # Combined: Artifact, Covenant, Curse
-    "Fortress": 11,  # Combined: Fortress, Site, City
-    "Misc": 6,
+_TYPE_TO_SECTION = {
+    card_type: label for label, types in SECTION_TYPES.items() for card_type in types
+}
+# Main-deck sections in the order they are drawn (and listed on overflow pages).
+SHEET_SECTIONS = list(SECTION_TYPES) + ["Misc"]
+
+# Text colors for cards (and counts) when alignment colors are shown.
+ALIGNMENT_COLORS = {
+    "Good": (0, 0.5, 0),  # Green
+    "Evil": (0.8, 0, 0),  # Red
+    "Neutral": (0.3, 0.3, 0.3),  # Darker Gray (changed from 0.5, 0.5, 0.5)
 }
+BLACK = (0, 0, 0)
+
+OVERFLOW_MARGIN = 50
+
+# PdfReader loads objects lazily from a shared stream, so reading pages out of
+# a cached template is serialized.
+_TEMPLATE_LOCK = threading.Lock()
 
-# The v2 T2 template's Reserve box has exactly 20 numbered lines, matching
-# T2's reserve cap of 20, so a legal reserve always fits on the sheet. The
-# split is kept as a guard only — it no longer routes anything to overflow.
-T2_RESERVE_LINE_LIMIT = 20
+
+class CardLayer(NamedTuple):
+    """A deck's card layer, drawn once: a one-page PDF and what overflowed."""
+
+    pdf: bytes
+    overflow_sections: list
+
+
+# Deck fingerprint -> CardLayer, most recently used last. A deck seen only once
+# maps to None: its layer is drawn straight onto the sheet and only recorded
+# when the deck comes back, so a deck that is never regenerated costs no more
+# than drawing it.
+CARD_LAYER_CACHE_SIZE = int(os.getenv("CARD_LAYER_CACHE_SIZE", "256"))
+_card_layers = OrderedDict()
+_CARD_LAYER_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def load_template(template_path: str) -> tuple:
+    """
+    Parse a deck check template once per process and return
+    (template_page, width_points, height_points).
+
+    The cached page is never merged into; each request copies it onto a
+    fresh page with template_copy().
+    """
+    page = PdfReader(template_path).pages[0]
+    return page, float(page.mediabox.width), float(page.mediabox.height)
+
+
+def template_form(c: canvas.Canvas, template_path: str, compact: bool = False) -> str:
+    """
+    Define the cached template page as a form XObject in the canvas's document
+    (once per document) and return the form name for c.doForm().
+    """
+    template_page = load_template(template_path)[0]
+    form_name = "template_" + os.path.splitext(os.path.basename(template_path))[0]
+    with _TEMPLATE_LOCK:
+        return page_to_form(c, template_page, form_name, compact=compact)
+
+
+def template_copy(template_page) -> PageObject:
+    """
+    A new page carrying the cached template's content, safe to merge into: a
+    shallow copy of the page dictionary, sharing its content and resource
+    objects. merge_page replaces a page's /Contents and /Resources rather than
+    changing them, so the cached page is never touched. The shared objects are
+    read lazily from the template file, so use the copy under _TEMPLATE_LOCK.
+    """
+    page = PageObject(template_page.pdf)
+    for key, value in template_page.items():
+        page[NameObject(key)] = value
+    return page
 
 
 def clean_card_name(card_name, card_data):
@@ -107,16 +146,53 @@ def clean_card_name(card_name, card_data):
     return card_name
 
 
-def filter_section(deck, card_types):
-    """Filter deck by card type specification, handling 'misc', 'all', and list cases."""
-    if card_types == "misc":
-        return {k: v for k, v in deck.items() if v.get("type") not in NON_MISC_TYPES}
-    elif card_types == "all":
-        return dict(deck)
-    elif isinstance(card_types, str):
-        return {k: v for k, v in deck.items() if v.get("type") == card_types}
-    else:
-        return {k: v for k, v in deck.items() if v.get("type") in card_types}
+def section_for_type(card_type):
+    """Deck check sheet section a card of 'card_type' is listed in."""
+    return _TYPE_TO_SECTION.get(card_type, "Misc")
+
+
+def build_sheet_layout(main_deck, reserve, sort_by):
+    """
+    Bucket, sort and total a deck for the check sheet in a single pass.
+
+    The main deck is sorted once and walked once: each card lands in its
+    sheet section (in sorted order) while the section, alignment and overall
+    totals are accumulated, so the printed counts always agree with the
+    listed cards. The reserve is sorted once as well.
+
+    Returns:
+        dict with keys:
+            sections: section label -> sorted [(card_name, card_data), ...]
+            section_totals: section label -> number of cards
+            alignment_totals: "Good"/"Evil"/"Neutral" -> number of cards
+            total: number of cards in the main deck
+            reserve: sorted [(card_name, card_data), ...]
+            reserve_total: number of cards in the reserve
+    """
+    sort_key = compile_sort_key(sort_by)
+    sections = {label: [] for label in SHEET_SECTIONS}
+    section_totals = {label: 0 for label in SHEET_SECTIONS}
+    alignment_totals = {"Good": 0, "Evil": 0, "Neutral": 0}
+    total = 0
+    for card_name, card_data in sorted(main_deck.items(), key=sort_key):
+        quantity = int(card_data.get("quantity", 1))
+        label = section_for_type(card_data.get("type"))
+        sections[label].append((card_name, card_data))
+        section_totals[label] += quantity
+        if card_data.get("alignment") in alignment_totals:
+            alignment_totals[card_data["alignment"]] += quantity
+        total += quantity
+
+    return {
+        "sections": sections,
+        "section_totals": section_totals,
+        "alignment_totals": alignment_totals,
+        "total": total,
+        "reserve": sorted(reserve.items(), key=sort_key),
+        "reserve_total": sum(
+            int(card.get("quantity", 1)) for card in reserve.values()
+        ),
+    }
 
 
 def place_section(
@@ -136,28 +212,53 @@ def place_section(
     If color_alignment is True, cards are colored based on their alignment.
     If max_items is set, only draw that many unique cards; returns remaining as overflow dict.
     """
-    sorted_items = sort_cards(section_data, sort_by)
+    return place_sorted_items(
+        c,
+        sort_cards(section_data, sort_by),
+        x,
+        y,
+        line_spacing,
+        add_quantity,
+        color_alignment,
+        max_items,
+    )
+
 
+def place_sorted_items(
+    c,
+    sorted_items,
+    x,
+    y,
+    line_spacing,
+    add_quantity=True,
+    color_alignment=False,
+    max_items: int = None,
+    compact: bool = False,
+):
+    """
+    place_section for items that are already sorted (see build_sheet_layout).
+    If compact is True, the items are written as one text object.
+    """
     if max_items is not None and len(sorted_items) > max_items:
         overflow_items = dict(sorted_items[max_items:])
         sorted_items = sorted_items[:max_items]
     else:
         overflow_items = {}
 
+    if compact:
+        place_items_compact(
+            c, sorted_items, x, y, line_spacing, add_quantity, color_alignment
+        )
+        return overflow_items
+
     for card_name, card_data in sorted_items:
         display_name = clean_card_name(card_name, card_data)
 
         # Set color based on alignment if enabled
         if color_alignment:
-            alignment = card_data.get("alignment", "Neutral")
-            if alignment == "Good":
-                c.setFillColorRGB(0, 0.5, 0)  # Green
-            elif alignment == "Evil":
-                c.setFillColorRGB(0.8, 0, 0)  # Red
-            elif alignment == "Neutral":
-                c.setFillColorRGB(
-                    0.3, 0.3, 0.3
-                )  # Darker Gray (changed from 0.5, 0.5, 0.5)
+            color = ALIGNMENT_COLORS.get(card_data.get("alignment", "Neutral"))
+            if color:
+                c.setFillColorRGB(*color)
 
         if add_quantity:
             display_text = f"{card_data.get('quantity', 1)}x {display_name}"
@@ -177,6 +278,40 @@ def place_section(
     return overflow_items
 
 
+def place_items_compact(
+    c, sorted_items, x, y, line_spacing, add_quantity=True, color_alignment=False
+):
+    """
+    Draw the same lines as place_sorted_items, but as a single text object
+    that only changes the fill color when the next card's color differs, and
+    ends black.
+    """
+    if not sorted_items:
+        return
+    text = c.beginText(x, y)
+    text.setLeading(line_spacing)
+    current_color = BLACK
+    for card_name, card_data in sorted_items:
+        display_name = clean_card_name(card_name, card_data)
+        if color_alignment:
+            alignment = card_data.get("alignment", "Neutral")
+            color = ALIGNMENT_COLORS.get(alignment, BLACK)
+            if color != current_color:
+                text.setFillColorRGB(*color)
+                current_color = color
+
+        quantity = card_data.get("quantity", 1)
+        if add_quantity:
+            text.textLine(f"{quantity}x {display_name}")
+        else:
+            for _ in range(quantity):
+                text.textLine(display_name)
+
+    if current_color != BLACK:
+        text.setFillColorRGB(*BLACK)
+    c.drawText(text)
+
+
 def split_reserve_by_line_count(reserve, sort_by, max_lines):
     """
     Split a reserve dict into what fits within max_lines printed lines and
@@ -186,111 +321,73 @@ def split_reserve_by_line_count(reserve, sort_by, max_lines):
     entry (and everything after it) goes to overflow rather than splitting
     its copies across the boundary.
     """
-    sorted_items = sort_cards(reserve, sort_by)
-    visible = {}
+    visible, overflow = split_sorted_by_line_count(sort_cards(reserve, sort_by), max_lines)
+    return dict(visible), overflow
+
+
+def split_sorted_by_line_count(sorted_items, max_lines):
+    """
+    split_reserve_by_line_count for items that are already sorted. Returns
+    (visible sorted items, overflow dict).
+    """
+    visible = []
     overflow = {}
     lines_used = 0
     for card_name, card_data in sorted_items:
         quantity = card_data.get("quantity", 1)
         if not overflow and lines_used + quantity <= max_lines:
-            visible[card_name] = card_data
+            visible.append((card_name, card_data))
             lines_used += quantity
         else:
             overflow[card_name] = card_data
     return visible, overflow
 
 
-def place_section_by_type(
-    c,
-    deck,
-    height_points,
-    card_types,
-    x,
-    y,
-    add_quantity=True,
-    color_alignment=False,
-    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
-    max_items: int = None,
-):
-    """
-    Filter main_deck by card_types and place the section.
-    Returns a dict of overflow items (empty if no overflow).
-    """
+def draw_count(c, total, height_points, x, y, font="Helvetica", font_size=12):
+    """Draw just the total count (number) centred on (x, y)."""
     y = height_points - y
-    line_spacing = 16
-    filtered = filter_section(deck, card_types)
-    return place_section(
-        c,
-        filtered,
-        x,
-        y,
-        line_spacing,
-        add_quantity,
-        color_alignment,
-        sort_by,
-        max_items,
-    )
-
+    c.setFont(font, font_size)
+    c.drawCentredString(x, y, str(total))
 
-def draw_count(
-    c, cards, height_points, card_types, x, y, font="Helvetica", font_size=12
-):
-    """Draw just the total count (number) for cards at (x, y)."""
-    y = height_points - y
-    total = 0
-    for card_data in cards.values():
-        if card_types == "misc":
-            if card_data.get("type") not in [
-                "Dominant",
-                "Hero",
-                "GE",
-                "Lost Soul",
-                "Evil Character",
-                "EE",
-                "Artifact",
-                "Fortress",
-                "Site",
-                "Curse",
-                "Covenant",
-                "City",
-            ]:
-                total += card_data.get("quantity", 1)
-        elif card_data.get("type") == card_types or card_data.get("type") in card_types:
-            total += card_data.get("quantity", 1)
-        elif card_types == "all":
-            total += card_data.get("quantity", 1)
 
-    c.setFont(font, font_size)
-    c.drawString(x, y, str(total))
+def draw_overflow_title(c, height_points, name="", event=""):
+    """The "OVERFLOW — name | event" title at the top of an overflow page."""
+    header_text = "OVERFLOW"
+    if name:
+        header_text += f"  —  {name}"
+    if event:
+        header_text += f"  |  {event}"
+    c.setFont("Helvetica-Bold", 14)
+    c.setFillColorRGB(0, 0, 0)
+    c.drawString(OVERFLOW_MARGIN, height_points - OVERFLOW_MARGIN, header_text)
 
 
 def draw_overflow_page(
-    c, overflow_sections, width_points, height_points, name="", event=""
+    c,
+    overflow_sections,
+    width_points,
+    height_points,
+    name="",
+    event="",
+    compact: bool = False,
 ):
     """
     Draw a plain overflow page onto the canvas.
     Caller must call c.showPage() before this to start a fresh page,
     and c.showPage() after to finalize it.
     overflow_sections: list of (label, items_dict) tuples (only non-empty sections).
+    If compact is True, each column's run of cards is one text object.
     """
-    margin_x = 50
-    margin_y = 50
+    margin_x = OVERFLOW_MARGIN
+    margin_y = OVERFLOW_MARGIN
     col_gap = 20
     col_width = (width_points - 2 * margin_x - col_gap) / 2
     line_spacing = 14
     section_gap = 10
     header_h = 18
 
-    header_text = "OVERFLOW"
-    if name:
-        header_text += f"  —  {name}"
-    if event:
-        header_text += f"  |  {event}"
-
     def draw_page_header():
-        c.setFont("Helvetica-Bold", 14)
-        c.setFillColorRGB(0, 0, 0)
-        c.drawString(margin_x, height_points - margin_y, header_text)
+        draw_overflow_title(c, height_points, name, event)
         c.line(
             margin_x,
             height_points - margin_y - 5,
@@ -319,6 +416,14 @@ def draw_overflow_page(
             x = margin_x
             y = content_top
 
+    def draw_section_header(text):
+        nonlocal y
+        c.setFont("Helvetica-Bold", 10)
+        c.setFillColorRGB(0, 0, 0)
+        c.drawString(x, y, text)
+        y -= header_h
+        c.setFont("Helvetica", 9)
+
     for label, items in overflow_sections:
         if not items:
             continue
@@ -327,27 +432,25 @@ def draw_overflow_page(
         if y - header_h - line_spacing < bottom_limit:
             advance()
 
-        # Section header
-        c.setFont("Helvetica-Bold", 10)
-        c.setFillColorRGB(0, 0, 0)
-        c.drawString(x, y, label.upper())
-        y -= header_h
+        draw_section_header(label.upper())
 
-        # Cards
-        c.setFont("Helvetica", 9)
-        for card_name, card_data in items.items():
+        # Cards, in runs that fit the rest of the current column
+        cards = list(items.items())
+        while cards:
             if y - line_spacing < bottom_limit:
                 advance()
-                c.setFont("Helvetica-Bold", 10)
-                c.setFillColorRGB(0, 0, 0)
-                c.drawString(x, y, label.upper() + " (cont.)")
-                y -= header_h
-                c.setFont("Helvetica", 9)
-
-            display_name = clean_card_name(card_name, card_data)
-            qty = card_data.get("quantity", 1)
-            c.drawString(x + 8, y, f"{qty}x {display_name}")
-            y -= line_spacing
+                draw_section_header(label.upper() + " (cont.)")
+
+            fit = int((y - bottom_limit) // line_spacing) if compact else 1
+            run, cards = cards[:fit], cards[fit:]
+            if compact:
+                place_items_compact(c, run, x + 8, y, line_spacing)
+            else:
+                for card_name, card_data in run:
+                    display_name = clean_card_name(card_name, card_data)
+                    qty = card_data.get("quantity", 1)
+                    c.drawString(x + 8, y, f"{qty}x {display_name}")
+            y -= line_spacing * len(run)
 
         y -= section_gap
 
@@ -355,7 +458,6 @@ def draw_overflow_page(
 def make_pdf(
     deck_type: str,
     deck_data: dict,
-    filename: str,
     name: str = "",
     event: str = "",
     show_alignment: bool = False,
@@ -363,15 +465,17 @@ def make_pdf(
     m_count_value: float = None,
     aod_count_value: float = None,
     is_legal: bool = None,
-):
+    engine: str = "form",
+    compact: bool = False,
+) -> bytes:
     """
     Generate a deck check sheet overlay with card listings, section counts,
-    and a total card count.
+    and a total card count, and return the finished PDF as bytes. Nothing is
+    written to disk.
 
     Args:
         deck_type: Type of deck ('type_1' or 'type_2')
         deck_data: Dictionary containing deck data
-        filename: Output filename
         name: Player name
         event: Event name
         show_alignment: Whether to show alignment colors and counts
@@ -381,417 +485,431 @@ def make_pdf(
                 canonical default card sort order instead.
         m_count_value: The calculated M count value to display (default: None)
         aod_count_value: The calculated AoD count value to display (default: None)
+        engine: "form" draws the template as a form XObject on the same
+                canvas as the overlay, in one pass. "merge" draws the overlay
+                alone and merges it onto the template page with PyPDF2.
+        compact: Write each section as one text object with only the color
+                changes it needs, compress every page stream, and leave out
+                template resources the page never uses. Same-looking sheet,
+                smaller file.
     """
-    if show_alignment:
-        color_alignment = True
-    else:
-        color_alignment = False
-    if deck_type in ("type_1", "paragon"):
-        template_path = T1_TEMPLATE
-    elif deck_type == "type_2":
-        template_path = T2_TEMPLATE
-
-    # Create output directory if it doesn't exist
-    if str_to_bool(os.getenv("DEBUG")):
-        deck_directory = "tmp"
+    if engine not in ("form", "merge"):
+        raise ValueError(f"Unknown PDF engine: {engine}")
+    template_path = template_for_deck_type(deck_type)
+    template_page, width_points, height_points = load_template(template_path)
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(
+        buffer,
+        pagesize=(width_points, height_points),
+        pageCompression=1 if compact else None,
+    )
+    if engine == "form":
+        c.doForm(template_form(c, template_path, compact=compact))
+    draw_deck_sheet(
+        c,
+        deck_type,
+        deck_data,
+        width_points,
+        height_points,
+        name=name,
+        event=event,
+        show_alignment=show_alignment,
+        sort_by=sort_by,
+        m_count_value=m_count_value,
+        aod_count_value=aod_count_value,
+        is_legal=is_legal,
+        compact=compact,
+    )
+    c.save()
+    if engine == "form":
+        return buffer.getvalue()
+
+    buffer.seek(0)
+    overlay_pdf = PdfReader(buffer)
+    output = io.BytesIO()
+    with _TEMPLATE_LOCK:
+        page = template_copy(template_page)
+        if overlay_pdf.pages:
+            page.merge_page(overlay_pdf.pages[0])
+        if compact:
+            page[NameObject("/Resources")] = prune_resources(
+                page["/Resources"], page.get_contents().get_data()
+            )
+            page.compress_content_streams()
+        writer = PdfWriter()
+        writer.add_page(page)
+        # Append any overflow pages (they don't need template merging)
+        for i in range(1, len(overlay_pdf.pages)):
+            writer.add_page(overlay_pdf.pages[i])
+        writer.write(output)
+    return output.getvalue()
+
+
+def make_packet_pdf(sheets: Iterable[dict], compact: bool = False) -> bytes:
+    """
+    Draw many deck check sheets into one PDF and return it as bytes.
+
+    Each item of 'sheets' holds draw_deck_sheet's keyword arguments (deck_type,
+    deck_data, name, event, ...). Sheets are drawn in order as the iterable
+    yields them, each followed by its overflow page if it has one. Every
+    template is embedded once as a form XObject and shared by all the sheets
+    that use it. 'compact' is as for make_pdf.
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pageCompression=1 if compact else None)
+    for sheet in sheets:
+        template_path = template_for_deck_type(sheet["deck_type"])
+        _, width_points, height_points = load_template(template_path)
+        c.setPageSize((width_points, height_points))
+        c.doForm(template_form(c, template_path, compact=compact))
+        draw_deck_sheet(
+            c,
+            width_points=width_points,
+            height_points=height_points,
+            compact=compact,
+            **sheet,
+        )
+    c.save()
+    return buffer.getvalue()
+
+
+def draw_deck_sheet(
+    c: canvas.Canvas,
+    deck_type: str,
+    deck_data: dict,
+    width_points: float,
+    height_points: float,
+    name: str = "",
+    event: str = "",
+    show_alignment: bool = False,
+    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
+    m_count_value: float = None,
+    aod_count_value: float = None,
+    is_legal: bool = None,
+    compact: bool = False,
+):
+    """
+    Draw one deck's sheet overlay on 'c': the card listings, counts and header
+    fields on the current page, then an OVERFLOW page when sections don't fit.
+    Every page drawn is finished with showPage(). The template itself is not
+    drawn here (see make_pdf). Arguments are as for make_pdf.
+
+    The deck's own content (draw_card_layer) goes on first, then the header
+    fields for this sheet (draw_sheet_header). A deck drawn before is placed
+    from the card layer cache (see card_layer) rather than drawn again.
+    """
+    sheet = template_layout(template_for_deck_type(deck_type))
+    fingerprint = deck_fingerprint(
+        deck_type, deck_data, sort_by, show_alignment, compact
+    )
+    layer = card_layer(
+        fingerprint,
+        deck_type,
+        deck_data,
+        width_points,
+        height_points,
+        show_alignment=show_alignment,
+        sort_by=sort_by,
+        compact=compact,
+    )
+    if layer is None:
+        overflow_sections = draw_card_layer(
+            c,
+            deck_type,
+            deck_data,
+            width_points,
+            height_points,
+            show_alignment=show_alignment,
+            sort_by=sort_by,
+            compact=compact,
+        )
     else:
-        deck_directory = "/tmp"
-    os.makedirs(deck_directory, exist_ok=True)
+        page = PdfReader(io.BytesIO(layer.pdf)).pages[0]
+        c.doForm(page_to_form(c, page, "cards_" + fingerprint, compact=compact))
+        overflow_sections = layer.overflow_sections
+    draw_sheet_header(
+        c,
+        deck_type,
+        sheet,
+        height_points,
+        name=name,
+        event=event,
+        m_count_value=m_count_value,
+        aod_count_value=aod_count_value,
+        is_legal=is_legal,
+    )
+    c.showPage()
 
-    # Use system temp directory for all temporary files
-    output_path = os.path.join(deck_directory, f"{filename}.pdf")
-    temp_overlay = os.path.join(deck_directory, f"temp_{filename}.pdf")
+    if overflow_sections:
+        draw_overflow_page(
+            c,
+            overflow_sections,
+            width_points,
+            height_points,
+            name,
+            event,
+            compact=compact,
+        )
+        c.showPage()
 
-    reader = PdfReader(template_path)
-    page = reader.pages[0]
-    width_points = float(page.mediabox.width)
-    height_points = float(page.mediabox.height)
 
-    c = canvas.Canvas(temp_overlay, pagesize=(width_points, height_points))
+def deck_fingerprint(
+    deck_type: str,
+    deck_data: dict,
+    sort_by: Union[str, List[str]],
+    show_alignment: bool,
+    compact: bool,
+) -> str:
+    """
+    Key for everything a deck's card layer depends on: per card, in order, the
+    fields the layer prints or counts and the card's sort key (which fixes
+    where it is listed), plus the deck type and drawing options.
+    """
+    sort_key = compile_sort_key(sort_by)
+    cards = [
+        (
+            zone,
+            card_name,
+            card_data.get("quantity", 1),
+            card_data.get("type"),
+            card_data.get("alignment"),
+            sort_key((card_name, card_data)),
+        )
+        for zone in ("main_deck", "reserve")
+        for card_name, card_data in deck_data.get(zone, {}).items()
+    ]
+    key = repr((deck_type, sort_by, bool(show_alignment), compact, cards))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def card_layer(
+    fingerprint: str,
+    deck_type: str,
+    deck_data: dict,
+    width_points: float,
+    height_points: float,
+    show_alignment: bool = False,
+    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
+    compact: bool = False,
+) -> Optional[CardLayer]:
+    """
+    The cached card layer for the deck with 'fingerprint', drawing it into a
+    page of its own the second time the deck is asked for. Returns None the
+    first time; the caller then draws the layer directly. Other arguments are
+    as for draw_card_layer.
+    """
+    with _CARD_LAYER_LOCK:
+        seen = fingerprint in _card_layers
+        if seen:
+            _card_layers.move_to_end(fingerprint)
+            layer = _card_layers[fingerprint]
+            if layer is not None:
+                return layer
+        else:
+            _card_layers[fingerprint] = None
+            while len(_card_layers) > CARD_LAYER_CACHE_SIZE:
+                _card_layers.popitem(last=False)
+    if not seen:
+        return None
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(
+        buffer,
+        pagesize=(width_points, height_points),
+        pageCompression=1 if compact else None,
+    )
+    overflow_sections = draw_card_layer(
+        c,
+        deck_type,
+        deck_data,
+        width_points,
+        height_points,
+        show_alignment=show_alignment,
+        sort_by=sort_by,
+        compact=compact,
+    )
+    c.showPage()
+    c.save()
+    layer = CardLayer(buffer.getvalue(), overflow_sections)
+    with _CARD_LAYER_LOCK:
+        if fingerprint in _card_layers:
+            _card_layers[fingerprint] = layer
+    return layer
+
+
+def _header_point(sheet, height_points, label, dx, dy):
+    """Canvas point (dx, dy) right of and below a printed header label."""
+    x, y = sheet.labels[label]
+    return x + dx, height_points - (y + dy)
+
+
+def draw_card_layer(
+    c: canvas.Canvas,
+    deck_type: str,
+    deck_data: dict,
+    width_points: float,
+    height_points: float,
+    show_alignment: bool = False,
+    sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
+    compact: bool = False,
+) -> list:
+    """
+    Draw everything on a deck's sheet page that depends only on the deck: the
+    card listings, section counts, total and alignment counts. Returns the
+    [(label, items), ...] that didn't fit, for draw_overflow_page. Arguments
+    are as for make_pdf.
+    """
+    color_alignment = bool(show_alignment)
     main_deck = deck_data.get("main_deck", {})
     reserve = deck_data.get("reserve", {})
 
-    if deck_type in ("type_1", "paragon"):
-        # On the v2 T1 sheet the Dominant/Lost Soul rows and the whole third
-        # column sit exactly where they did on v1, so only the Hero, Evil
-        # Character and Enhancement blocks move up.
-        section_mappings = {
-            "lists": {
-                "Dominant": {"x": 57, "y": 180},
-                "Hero": {"x": 57, "y": 350},
-                "GE": {"x": 57, "y": 766},
-                "Lost Soul": {"x": 310, "y": 180},
-                "Evil Character": {"x": 310, "y": 349},
-                "EE": {"x": 310, "y": 766},
-                "Artifact": {"x": 560, "y": 181},
-                "Fortress": {"x": 560, "y": 474},
-                "Misc": {"x": 560, "y": 700},
-                "Reserve": {"x": 580, "y": 913},
-            },
-            "numbers": {
-                "Dominant": {"x": 124, "y": 153},
-                "Hero": {"x": 97, "y": 335},
-                "GE": {"x": 189, "y": 748},
-                "Lost Soul": {"x": 381, "y": 154},
-                "Evil Character": {"x": 408, "y": 335},
-                "EE": {"x": 439, "y": 748},
-                "Artifact": {"x": 741, "y": 153},
-                "Fortress": {"x": 710, "y": 454},
-                "Misc": {"x": 596, "y": 687},
-                "Reserve": {"x": 617, "y": 875},
-            },
-        }
-    elif deck_type == "type_2":
-        # The whole v2 T2 sheet is inset 5pt further right than v1, and every
-        # row moved, so both x and y differ from the v1 mapping throughout.
-        section_mappings = {
-            "lists": {
-                "Dominant": {"x": 62, "y": 186},
-                "Hero": {"x": 62, "y": 519},
-                "GE": {"x": 62, "y": 885},
-                "Lost Soul": {"x": 315, "y": 186},
-                "Evil Character": {"x": 315, "y": 520},
-                "EE": {"x": 315, "y": 885},
-                "Artifact": {"x": 565, "y": 186},
-                "Fortress": {"x": 565, "y": 432},
-                "Misc": {"x": 565, "y": 629},
-                "Reserve": {"x": 585, "y": 753},
-            },
-            "numbers": {
-                "Dominant": {"x": 129, "y": 158},
-                "Hero": {"x": 101, "y": 501},
-                "GE": {"x": 193, "y": 873},
-                "Lost Soul": {"x": 385, "y": 158},
-                "Evil Character": {"x": 413, "y": 500},
-                "EE": {"x": 440, "y": 874},
-                "Artifact": {"x": 749, "y": 159},
-                "Fortress": {"x": 715, "y": 411},
-                "Misc": {"x": 601, "y": 615},
-                "Reserve": {"x": 617, "y": 731},
-            },
-        }
-
-    # The v2 T2 sheet places its entire top header block (Name, Event, Total
-    # Cards) 5pt right and 5pt lower than the v2 T1 sheet. The fill-in offsets
-    # below are measured against T1, so T2 gets nudged to match.
-    header_dx, header_dy = (5, 5) if deck_type == "type_2" else (0, 0)
-
-    # Draw card listings with color_alignment option.
-    # Enforce per-section limits on the main deck. Reserve has no printed
-    # limit for type_1/paragon (10 always fits the template box), but T2's
-    # reserve cap of 20 exceeds what the template's Reserve box can print
-    # (see T2_RESERVE_LINE_LIMIT), so its overflow routes to the same
-    # OVERFLOW page as the main-deck sections.
-    limits = T1_SECTION_LIMITS if deck_type in ("type_1", "paragon") else T2_SECTION_LIMITS
+    sheet = template_layout(template_for_deck_type(deck_type))
+
+    # Draw card listings with color_alignment option, each section cut off at
+    # the ruled lines it has on the template. Anything that doesn't fit
+    # (including a reserve longer than the Reserve box) goes to the OVERFLOW
+    # page.
     overflow_sections = []
 
-    def _draw_section(label, card_types, section_key, **kwargs):
-        overflow = place_section_by_type(
+    # Bucket, sort and count the whole deck once; everything below draws
+    # from these precomputed sections and totals.
+    layout = build_sheet_layout(main_deck, reserve, sort_by)
+
+    for label in SHEET_SECTIONS:
+        x, y = sheet.lists[label]
+        overflow = place_sorted_items(
             c,
-            main_deck,
-            height_points,
-            card_types,
-            x=section_mappings["lists"][section_key]["x"],
-            y=section_mappings["lists"][section_key]["y"],
+            layout["sections"][label],
+            x=x,
+            y=height_points - y,
+            line_spacing=16,
             color_alignment=color_alignment,
-            sort_by=sort_by,
-            max_items=limits.get(label),
-            **kwargs,
+            max_items=sheet.limits[label],
+            compact=compact,
         )
         if overflow:
             overflow_sections.append((label, overflow))
 
-    _draw_section("Dominant", "Dominant", "Dominant")
-    _draw_section("Hero", "Hero", "Hero")
-    _draw_section("GE", "GE", "GE")
-    _draw_section("Lost Soul", "Lost Soul", "Lost Soul")
-    _draw_section("Evil Character", "Evil Character", "Evil Character")
-    _draw_section("EE", "EE", "EE")
-    _draw_section("Artifact", ["Artifact", "Covenant", "Curse"], "Artifact")
-    _draw_section("Fortress", ["Fortress", "Site", "City"], "Fortress")
-    _draw_section("Misc", "misc", "Misc")
-
-    reserve_to_draw = reserve
-    if deck_type == "type_2":
-        reserve_to_draw, reserve_overflow = split_reserve_by_line_count(
-            reserve, sort_by, T2_RESERVE_LINE_LIMIT
-        )
-        if reserve_overflow:
-            overflow_sections.append(("Reserve", reserve_overflow))
+    reserve_to_draw, reserve_overflow = split_sorted_by_line_count(
+        layout["reserve"], sheet.limits["Reserve"]
+    )
+    if reserve_overflow:
+        overflow_sections.append(("Reserve", reserve_overflow))
 
-    place_section_by_type(
+    x, y = sheet.lists["Reserve"]
+    place_sorted_items(
         c,
         reserve_to_draw,
-        height_points,
-        card_types="all",
-        x=section_mappings["lists"]["Reserve"]["x"],
-        y=section_mappings["lists"]["Reserve"]["y"],
+        x=x,
+        y=height_points - y,
+        line_spacing=16,
         add_quantity=False,
         color_alignment=color_alignment,
-        sort_by=sort_by,
+        compact=compact,
     )
 
-    # Draw section counts (numbers only; positions are fully controlled)
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Dominant",
-        x=section_mappings["numbers"]["Dominant"]["x"],
-        y=section_mappings["numbers"]["Dominant"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Hero",
-        x=section_mappings["numbers"]["Hero"]["x"],
-        y=section_mappings["numbers"]["Hero"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "GE",
-        x=section_mappings["numbers"]["GE"]["x"],
-        y=section_mappings["numbers"]["GE"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Lost Soul",
-        x=section_mappings["numbers"]["Lost Soul"]["x"],
-        y=section_mappings["numbers"]["Lost Soul"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "Evil Character",
-        x=section_mappings["numbers"]["Evil Character"]["x"],
-        y=section_mappings["numbers"]["Evil Character"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "EE",
-        x=section_mappings["numbers"]["EE"]["x"],
-        y=section_mappings["numbers"]["EE"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        ["Artifact", "Covenant", "Curse"],
-        x=section_mappings["numbers"]["Artifact"]["x"],
-        y=section_mappings["numbers"]["Artifact"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        ["Fortress", "Site", "City"],
-        x=section_mappings["numbers"]["Fortress"]["x"],
-        y=section_mappings["numbers"]["Fortress"]["y"],
-    )
-    draw_count(
-        c,
-        main_deck,
-        height_points,
-        "misc",
-        x=section_mappings["numbers"]["Misc"]["x"],
-        y=section_mappings["numbers"]["Misc"]["y"],
-    )
-    draw_count(
-        c,
-        reserve,
-        height_points,
-        card_types="all",
-        x=section_mappings["numbers"]["Reserve"]["x"],
-        y=section_mappings["numbers"]["Reserve"]["y"],
-    )
+    # Draw section counts inside each heading's "(    )"
+    section_totals = dict(layout["section_totals"], Reserve=layout["reserve_total"])
+    for label, total in section_totals.items():
+        x, y = sheet.counts[label]
+        draw_count(c, total, height_points, x=x, y=y)
 
-    # Draw total card count in the top right corner
-    box_width = 50
-    box_height = 30
-    right_margin = 41
-    top_margin = 97
-    total_main = sum(int(card.get("quantity", 1)) for card in main_deck.values())
+    # Draw total card count after the "Total Cards:" label
+    total_main = layout["total"]
     c.setFont("Helvetica-Bold", 18)
     c.drawString(
-        width_points - right_margin - box_width + 5 + header_dx,
-        height_points - top_margin - box_height + 10 - header_dy,
-        f"{total_main}",
+        *_header_point(sheet, height_points, "Total Cards:", 117, 0), f"{total_main}"
     )
 
+    # Draw alignment counts only if show_alignment is True. They sit under the
+    # M and AoD counts (see draw_sheet_header) in the top right corner.
+    if show_alignment:
+        c.setFont("Helvetica", 10)
+        for row, (alignment, color) in enumerate(ALIGNMENT_COLORS.items()):
+            c.setFillColorRGB(*color)
+            c.drawString(
+                *_header_point(sheet, height_points, "Name:", 273, 20 + 10 * row),
+                f"{alignment} Count: {layout['alignment_totals'][alignment]}",
+            )
+
+        # Reset color to black for remaining text
+        c.setFillColorRGB(0, 0, 0)
+
+    return overflow_sections
+
+
+def draw_sheet_header(
+    c: canvas.Canvas,
+    deck_type: str,
+    sheet,
+    height_points: float,
+    name: str = "",
+    event: str = "",
+    m_count_value: float = None,
+    aod_count_value: float = None,
+    is_legal: bool = None,
+):
+    """
+    Draw the per-sheet header fields on the current page: player name, event
+    name, M and AoD counts and the legality seal. 'sheet' is the template's
+    TemplateLayout; other arguments are as for make_pdf.
+    """
+
+    def header_point(label, dx, dy):
+        return _header_point(sheet, height_points, label, dx, dy)
+
+    # The M count, AoD count and alignment counts stack up in the top right
+    # corner, lined up with the player name's row.
     # Display M count above alignment area if provided
     if m_count_value is not None:
-        box_width = 50
-        box_height = 30
-        right_margin = 85
-        top_margin = 14
         c.setFont("Helvetica", 12)
         c.setFillColorRGB(0, 0, 0)
-        c.drawString(
-            width_points - right_margin - box_width + 5 + header_dx,
-            height_points - top_margin - box_height + 10 - header_dy,
-            f"M Count: {m_count_value}",
-        )
+        c.drawString(*header_point("Name:", 273, 0), f"M Count: {m_count_value}")
 
     # Display AoD count above M count if provided
     if aod_count_value is not None:
-        box_width = 50
-        box_height = 30
-        right_margin = 85
-        top_margin = 4  # Higher up, above M count
         c.setFont("Helvetica", 12)
         c.setFillColorRGB(0, 0, 0)
         c.drawString(
-            width_points - right_margin - box_width + 5 + header_dx,
-            height_points - top_margin - box_height + 10 - header_dy,
-            f"AoD Count: {aod_count_value}",
-        )
-
-    # Draw alignment counts only if show_alignment is True
-    if show_alignment:
-        # Draw good count in green
-        box_width = 50
-        box_height = 30
-        right_margin = 85
-        top_margin = 34
-        total_good = 0
-        for card in main_deck.values():
-            if card.get("alignment") == "Good":
-                total_good += card.get("quantity", 0)
-        c.setFont("Helvetica", 10)
-        c.setFillColorRGB(0, 0.5, 0)  # Green
-        c.drawString(
-            width_points - right_margin - box_width + 5 + header_dx,
-            height_points - top_margin - box_height + 10 - header_dy,
-            f"Good Count: {total_good}",
-        )
-
-        # Draw evil count in red
-        box_width = 50
-        box_height = 30
-        right_margin = 85
-        top_margin = 44
-        total_evil = 0
-        for card in main_deck.values():
-            if card.get("alignment") == "Evil":
-                total_evil += card.get("quantity", 0)
-        c.setFont("Helvetica", 10)
-        c.setFillColorRGB(0.8, 0, 0)  # Red
-        c.drawString(
-            width_points - right_margin - box_width + 5 + header_dx,
-            height_points - top_margin - box_height + 10 - header_dy,
-            f"Evil Count: {total_evil}",
-        )
-
-        # Draw neutral count in gray
-        box_width = 50
-        box_height = 30
-        right_margin = 85
-        top_margin = 54
-        total_neutral = 0
-        for card in main_deck.values():
-            if card.get("alignment") == "Neutral":
-                total_neutral += card.get("quantity", 0)
-        c.setFont("Helvetica", 10)
-        c.setFillColorRGB(0.3, 0.3, 0.3)  # Darker Gray (changed from 0.5, 0.5, 0.5)
-        c.drawString(
-            width_points - right_margin - box_width + 5 + header_dx,
-            height_points - top_margin - box_height + 10 - header_dy,
-            f"Neutral Count: {total_neutral}",
+            *header_point("Name:", 273, -10), f"AoD Count: {aod_count_value}"
         )
 
-        # Reset color to black for remaining text
-        c.setFillColorRGB(0, 0, 0)
-
     # Add player name
-    box_width = 50
-    box_height = 30
-    right_margin = 290
-    top_margin = 16
     c.setFont("Times-Roman", 24)
-    c.drawString(
-        width_points - right_margin - box_width + 5 + header_dx,
-        height_points - top_margin - box_height + 10 - header_dy,
-        name,
-    )
+    c.drawString(*header_point("Name:", 68, 2), name)
 
     # add event name
-    box_width = 50
-    box_height = 30
-    right_margin = 290
-    top_margin = 56
-    c.setFont("Times-Roman", 20)  # Changed from Times-Bold to Times-Roman
-    c.drawString(
-        width_points - right_margin - box_width + 5 + header_dx,
-        height_points - top_margin - box_height + 10 - header_dy,
-        event,
-    )
+    c.setFont("Times-Roman", 20)
+    c.drawString(*header_point("Event:", 68, -2), event)
 
-    # Draw legality seal near center-top of the page
+    # Draw legality seal near center-top of the page, left of the name
     if is_legal is not None:
         deck_format = "Type 2" if deck_type == "type_2" else "Type 1"
-        seal_img = generate_seal(
+        seal_size = 65
+        seal_x, seal_top = header_point("Name:", -94.5, -24)
+        draw_seal(
+            c,
+            seal_x,
+            seal_top - seal_size,
+            seal_size,
             valid=is_legal,
             deck_format=deck_format,
         )
-        seal_temp_path = os.path.join(deck_directory, f"seal_{filename}.png")
-        seal_img.save(seal_temp_path, format="PNG")
-        seal_size = 65
-        c.drawImage(
-            seal_temp_path,
-            (width_points - seal_size) / 2 - 40 + header_dx,
-            height_points - seal_size - 10 - header_dy,
-            width=seal_size,
-            height=seal_size,
-            mask="auto",
-        )
-        if os.path.exists(seal_temp_path):
-            os.remove(seal_temp_path)
-
-    c.showPage()
-
-    if overflow_sections:
-        draw_overflow_page(
-            c, overflow_sections, width_points, height_points, name, event
-        )
-        c.showPage()
-
-    c.save()
-
-    overlay_pdf = PdfReader(temp_overlay)
-    if overlay_pdf.pages:
-        page.merge_page(overlay_pdf.pages[0])
-    writer = PdfWriter()
-    writer.add_page(page)
-    # Append any overflow pages (they don't need template merging)
-    for i in range(1, len(overlay_pdf.pages)):
-        writer.add_page(overlay_pdf.pages[i])
-    with open(output_path, "wb") as f:
-        writer.write(f)
-
-    # Clean up temp file
-    if os.path.exists(temp_overlay):
-        os.remove(temp_overlay)
 
 
 if __name__ == "__main__":
     from src.utilities.decklist import Decklist
 
     deck_data = Decklist("tmp/decklist.txt", deck_type="type_2").to_json()
-    make_pdf(
+    pdf_bytes = make_pdf(
         "type_2",
         deck_data,
-        "output_decklist",
         "Player Name",
         "Event Name",
         True,
         m_count_value=3.14,  # Example M count value
     )
+    with open("tmp/output_decklist.pdf", "wb") as f:
+        f.write(pdf_bytes)
     print("PDF generated successfully.")
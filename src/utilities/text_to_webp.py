@@ -1,52 +1,26 @@
-import json
+import io
 import os
-from typing import List, Union
+from typing import List, NamedTuple, Optional, Union
 
 import dotenv
 import PIL.Image as Image
 import PIL.ImageDraw as ImageDraw
 from PIL import ImageFont
 
-from src.utilities.config import str_to_bool
+from src.utilities.card_images import (  # noqa: F401 (re-exported)
+    DECKLIST_IMAGES_FOLDER,
+    CARD_IMAGE_LEVELS,
+    card_image_path,
+    level_for_card_width,
+    load_card_level_tile,
+    load_card_level_tiles,
+    load_carddata_filenames,
+)
+from src.utilities.card_popularity import record_card_usage
 from src.utilities.seal import generate_seal
 from src.utilities.sort import sort_cards
-from src.utilities.vars import CARD_DATA_JSON_FILE
 
 dotenv.load_dotenv()
-DECKLIST_IMAGES_FOLDER = "assets/cardimages"
-
-
-def load_carddata_filenames() -> set:
-    """
-    Load all image filenames from carddata.jsonl to preserve original naming.
-
-    Returns:
-        set: Set of original image filenames from carddata.jsonl
-    """
-    carddata_filenames = set()
-
-    try:
-        with open(CARD_DATA_JSON_FILE, "r", encoding="utf-8") as file:
-            for line in file:
-                if not line.strip():  # Skip empty lines
-                    continue
-
-                # Parse JSON line and get the imagefile field
-                try:
-                    card_data = json.loads(line.strip())
-                    image_filename = card_data.get("imagefile", "")
-                    if image_filename:  # Only add non-empty filenames
-                        carddata_filenames.add(image_filename)
-                except json.JSONDecodeError as e:
-                    print(f"Error parsing JSON line: {line[:50]}... - {e}")
-                    continue
-
-    except FileNotFoundError:
-        print(f"Warning: {CARD_DATA_JSON_FILE} not found. Using fallback logic.")
-    except Exception as e:
-        print(f"Error reading {CARD_DATA_JSON_FILE}: {e}")
-
-    return carddata_filenames
 
 
 def normalize_filename_for_webp(original_filename: str, carddata_filenames: set) -> str:
@@ -63,36 +37,104 @@ def normalize_filename_for_webp(original_filename: str, carddata_filenames: set)
              "The_Jeering_Youths_(RA).webp")
     """
     # Look for this filename in carddata
-    for carddata_name in carddata_filenames:
-        # Check if the carddata name matches our original filename
-        if carddata_name == original_filename:
-            # Found exact match - this could be either case
-            return f"{carddata_name}.webp"
-        elif carddata_name == f"{original_filename}.jpg":
-            # Edge case: carddata has the .jpg version
-            return f"{carddata_name}.webp"
+    if original_filename in carddata_filenames:
+        # Found exact match - this could be either case
+        return f"{original_filename}.webp"
+    if f"{original_filename}.jpg" in carddata_filenames:
+        # Edge case: carddata has the .jpg version
+        return f"{original_filename}.jpg.webp"
 
     # Fallback: if not found in carddata, just add .webp
     return f"{original_filename}.webp"
 
 
+BACKGROUND_COLOR = (30, 32, 43)  # RGB for #1e202b
+SEPARATOR_COLOR = (20, 22, 33)
+TEXT_COLOR = (255, 255, 255)
+SEPARATOR_HEIGHT = 50  # at full resolution; shrinks with the cards
+RESERVE_PADDING = 50
+TEXT_MARGIN = 20
+SEAL_MARGIN = 20
+DEFAULT_CARD_SIZE = (315, 441)  # when a deck's first card image won't load
+
+# How card tiles are put together: "pil" pastes each tile onto a PIL image;
+# "numpy" writes them all into one preallocated array. numpy isn't in
+# requirements.txt (pip install numpy to use it); without it make_webp falls
+# back to "pil". "pil" is the faster of the two here.
+DECK_COMPOSITORS = ("pil", "numpy")
+DECK_COMPOSITOR = os.getenv("DECK_COMPOSITOR", "pil")
+
+# "grid" draws one tile per copy; "stacked" draws each distinct card once,
+# badged with its quantity ("×4"), so the image grows with unique cards.
+DECK_LAYOUTS = ("grid", "stacked")
+BADGE_COLOR = (20, 22, 33, 220)  # like the separator bar, slightly see-through
+
+# Output format -> (Pillow format, content type, file extension).
+IMAGE_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "png": ("PNG", "image/png", "png"),
+}
+
+# Encoder profile -> Pillow save options per output format. "balanced" is
+# what deck images have always been encoded with; "preview" encodes several
+# times faster for slightly larger files; "archival" is lossless (or nearly).
+ENCODER_PROFILES = {
+    "preview": {
+        "WEBP": {"quality": 75, "method": 0},
+        "JPEG": {"quality": 75},
+        "PNG": {"compress_level": 1},
+    },
+    "balanced": {
+        "WEBP": {"quality": 80, "method": 4},
+        "JPEG": {"quality": 85, "optimize": True},
+        "PNG": {"compress_level": 6},
+    },
+    "archival": {
+        "WEBP": {"lossless": True, "quality": 80, "method": 4},
+        "JPEG": {"quality": 95, "subsampling": 0, "optimize": True},
+        "PNG": {"compress_level": 9},
+    },
+}
+
+
+class DeckGrid(NamedTuple):
+    """Where one zone's (main deck or reserve) card tiles go."""
+
+    cards: List[tuple]  # (card_key, card_data), one per copy, in order
+    card_width: int
+    card_height: int
+    cards_per_row: int
+    card_overlap: int  # rows overlap by 10% of card height
+    width: int
+    height: int
+
+
 def make_webp(
     deck_type: str,
     deck_data: dict,
-    filename: str,
     n_card_columns: int = 10,
     sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
     m_count_value: float = None,
     aod_count_value: float = None,
     is_legal: bool = None,
-):
+    size: str = "full",
+    card_width: int = None,
+    image_format: str = "webp",
+    profile: str = "balanced",
+    compositor: str = None,
+    layout: str = "grid",
+) -> bytes:
     """
-    Create a WebP image from deck data.
+    Create a deck image (WebP unless 'image_format' says otherwise) from deck
+    data and return it as bytes, or None when the main deck has no cards. The
+    whole image is laid out first, then every tile, the separator bar, its
+    text and the seal are drawn onto one canvas that is encoded once. Nothing
+    is written to disk.
 
     Args:
         deck_type (str): Type of deck ('type_1' or 'type_2')
         deck_data (dict): Dictionary containing deck data with 'main_deck' and 'reserve' keys
-        filename (str): Base filename for output
         n_card_columns (int): Number of card columns per row (default: 10)
         sort_by: Single field or list of fields to sort by.
                 Available fields: 'alignment', 'brigade', 'type', 'name'.
@@ -101,63 +143,154 @@ def make_webp(
         m_count_value (float): The calculated M count value to display (default: None)
         aod_count_value (float): The calculated AoD count value to display (default: None)
         is_legal (bool): True = legal, False = illegal, None = skip seal
+        size (str): Card image resolution: "full", "half" or "quarter"
+        card_width (int): Target card width in pixels; picks the smallest
+            resolution at least this wide and overrides 'size'
+        image_format (str): "webp", "jpeg" or "png"
+        profile (str): Encoder profile: "preview", "balanced" or "archival"
+        compositor (str): "pil" or "numpy" (default: DECK_COMPOSITOR); both
+            produce the same pixels
+        layout (str): "grid" (a tile per copy) or "stacked" (a tile per
+            distinct card, badged with its quantity)
 
     Returns:
-        str: Path to the generated WebP file
+        bytes: The encoded image
     """
-    # Determine output directory based on DEBUG environment variable
-    if str_to_bool(os.getenv("DEBUG")):
-        output_dir = "tmp"
-    else:
-        output_dir = "/tmp"
-
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    if card_width is not None:
+        try:
+            card_width = int(card_width)
+        except (TypeError, ValueError):
+            raise AssertionError(f"Invalid card width: {card_width!r}")
+        if card_width <= 0:
+            raise AssertionError(f"Card width must be positive: {card_width}")
+        size = level_for_card_width(card_width)
+    if size not in CARD_IMAGE_LEVELS:
+        raise AssertionError(f"Unknown deck image size: {size}")
+    if image_format not in IMAGE_FORMATS:
+        raise AssertionError(f"Unknown image format: {image_format}")
+    if profile not in ENCODER_PROFILES:
+        raise AssertionError(f"Unknown encoder profile: {profile}")
+    compositor = compositor or DECK_COMPOSITOR
+    if compositor not in DECK_COMPOSITORS:
+        raise AssertionError(f"Unknown compositor: {compositor}")
+    if layout not in DECK_LAYOUTS:
+        raise AssertionError(f"Unknown deck image layout: {layout}")
+    scale = CARD_IMAGE_LEVELS[size]
+
+    # Count the deck's cards toward the popularity-pinned warm set
+    record_card_usage(
+        card_data["imagefile"]
+        for deck_key in ("main_deck", "reserve")
+        for card_data in deck_data.get(deck_key, {}).values()
+        if card_data.get("imagefile")
+    )
 
     # Set cards per row based on deck type
     cards_per_row = 15 if deck_type == "type_2" else n_card_columns
 
-    # Generate individual deck images
-    main_deck_filename = f"{filename}_main"
-    reserve_deck_filename = f"{filename}_reserve"
-
-    # Generate main deck image
-    main_deck_image_path = _generate_deck_image(
-        deck_data, "main_deck", main_deck_filename, cards_per_row, output_dir, sort_by
+    main_grid = layout_deck_grid(
+        deck_data, "main_deck", cards_per_row, sort_by, size, layout
     )
-
-    # Generate reserve deck image
-    reserve_deck_image_path = _generate_deck_image(
-        deck_data, "reserve", reserve_deck_filename, cards_per_row, output_dir, sort_by
+    if main_grid is None:
+        print("Warning: Main deck has no cards")
+        return None
+    reserve_grid = layout_deck_grid(
+        deck_data, "reserve", cards_per_row, sort_by, size, layout
     )
 
-    # Combine images into final WebP
-    combined_image_path = _combine_deck_images(
-        main_deck_image_path,
-        reserve_deck_image_path,
-        filename,
-        output_dir,
-        m_count_value,
-        aod_count_value,
-        is_legal,
-        deck_type,
+    count_parts = []
+    if m_count_value is not None:
+        count_parts.append(f"M Count: {m_count_value}")
+    if aod_count_value is not None:
+        count_parts.append(f"AoD Count: {aod_count_value}")
+
+    # Lay out the whole image: the main deck, then a separator bar (carrying
+    # the counts) and the reserve. Without a reserve the bar is twice as tall
+    # and only drawn when there are counts to show.
+    line_height = SEPARATOR_HEIGHT // scale
+    if reserve_grid is not None:
+        bar_height, font_size = line_height, int(line_height * 2.1)
+        reserve_top = main_grid.height + line_height + RESERVE_PADDING // scale
+        width = max(main_grid.width, reserve_grid.width)
+        height = reserve_top + reserve_grid.height
+    elif count_parts:
+        bar_height = line_height * 2
+        font_size = int(bar_height * 0.6)
+        width, height = main_grid.width, main_grid.height + bar_height
+    else:
+        bar_height = 0
+        width, height = main_grid.width, main_grid.height
+
+    # Decode every distinct card image up front, in parallel.
+    grids = [grid for grid in (main_grid, reserve_grid) if grid is not None]
+    tiles = load_card_level_tiles(
+        (
+            card_data["imagefile"]
+            for grid in grids
+            for _, card_data in grid.cards
+            if card_data.get("imagefile")
+        ),
+        size,
     )
 
-    # Clean up individual images
-    _cleanup_individual_images(main_deck_image_path, reserve_deck_image_path)
+    placed_grids = [(main_grid, 0)]
+    if reserve_grid is not None:
+        placed_grids.append((reserve_grid, reserve_top))
+
+    image = None
+    if compositor == "numpy":
+        try:
+            image = compose_deck_image((width, height), placed_grids, size, tiles)
+        except ImportError:
+            print("Warning: numpy is not installed; using the PIL compositor")
+    if image is None:
+        image = Image.new("RGB", (width, height), BACKGROUND_COLOR)
+        for grid, top in placed_grids:
+            draw_deck_grid(image, grid, top, size, tiles)
+
+    if layout == "stacked":
+        for grid, top in placed_grids:
+            draw_quantity_badges(image, grid, top, size, tiles)
+
+    # The bar and its text sit in the gap between the zones, clear of both.
+    if bar_height:
+        draw = ImageDraw.Draw(image)
+        line_y = main_grid.height + bar_height // 2
+        draw.line((0, line_y, width, line_y), fill=SEPARATOR_COLOR, width=bar_height)
+        if count_parts:
+            _draw_counts(draw, "  |  ".join(count_parts), line_y, font_size, scale)
+
+    if is_legal is not None:
+        _apply_legality_seal(image, is_legal, deck_type)
+
+    return encode_deck_image(image, image_format, profile)
+
 
-    return combined_image_path
+def encode_deck_image(
+    image: Image.Image, image_format: str = "webp", profile: str = "balanced"
+) -> bytes:
+    """Encode 'image' as 'image_format' with the 'profile' encoder settings."""
+    pil_format = IMAGE_FORMATS[image_format][0]
+    buffer = io.BytesIO()
+    image.save(buffer, format=pil_format, **ENCODER_PROFILES[profile][pil_format])
+    print(f"Deck image size: {buffer.tell() / (1024 * 1024):.2f}MB")
+    return buffer.getvalue()
 
 
-def _generate_deck_image(
+def layout_deck_grid(
     deck_data: dict,
     deck_key: str,
-    output_filename: str,
     cards_per_row: int,
-    output_dir: str,
     sort_by: Union[str, List[str]] = ["type", "alignment", "brigade", "name"],
-) -> str:
-    """Generate an image for the specified deck (either 'main_deck' or 'reserve')."""
+    level: str = "full",
+    layout: str = "grid",
+) -> Optional[DeckGrid]:
+    """
+    Lay out the card tiles of 'deck_key' ('main_deck' or 'reserve'), at
+    resolution 'level', or return None when it has no cards. Every tile is
+    sized like the zone's first card. The "grid" layout has a tile per copy,
+    the "stacked" layout one per distinct card.
+    """
     if cards_per_row == 0:
         cards_per_row = 10
 
@@ -167,309 +300,229 @@ def _generate_deck_image(
         print(f"No data found for '{deck_key}' deck.")
         return None
 
-    # Use the sorting utility to sort cards
-    sorted_deck_items = sort_cards(deck, sort_by)
+    # Expand the sorted deck items by quantity, unless they're stacked
+    cards = []
+    for card_key, card_data in sort_cards(deck, sort_by):
+        copies = 1 if layout == "stacked" else card_data.get("quantity", 1)
+        cards.extend([(card_key, card_data)] * copies)
 
-    # Expand deck items by quantity
-    expanded_deck_items = []
-    for card_key, card_data in sorted_deck_items:
-        for _ in range(card_data.get("quantity", 1)):
-            expanded_deck_items.append((card_key, card_data))
-
-    if not expanded_deck_items:
+    if not cards:
         print(f"No cards found in '{deck_key}' deck.")
         return None
 
-    # Load carddata filenames for proper filename handling
-    carddata_filenames = load_carddata_filenames()
-
     # Load the first card image to determine the size for consistent dimensions
-    sample_image_filename = expanded_deck_items[0][1]["imagefile"]
-    normalized_sample_filename = normalize_filename_for_webp(
-        sample_image_filename, carddata_filenames
-    )
-    sample_image_path = os.path.join(DECKLIST_IMAGES_FOLDER, normalized_sample_filename)
-
+    sample_image_file = cards[0][1]["imagefile"]
     try:
-        sample_image = Image.open(sample_image_path)
-        card_width, card_height = sample_image.size
+        card_width, card_height = load_card_level_tile(sample_image_file, level).size
     except Exception as e:
-        print(f"Error loading sample image {sample_image_path}: {e}")
+        print(f"Error loading sample image {card_image_path(sample_image_file)}: {e}")
         # Use default dimensions if sample image fails
-        card_width, card_height = 315, 441
+        divisor = CARD_IMAGE_LEVELS[level]
+        card_width, card_height = (side // divisor for side in DEFAULT_CARD_SIZE)
 
     # Set overlap amount to 10% of card height
     card_overlap = int(card_height * 0.10)
 
-    # Calculate output image dimensions based on the number of cards, considering the overlap
-    num_cards = len(expanded_deck_items)
-    rows = (num_cards + cards_per_row - 1) // cards_per_row
-    output_width = card_width * cards_per_row
-    output_height = (card_height * rows) - (card_overlap * (rows - 1))
+    rows = (len(cards) + cards_per_row - 1) // cards_per_row
+    return DeckGrid(
+        cards=cards,
+        card_width=card_width,
+        card_height=card_height,
+        cards_per_row=cards_per_row,
+        card_overlap=card_overlap,
+        width=card_width * cards_per_row,
+        height=(card_height * rows) - (card_overlap * (rows - 1)),
+    )
 
-    # Create a blank canvas of the correct size with the background color
-    background_color = (30, 32, 43)  # RGB for #1e202b
-    output_image = Image.new("RGB", (output_width, output_height), background_color)
 
-    # Track positioning for placing card images on the canvas
-    x_offset, y_offset = 0, 0
+def _grid_tiles(
+    grid: DeckGrid, top: int, level: str, tiles: dict, warn: bool = True
+):
+    """
+    (card_data, tile, x, y) for each of 'grid's cards in drawing order, its
+    first row 'top' pixels down, taking tiles from 'tiles' (image_file ->
+    tile) when already decoded. Later rows overlap earlier ones, so order
+    matters. Cards without a usable image are skipped, with a warning unless
+    'warn' is False.
+    """
+    x_offset, y_offset = 0, top
 
-    for card_key, card_data in expanded_deck_items:
+    for card_key, card_data in grid.cards:
         image_file = card_data.get("imagefile", "")
         if not image_file:
-            print(f"Warning: No image file specified for card '{card_key}'")
+            if warn:
+                print(f"Warning: No image file specified for card '{card_key}'")
             continue
 
-        # Normalize the image filename using carddata information
-        image_file = normalize_filename_for_webp(image_file, carddata_filenames)
-
-        card_image_path = os.path.join(DECKLIST_IMAGES_FOLDER, image_file)
-
         try:
-            card_image = Image.open(card_image_path)
-
-            # Ensure the card image has the same mode as the output canvas
-            if card_image.mode != output_image.mode:
-                card_image = card_image.convert(output_image.mode)
-
-            # Paste the card image directly without resizing to preserve quality
-            output_image.paste(card_image, (x_offset, y_offset))
-
-            # Update x_offset, and wrap to the next row if necessary
-            x_offset += card_width
-            if x_offset >= output_width:
-                x_offset = 0
-                y_offset += card_height - card_overlap
+            # Decoded RGB, like the canvas, and cached across requests
+            card_image = tiles.get(image_file)
+            if card_image is None:
+                card_image = load_card_level_tile(image_file, level)
         except FileNotFoundError:
-            print(
-                f"Warning: Image for card '{card_key}' not found at {card_image_path}"
-            )
+            if warn:
+                print(
+                    f"Warning: Image for card '{card_key}' not found at "
+                    f"{card_image_path(image_file, level)}"
+                )
+            continue
         except Exception as e:
-            print(f"Error processing card '{card_key}': {e}")
+            if warn:
+                print(f"Error processing card '{card_key}': {e}")
+            continue
 
-    # Save the generated deck image as WebP
-    output_image_path = os.path.join(output_dir, f"{output_filename}.webp")
-    output_image.save(output_image_path, format="WEBP", quality=80, optimize=True)
-    print(f"Deck image saved to {output_image_path}")
-    return output_image_path
+        yield card_data, card_image, x_offset, y_offset
 
+        # Update x_offset, and wrap to the next row if necessary
+        x_offset += grid.card_width
+        if x_offset >= grid.width:
+            x_offset = 0
+            y_offset += grid.card_height - grid.card_overlap
 
-def _apply_legality_seal(image: Image.Image, is_legal: bool, deck_type: str) -> Image.Image:
-    """Overlay the legality seal onto the top-left corner of an image."""
-    deck_format = "Type 2" if deck_type == "type_2" else "Type 1"
-    seal_size = min(image.width, image.height) // 12
-    seal_size = max(seal_size, 80)
-    seal_img = generate_seal(
-        valid=is_legal,
-        deck_format=deck_format,
-        size=seal_size,
-    )
-    # Convert to RGBA if needed so we can paste with transparency
-    if image.mode != "RGBA":
-        image = image.convert("RGBA")
-    margin = 20
-    image.paste(seal_img, (margin, margin), seal_img)
-    # Convert back to RGB for WebP saving
-    return image.convert("RGB")
-
-
-def _combine_deck_images(
-    main_deck_image_path: str,
-    reserve_deck_image_path: str,
-    output_filename: str,
-    output_dir: str,
-    m_count_value: float = None,
-    aod_count_value: float = None,
-    is_legal: bool = None,
-    deck_type: str = "type_1",
-) -> str:
+
+def draw_deck_grid(
+    image: Image.Image,
+    grid: DeckGrid,
+    top: int,
+    level: str = "full",
+    tiles: Optional[dict] = None,
+):
     """
-    Combine the main deck and reserve deck images into a single image,
-    adding a line and padding between them.
+    Paste 'grid's card tiles into 'image', its first row 'top' pixels down,
+    taking them from 'tiles' (image_file -> tile) when already decoded.
+    Tiles are clipped to the grid, so a card image taller or wider than the
+    zone's first card doesn't spill past it.
     """
-    if not main_deck_image_path or not os.path.exists(main_deck_image_path):
-        print("Warning: Main deck image not found")
-        return None
-
-    # Load the main deck image
-    main_deck_image = Image.open(main_deck_image_path)
-
-    # Check if reserve deck image exists
-    reserve_deck_image = None
-    if reserve_deck_image_path and os.path.exists(reserve_deck_image_path):
-        reserve_deck_image = Image.open(reserve_deck_image_path)
-
-    # Set line height for the separator line
-    line_height = 50
-    # Set padding between main deck and reserve deck
-    padding = 50
-
-    # If no reserve deck but M count or AoD count exists, still add the separator bar
-    if not reserve_deck_image and (
-        m_count_value is not None or aod_count_value is not None
-    ):
-        # Use a larger line height for the separator when no reserve deck
-        enhanced_line_height = line_height * 2  # Double the line height
-
-        # Calculate the combined image size with just the separator line
-        combined_width = main_deck_image.width
-        combined_height = main_deck_image.height + enhanced_line_height
-
-        # Create a blank canvas for the combined image with the background color
-        background_color = (30, 32, 43)  # RGB for #1e202b
-        combined_image = Image.new(
-            "RGB", (combined_width, combined_height), background_color
-        )
-
-        # Paste the main deck image at the top
-        combined_image.paste(main_deck_image, (0, 0))
-
-        # Draw a separator line below the main deck image
-        draw = ImageDraw.Draw(combined_image)
-        line_color = (20, 22, 33)
-        line_y_start = main_deck_image.height + (enhanced_line_height // 2)
-        draw.line(
-            (0, line_y_start, combined_width, line_y_start),
-            fill=line_color,
-            width=enhanced_line_height,
-        )
-
-        # Add M count and/or AoD count text overlay on the separator line
-        count_parts = []
-        if m_count_value is not None:
-            count_parts.append(f"M Count: {m_count_value}")
-        if aod_count_value is not None:
-            count_parts.append(f"AoD Count: {aod_count_value}")
-        text = "  |  ".join(count_parts)
-        text_color = (255, 255, 255)  # White text
-
-        try:
-            # Larger font size for better visibility
-            font_size = int(
-                enhanced_line_height * 0.6
-            )  # Bigger font for enhanced visibility
-            font_path = os.path.join("fonts", "dejavu-sans-bold.ttf")
-            font = ImageFont.truetype(font_path, font_size)
-        except Exception as e:
-            print(f"Error loading font: {e}")
-            font = ImageFont.load_default()
+    bottom = top + grid.height
+    for _, card_image, x, y in _grid_tiles(grid, top, level, tiles or {}):
+        if x + card_image.width > grid.width or y + card_image.height > bottom:
+            card_image = card_image.crop(
+                (
+                    0,
+                    0,
+                    min(card_image.width, grid.width - x),
+                    min(card_image.height, bottom - y),
+                )
+            )
+        # Paste the card image directly without resizing to preserve quality
+        image.paste(card_image, (x, y))
 
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_height = bbox[3] - bbox[1]
 
-        # Left align with padding
-        text_x = 20  # Left padding of 20 pixels
-        text_y = line_y_start - (text_height // 2)
+def compose_deck_image(
+    size: tuple, placed_grids: List[tuple], level: str = "full", tiles: dict = None
+) -> Image.Image:
+    """
+    The numpy compositor: write the tiles of each (grid, top) in
+    'placed_grids' into one preallocated RGB array of 'size' (width, height)
+    and convert it to a PIL image once. Raises ImportError without numpy.
+    """
+    import numpy as np
 
-        draw.text((text_x, text_y), text, fill=text_color, font=font)
+    width, height = size
+    canvas = np.empty((height, width, 3), dtype=np.uint8)
+    # Fill one row, then copy it down: far faster than broadcasting a pixel.
+    canvas[0] = BACKGROUND_COLOR
+    canvas[1:] = canvas[0]
+    for grid, top in placed_grids:
+        compose_deck_grid(canvas, grid, top, level, tiles)
+    return Image.fromarray(canvas)
 
-        if is_legal is not None:
-            combined_image = _apply_legality_seal(combined_image, is_legal, deck_type)
 
-        # Save the combined image using WebP optimization
-        combined_image_path = os.path.join(output_dir, f"{output_filename}.webp")
-        combined_image.save(
-            combined_image_path, format="WEBP", quality=80, optimize=True
+def compose_deck_grid(
+    canvas, grid: DeckGrid, top: int, level: str = "full", tiles: dict = None
+):
+    """
+    draw_deck_grid for the numpy compositor: write 'grid's tiles into
+    'canvas', a (height, width, 3) uint8 array, as slice assignments. Each
+    distinct tile is converted to an array once, however many copies the
+    deck has.
+    """
+    import numpy as np
+
+    arrays = {}  # id(tile) -> (tile, its pixels); the tile keeps its id valid
+    bottom = top + grid.height
+    for _, card_image, x, y in _grid_tiles(grid, top, level, tiles or {}):
+        if id(card_image) not in arrays:
+            arrays[id(card_image)] = (card_image, np.asarray(card_image))
+        pixels = arrays[id(card_image)][1]
+        # Clipped to the grid, as draw_deck_grid crops
+        height = min(pixels.shape[0], bottom - y)
+        width = min(pixels.shape[1], grid.width - x)
+        canvas[y : y + height, x : x + width] = pixels[:height, :width]
+
+
+def draw_quantity_badges(
+    image: Image.Image,
+    grid: DeckGrid,
+    top: int,
+    level: str = "full",
+    tiles: Optional[dict] = None,
+):
+    """
+    Badge each of a stacked 'grid's cards that has more than one copy with
+    its quantity ("×3"), in the bottom-right corner of the part of the card
+    the next row leaves visible.
+    """
+    font_size = max(8, grid.card_width // 6)
+    font = _bold_font(font_size)
+    padding = max(2, font_size // 4)
+    draw = ImageDraw.Draw(image, "RGBA")
+
+    for card_data, _, x, y in _grid_tiles(grid, top, level, tiles or {}, warn=False):
+        quantity = card_data.get("quantity", 1)
+        if quantity <= 1:
+            continue
+        text = f"×{quantity}"
+        left, text_top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        badge_right = x + grid.card_width - padding
+        badge_bottom = y + grid.card_height - grid.card_overlap - padding
+        badge_left = badge_right - (right - left) - 2 * padding
+        badge_top = badge_bottom - (bottom - text_top) - 2 * padding
+        draw.rounded_rectangle(
+            (badge_left, badge_top, badge_right, badge_bottom),
+            radius=padding * 2,
+            fill=BADGE_COLOR,
         )
-
-        file_size_mb = os.path.getsize(combined_image_path) / (1024 * 1024)
-        print(f"Combined deck image saved to {combined_image_path}")
-        print(f"File size: {file_size_mb:.2f}MB")
-
-        return combined_image_path
-
-    # If no reserve deck and no M count, just return the main deck image
-    if not reserve_deck_image:
-        if is_legal is not None:
-            main_deck_image = _apply_legality_seal(main_deck_image, is_legal, deck_type)
-
-        combined_image_path = os.path.join(output_dir, f"{output_filename}.webp")
-        main_deck_image.save(
-            combined_image_path, format="WEBP", quality=80, optimize=True
+        draw.text(
+            (badge_left + padding - left, badge_top + padding - text_top),
+            text,
+            fill=TEXT_COLOR,
+            font=font,
         )
-        return combined_image_path
 
-    # Calculate the combined image size for main deck + reserve deck
-    combined_width = max(main_deck_image.width, reserve_deck_image.width)
-    combined_height = (
-        main_deck_image.height + reserve_deck_image.height + line_height + padding
-    )
-
-    # Create a blank canvas for the combined image with the background color
-    background_color = (30, 32, 43)  # RGB for #1e202b
-    combined_image = Image.new(
-        "RGB", (combined_width, combined_height), background_color
-    )
-
-    # Paste the main deck image at the top
-    combined_image.paste(main_deck_image, (0, 0))
-
-    # Draw a separator line below the main deck image
-    draw = ImageDraw.Draw(combined_image)
-    line_color = (20, 22, 33)
-    line_y_start = main_deck_image.height + (line_height // 2)
-    draw.line(
-        (0, line_y_start, combined_width, line_y_start),
-        fill=line_color,
-        width=line_height,
-    )
-
-    # Add M count and/or AoD count text overlay on the separator line if provided
-    if m_count_value is not None or aod_count_value is not None:
-        count_parts = []
-        if m_count_value is not None:
-            count_parts.append(f"M Count: {m_count_value}")
-        if aod_count_value is not None:
-            count_parts.append(f"AoD Count: {aod_count_value}")
-        text = "  |  ".join(count_parts)
-        text_color = (255, 255, 255)  # White text
-
-        try:
-            font_size = int(line_height * 2.1)
-            font_path = os.path.join("fonts", "dejavu-sans-bold.ttf")
-            font = ImageFont.truetype(font_path, font_size)
-        except Exception as e:
-            print(f"Error loading font: {e}")
-            font = ImageFont.load_default()
-
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_height = bbox[3] - bbox[1]
-
-        # Left align with padding
-        text_x = 20  # Left padding of 20 pixels
-        text_y = line_y_start - (text_height // 2)
 
-        draw.text((text_x, text_y), text, fill=text_color, font=font)
-
-    # Paste the reserve deck image below the line, with added padding
-    reserve_y_offset = main_deck_image.height + line_height + padding
-    combined_image.paste(reserve_deck_image, (0, reserve_y_offset))
-
-    if is_legal is not None:
-        combined_image = _apply_legality_seal(combined_image, is_legal, deck_type)
-
-    # Save the combined image using WebP optimization
-    combined_image_path = os.path.join(output_dir, f"{output_filename}.webp")
-    combined_image.save(combined_image_path, format="WEBP", quality=80, optimize=True)
+def _bold_font(font_size: int):
+    try:
+        font_path = os.path.join("fonts", "dejavu-sans-bold.ttf")
+        return ImageFont.truetype(font_path, font_size)
+    except Exception as e:
+        print(f"Error loading font: {e}")
+        return ImageFont.load_default()
 
-    file_size_mb = os.path.getsize(combined_image_path) / (1024 * 1024)
-    print(f"Combined deck image saved to {combined_image_path}")
-    print(f"File size: {file_size_mb:.2f}MB")
 
-    return combined_image_path
+def _draw_counts(
+    draw: ImageDraw.ImageDraw, text: str, line_y: int, font_size: int, scale: int
+):
+    """Draw the M/AoD count text left-aligned, centred on the separator bar."""
+    font = _bold_font(font_size)
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_height = bbox[3] - bbox[1]
+    text_y = line_y - (text_height // 2)
+    draw.text((TEXT_MARGIN // scale, text_y), text, fill=TEXT_COLOR, font=font)
 
 
-def _cleanup_individual_images(main_deck_image_path: str, reserve_deck_image_path: str):
-    """Delete the individual deck images after combining."""
-    try:
-        if main_deck_image_path and os.path.exists(main_deck_image_path):
-            os.remove(main_deck_image_path)
-            print(f"Deleted main deck image: {main_deck_image_path}")
-        if reserve_deck_image_path and os.path.exists(reserve_deck_image_path):
-            os.remove(reserve_deck_image_path)
-            print(f"Deleted reserve deck image: {reserve_deck_image_path}")
-    except OSError as e:
-        print(f"Error deleting individual deck images: {e}")
+def _apply_legality_seal(image: Image.Image, is_legal: bool, deck_type: str):
+    """Overlay the legality seal onto the top-left corner of an image, in place."""
+    deck_format = "Type 2" if deck_type == "type_2" else "Type 1"
+    seal_size = min(image.width, image.height) // 12
+    seal_size = max(seal_size, 80)
+    seal_img = generate_seal(
+        valid=is_legal,
+        deck_format=deck_format,
+        size=seal_size,
+    )
+    # The seal's own alpha is the paste mask, so the canvas can stay RGB.
+    image.paste(seal_img, (SEAL_MARGIN, SEAL_MARGIN), seal_img)
 
 
 def normalize_image_filename(filename: str) -> str:
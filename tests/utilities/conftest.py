@@ -0,0 +1,44 @@
+"""Shared fixtures: process-wide card image state, card popularity and the
+card layer cache, reset for every test."""
+
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import card_atlas, card_images, card_popularity, text_to_pdf
+
+
+@pytest.fixture(autouse=True)
+def card_image_state(tmp_path, monkeypatch):
+    """
+    An empty tile cache and pinned set, no atlas, a popularity histogram of
+    their own and no cached card layers, so tests neither see nor leave behind
+    another test's tiles or sheets, and deck images they render don't count
+    toward the real histogram.
+    """
+    monkeypatch.setattr(card_images, "_card_tiles", OrderedDict())
+    monkeypatch.setattr(card_images, "_card_tile_bytes", 0)
+    monkeypatch.setattr(card_images, "_pinned_tiles", {})
+    monkeypatch.setattr(card_atlas, "CARD_ATLAS_FOLDER", str(tmp_path / "no-atlas"))
+    monkeypatch.setattr(
+        card_popularity, "CARD_POPULARITY_FILE", str(tmp_path / "popularity.json")
+    )
+    monkeypatch.setattr(card_popularity, "_popularity", None)
+    monkeypatch.setattr(text_to_pdf, "_card_layers", OrderedDict())
+
+
+@pytest.fixture
+def card_image_folder(tmp_path, monkeypatch):
+    """
+    An empty card image folder standing in for assets/cardimages, with every
+    imagefile resolving to "<imagefile>.webp" in it.
+    """
+    folder = tmp_path / "cardimages"
+    folder.mkdir()
+    monkeypatch.setattr(card_images, "DECKLIST_IMAGES_FOLDER", str(folder))
+    monkeypatch.setattr(card_images, "load_card_image_index", lambda: {})
+    return folder
@@ -0,0 +1,40 @@
+"""Tests for the brigade bitmask helpers in src/utilities/brigades.py."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities.brigades import (
+    ALL_BRIGADES,
+    EVIL_BRIGADE_MASK,
+    GOOD_BRIGADE_MASK,
+    brigades_to_mask,
+    count_brigades,
+    mask_to_brigades,
+    normalize_brigade_field,
+)
+from src.utilities.card_database import load_card_database
+
+
+def test_every_brigade_has_its_own_bit():
+    masks = [brigades_to_mask([brigade]) for brigade in ALL_BRIGADES]
+    assert len(set(masks)) == 16
+    assert all(count_brigades(mask) == 1 for mask in masks)
+    assert GOOD_BRIGADE_MASK & EVIL_BRIGADE_MASK == 0
+    assert GOOD_BRIGADE_MASK | EVIL_BRIGADE_MASK == (1 << 16) - 1
+
+
+def test_mask_round_trips_to_sorted_unique_names():
+    mask = brigades_to_mask(["Red", "Evil Gold", "Red", "Blue"])
+    assert count_brigades(mask) == 3
+    assert mask_to_brigades(mask) == ["Blue", "Evil Gold", "Red"]
+    assert mask_to_brigades(0) == []
+
+
+def test_card_database_masks_match_normalized_brigades():
+    card_data = load_card_database()["Delivered"]
+    brigades = normalize_brigade_field(
+        card_data["brigade"], card_data["alignment"], "Delivered"
+    )
+    assert mask_to_brigades(card_data["brigade_mask"]) == sorted(set(brigades))
@@ -0,0 +1,70 @@
+"""Tests for the raw pixel atlas of card tiles."""
+
+import os
+import sys
+
+import pytest
+from PIL import Image, ImageChops
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import card_atlas, card_images
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Three small card images with distinct pixels, as (path, image) pairs."""
+    images = []
+    for i, size in enumerate([(10, 14), (12, 16), (10, 14)]):
+        image = Image.effect_noise(size, 40 + i).convert("RGB")
+        path = tmp_path / f"card{i}.png"
+        image.save(path)
+        images.append((str(path), image))
+    return images
+
+
+def build(tmp_path, sources, file_bytes=10**6):
+    folder = str(tmp_path / "atlas")
+    count = card_atlas.build_card_atlas(
+        ((path, path, image) for path, image in sources), folder, file_bytes
+    )
+    return folder, count
+
+
+def same_pixels(a, b):
+    return a.size == b.size and ImageChops.difference(a, b).getbbox() is None
+
+
+def test_atlas_tiles_match_their_images(tmp_path, sources):
+    # Room for one tile per file, so the tiles spread over several files.
+    folder, count = build(tmp_path, sources, file_bytes=12 * 16 * 3)
+    atlas = card_atlas.load_card_atlas(folder)
+
+    assert count == 3
+    assert len({entry.file for entry in atlas.entries.values()}) == 3
+    for path, image in sources:
+        assert same_pixels(atlas.tile(path), image)
+
+
+def test_changed_image_is_not_served_from_atlas(tmp_path, sources):
+    folder, _ = build(tmp_path, sources)
+    path, _ = sources[0]
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    atlas = card_atlas.load_card_atlas(folder)
+    assert atlas.tile(path) is None
+    assert atlas.tile(sources[1][0]) is not None
+
+
+def test_missing_atlas_is_ignored(tmp_path):
+    assert card_atlas.load_card_atlas(str(tmp_path / "nowhere")) is None
+
+
+def test_card_tiles_come_from_atlas(tmp_path, sources, monkeypatch):
+    folder, _ = build(tmp_path, sources)
+    monkeypatch.setattr(card_atlas, "CARD_ATLAS_FOLDER", folder)
+    path, image = sources[1]
+    os.rename(path, path + ".moved")  # only the atlas has it now
+
+    assert same_pixels(card_images.load_card_tile(path), image)
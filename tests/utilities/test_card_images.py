@@ -0,0 +1,146 @@
+"""Tests for the card image index (imagefile -> WebP file, both namings) and
+the decoded card tile cache."""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import card_images
+from src.utilities.card_images import (
+    DECKLIST_IMAGES_FOLDER,
+    card_image_path,
+    load_card_image_index,
+    load_carddata_filenames,
+)
+from src.utilities.text_to_webp import normalize_filename_for_webp
+
+
+def write_carddata(tmp_path, imagefiles):
+    path = tmp_path / "carddata.jsonl"
+    path.write_text(
+        "".join(f'{{"name": "{name}", "imagefile": "{name}"}}\n' for name in imagefiles),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_index_covers_both_namings(tmp_path):
+    index = load_card_image_index(
+        write_carddata(tmp_path, ["001-Adam", "Some-Card.jpg"])
+    )
+    assert index["001-Adam"] == "001-Adam.webp"
+    assert index["Some-Card"] == "Some-Card.jpg.webp"
+    assert index["Some-Card.jpg"] == "Some-Card.jpg.webp"
+
+
+def test_exact_name_wins_over_jpg_naming(tmp_path):
+    index = load_card_image_index(write_carddata(tmp_path, ["Card.jpg", "Card"]))
+    assert index["Card"] == "Card.webp"
+
+
+def test_index_matches_scanning_lookup():
+    carddata_filenames = load_carddata_filenames()
+    index = load_card_image_index()
+    for image_file in carddata_filenames:
+        assert index[image_file] == normalize_filename_for_webp(
+            image_file, carddata_filenames
+        )
+
+
+def test_unknown_image_falls_back_to_plain_name():
+    assert card_image_path("Not-A-Real-Card") == os.path.join(
+        DECKLIST_IMAGES_FOLDER, "Not-A-Real-Card.webp"
+    )
+
+
+@pytest.fixture
+def tile_cache(monkeypatch):
+    """A tile cache that holds two 10 x 10 RGB tiles."""
+    monkeypatch.setattr(card_images, "CARD_TILE_CACHE_BYTES", 2 * 10 * 10 * 4)
+
+
+def write_tiles(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"tile{i}.webp"
+        Image.new("RGBA", (10, 10), (i, 0, 0, 255)).save(path, format="WEBP")
+        paths.append(str(path))
+    return paths
+
+
+def test_tile_is_decoded_once(tmp_path, tile_cache):
+    (path,) = write_tiles(tmp_path, 1)
+    tile = card_images.load_card_tile(path)
+    assert tile.mode == "RGB"
+    assert card_images.load_card_tile(path) is tile
+
+
+def test_tile_cache_is_bounded_by_bytes(tmp_path, tile_cache):
+    first, second, third = write_tiles(tmp_path, 3)
+    card_images.load_card_tile(first)
+    card_images.load_card_tile(second)
+    card_images.load_card_tile(first)  # now the most recently used
+    card_images.load_card_tile(third)
+
+    assert list(card_images._card_tiles) == [first, third]
+    assert card_images._card_tile_bytes == 2 * 10 * 10 * 4
+
+
+def test_tile_size_counts_memory_pillow_holds():
+    assert card_images._tile_bytes(Image.new("RGB", (10, 10))) == 10 * 10 * 4
+    assert card_images._tile_bytes(Image.new("RGBA", (10, 10))) == 10 * 10 * 4
+    assert card_images._tile_bytes(Image.new("L", (10, 10))) == 10 * 10
+
+
+def test_tile_cache_is_thread_safe(tmp_path, tile_cache):
+    paths = write_tiles(tmp_path, 4)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(card_images.load_card_tile, paths * 25))
+
+    assert len(card_images._card_tiles) == 2
+    assert card_images._card_tile_bytes == sum(
+        card_images._tile_bytes(tile) for tile in card_images._card_tiles.values()
+    )
+
+
+def test_card_width_picks_smallest_wide_enough_level():
+    assert card_images.level_for_card_width(80) == "quarter"
+    assert card_images.level_for_card_width(100) == "half"
+    assert card_images.level_for_card_width(300) == "full"
+    assert card_images.level_for_card_width(1000) == "full"
+
+
+def test_unbuilt_level_is_downscaled_from_full_image(card_image_folder):
+    Image.new("RGB", (40, 60)).save(card_image_folder / "Card.webp", format="WEBP")
+    (card_image_folder / "quarter").mkdir()
+    Image.new("RGB", (11, 15)).save(
+        card_image_folder / "quarter" / "Card.webp", format="WEBP"
+    )
+
+    half = card_images.load_card_level_tile("Card", "half")
+    assert half.size == (20, 30)
+    assert card_images.load_card_level_tile("Card", "half") is half
+    assert card_images.load_card_level_tile("Card", "quarter").size == (11, 15)
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(AssertionError):
+        card_images.card_image_path("Card", "tiny")
+
+
+def test_deck_tiles_decode_on_shared_pool(card_image_folder, monkeypatch):
+    monkeypatch.setattr(card_images, "CARD_DECODE_WORKERS", 4)
+    for name in ["A", "B", "C"]:
+        Image.new("RGB", (10, 14)).save(card_image_folder / f"{name}.webp", format="WEBP")
+
+    tiles = card_images.load_card_level_tiles(["A", "B", "A", "Missing", "C"])
+    pool = card_images.decode_executor()
+    card_images.load_card_level_tiles(["A", "B"])
+
+    assert list(tiles) == ["A", "B", "C"]
+    assert card_images.decode_executor() is pool
@@ -0,0 +1,73 @@
+"""Tests for the card popularity histogram and the pinned warm set of tiles."""
+
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import card_images, card_popularity
+
+
+@pytest.fixture
+def images(card_image_folder):
+    """10 x 10 card images to count and pin."""
+    for name in ["Staple", "Common", "Rare"]:
+        Image.new("RGB", (10, 10)).save(
+            card_image_folder / f"{name}.webp", format="WEBP"
+        )
+    return card_image_folder
+
+
+def test_histogram_counts_decks_and_persists(images):
+    card_popularity.record_card_usage(["Staple", "Common", "Staple"])
+    card_popularity.record_card_usage(["Staple"])
+    card_popularity.save_card_popularity()
+
+    assert card_popularity.top_card_images(1) == [("Staple", 2)]
+    assert card_popularity.load_card_popularity() == {"Staple": 2, "Common": 1}
+
+
+def test_unreadable_histogram_starts_empty(images):
+    with open(card_popularity.CARD_POPULARITY_FILE, "w") as file:
+        file.write("not json")
+    assert card_popularity.load_card_popularity() == {}
+
+
+def test_warm_set_pins_most_used_tiles_within_budget(images):
+    for image_files in [["Staple", "Common"], ["Staple", "Common"], ["Staple"]]:
+        card_popularity.record_card_usage(image_files)
+    card_popularity.record_card_usage(["Rare"])
+
+    assert card_popularity.warm_card_tiles(count=3, budget=2 * 10 * 10 * 4) == 2
+
+    staple = card_images.card_image_path("Staple")
+    assert set(card_images._pinned_tiles) == {
+        staple,
+        card_images.card_image_path("Common"),
+    }
+    assert card_images.load_card_tile(staple) is card_images._pinned_tiles[staple]
+    assert not card_images._card_tiles  # pinned tiles skip the cache
+
+
+def test_stats_report_pinned_set_and_top_cards(images):
+    card_popularity.record_card_usage(["Staple"])
+    card_popularity.warm_card_tiles(count=1, budget=10**6)
+
+    stats = card_popularity.card_image_stats(top=5)
+    assert stats["pinned_tiles"] == 1
+    assert stats["pinned_bytes"] == 10 * 10 * 4
+    assert stats["top_cards"] == [{"imagefile": "Staple", "decks": 1}]
+
+
+def test_background_warm_up_starts_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(card_popularity, "warm_card_tiles", lambda: calls.append(1))
+    monkeypatch.setattr(card_popularity, "_warm_up_thread", None)
+
+    thread = card_popularity.warm_card_tiles_in_background()
+    assert card_popularity.warm_card_tiles_in_background() is thread
+    thread.join()
+    assert calls == [1]
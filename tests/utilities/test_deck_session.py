@@ -0,0 +1,189 @@
+"""Tests for DeckSession, the delta-driven deck statistics used by live editing.
+
+The session computes M count and the AoD breakdown in closed form, so these
+decks are checked against exact values (and against the Monte Carlo numbers
+Decklist produces for the same deck).
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import deck_session
+from src.utilities.deck_session import DeckSession, DeckSessionStore
+from src.utilities.decklist import Decklist
+
+DANIEL_HERO = "Daniel (CoW)"
+DANIEL_SOUL = 'Lost Soul "Idolaters" [Daniel 3:7]'
+BLACK_EE = "A Look Back"
+
+
+def test_all_daniel_heroes_count_fully():
+    session = DeckSession("type_1")
+    session.apply_delta(DANIEL_HERO, 9)
+    breakdown = session.calculate_aod_breakdown()
+    assert breakdown == {
+        "aod_count": 9.0,
+        "soul_aod_count": 9.0,
+        "whiff_percentage": 0.0,
+    }
+
+
+def test_mixed_souls_and_heroes_match_decklist_breakdown():
+    session = DeckSession("type_1")
+    session.apply_delta(DANIEL_SOUL, 4)
+    session.apply_delta(DANIEL_HERO, 5)
+    assert session.calculate_aod_breakdown() == {
+        "aod_count": 5.0,
+        "soul_aod_count": 9.0,
+        "whiff_percentage": 0.0,
+    }
+
+
+def test_daniel_souls_with_plain_cards_whiff_analytically():
+    # 3 Daniel souls + 6 non-Daniel: whiff = C(6,3)/C(9,3) = 23.81%,
+    # soul_aod = 3 * (1 - 0.2381) = 2.29 (see test_decklist).
+    session = DeckSession("type_1")
+    session.apply_delta(DANIEL_SOUL, 3)
+    session.apply_delta(BLACK_EE, 6)
+    breakdown = session.calculate_aod_breakdown()
+    assert breakdown["aod_count"] == 0.0
+    assert breakdown["whiff_percentage"] == 23.81
+    assert breakdown["soul_aod_count"] == 2.29
+
+
+def test_closed_form_matches_decklist_monte_carlo(tmp_path):
+    deck = {
+        "A Child is Born": 10,
+        "A Mighty Blow": 8,
+        "A New Beginning": 6,
+        "A Wife for Isaac": 4,
+        BLACK_EE: 12,
+        DANIEL_HERO: 6,
+        DANIEL_SOUL: 4,
+    }
+    path = tmp_path / "deck.txt"
+    path.write_text("".join(f"{quantity}\t{name}\n" for name, quantity in deck.items()))
+    session = DeckSession("type_1")
+    for name, quantity in deck.items():
+        session.apply_delta(name, quantity)
+
+    random.seed(0)
+    decklist = Decklist(str(path), deck_type="type_1")
+    assert session.deck_size == decklist.deck_size
+    assert session.calculate_m_count() == pytest.approx(
+        decklist.calculate_m_count(), abs=0.1
+    )
+    simulated = decklist.calculate_aod_breakdown()
+    exact = session.calculate_aod_breakdown()
+    assert exact["aod_count"] == pytest.approx(simulated["aod_count"], abs=0.1)
+    assert exact["soul_aod_count"] == pytest.approx(
+        simulated["soul_aod_count"], abs=0.1
+    )
+    assert exact["whiff_percentage"] == pytest.approx(
+        simulated["whiff_percentage"], abs=2.5
+    )
+
+
+def test_fewer_than_nine_cards_returns_zeros():
+    session = DeckSession("type_1")
+    session.apply_delta(DANIEL_HERO, 8)
+    assert session.calculate_aod_breakdown()["aod_count"] == 0.0
+
+
+def test_m_count_single_brigade_and_lost_souls_ignored():
+    session = DeckSession("type_1")
+    session.apply_delta(BLACK_EE, 20)
+    session.apply_delta(DANIEL_SOUL, 5)
+    assert session.calculate_m_count() == 1.0
+
+
+def test_deltas_update_section_and_alignment_totals():
+    session = DeckSession("type_1")
+    session.apply_delta(BLACK_EE, 3)
+    session.apply_delta(DANIEL_HERO, 2)
+    session.apply_delta(BLACK_EE, -1)
+    session.apply_delta(BLACK_EE, 2, zone="reserve")
+    stats = session.to_json()
+    assert stats["deck_size"] == 4
+    assert stats["reserve_size"] == 2
+    assert stats["section_totals"]["EE"] == 2
+    assert stats["section_totals"]["Hero"] == 2
+    assert stats["alignment_totals"] == {"Good": 2, "Evil": 2, "Neutral": 0}
+
+
+def test_unknown_cards_are_skipped():
+    session = DeckSession("type_1")
+    assert session.apply_delta("Definitely Not A Card", 3) is False
+    assert session.deck_size == 0
+
+
+def test_unknown_card_names_are_not_cached():
+    cached = deck_session._known_card_profile.cache_info().currsize
+    session = DeckSession("type_1")
+    for i in range(50):
+        session.apply_delta(f"Not A Card {i}", 1)
+    assert deck_session._known_card_profile.cache_info().currsize == cached
+
+
+def test_store_rejects_over_removal_and_rolls_back_the_batch():
+    store = DeckSessionStore()
+    session_id, session = store.create("type_1")
+    store.apply_deltas(session_id, [{"op": "add", "name": BLACK_EE, "quantity": 2}])
+    with pytest.raises(AssertionError):
+        store.apply_deltas(
+            session_id,
+            [
+                {"op": "add", "name": DANIEL_HERO},
+                {"op": "remove", "name": BLACK_EE, "quantity": 3},
+            ],
+        )
+    assert session.main_quantities == {BLACK_EE: 2}
+    assert session.deck_size == 2
+
+
+def test_store_unknown_session_returns_none():
+    assert DeckSessionStore().apply_deltas("missing", []) is None
+
+
+def test_store_expired_session_returns_none():
+    store = DeckSessionStore(ttl_seconds=60)
+    session_id, session = store.create("type_1")
+    session.last_used -= 61
+    assert store.apply_deltas(session_id, [{"op": "add", "name": BLACK_EE}]) is None
+    assert session.deck_size == 0
+    assert not store._sessions
+
+
+def test_store_rejects_non_dict_delta_and_rolls_back_the_batch():
+    store = DeckSessionStore()
+    session_id, session = store.create("type_1")
+    with pytest.raises(AssertionError):
+        store.apply_deltas(session_id, [{"op": "add", "name": BLACK_EE}, "oops"])
+    assert session.main_quantities == {}
+    assert session.deck_size == 0
+
+
+def test_store_keeps_no_session_for_a_bad_seed():
+    store = DeckSessionStore()
+    with pytest.raises(AssertionError):
+        store.create("type_1", [{"op": "add", "name": BLACK_EE}, {"op": "swap"}])
+    with pytest.raises(AssertionError):
+        store.create("type_3")
+    assert not store._sessions
+
+
+def test_size_limits_follow_the_deck_type():
+    session = DeckSession("type_1")
+    session.apply_delta(BLACK_EE, 60)
+    assert session.to_json()["within_size_limits"] is True
+    session.apply_delta(BLACK_EE, 20)
+    assert session.to_json()["within_size_limits"] is False
+
+    session = DeckSession("type_2")
+    session.apply_delta(BLACK_EE, 80)
+    assert session.to_json()["within_size_limits"] is True
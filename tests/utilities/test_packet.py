@@ -0,0 +1,66 @@
+"""Tests for deck check packets (generate_packet) built from real decklists."""
+
+import io
+import os
+import sys
+
+import pytest
+from PyPDF2 import PdfReader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src import deck_generators
+from src.deck_generators import generate_packet
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+MAIN_DECK_CARD = "A Look Back"  # any real card in assets/carddata/carddata.jsonl
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    # Templates and card data are looked up relative to the repo root.
+    monkeypatch.chdir(REPO_ROOT)
+
+
+def entry(name, quantity=40, **options):
+    return {
+        "name": name,
+        "decklist": f"{quantity}\t{MAIN_DECK_CARD}\n",
+        "decklist_type": "type_1",
+        **options,
+    }
+
+
+def test_packet_has_a_sheet_per_player():
+    _, pdf_bytes = generate_packet(
+        [entry("Alice"), entry("Bob", m_count=True)], event="Nationals"
+    )
+
+    text = [page.extract_text() for page in PdfReader(io.BytesIO(pdf_bytes)).pages]
+    assert any("Alice" in page for page in text)
+    assert any("Bob" in page for page in text)
+
+
+def test_invalid_decklist_names_its_player():
+    with pytest.raises(AssertionError, match="Bob"):
+        generate_packet([entry("Alice"), entry("Bob", quantity=10)])
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [],
+        ["40\tA Look Back"],
+        [{"decklist": "40\tA Look Back"}],
+        [{"decklist": 40, "decklist_type": "type_1"}],
+    ],
+)
+def test_malformed_packet_is_rejected(entries):
+    with pytest.raises(AssertionError):
+        generate_packet(entries)
+
+
+def test_packet_size_is_capped(monkeypatch):
+    monkeypatch.setattr(deck_generators, "MAX_PACKET_DECKLISTS", 2)
+    with pytest.raises(AssertionError, match="2 or fewer"):
+        generate_packet([entry("Alice"), entry("Bob"), entry("Carol")])
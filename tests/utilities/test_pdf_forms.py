@@ -0,0 +1,158 @@
+"""Tests for page_to_form and the single-pass ("form") deck sheet engine,
+which draws the template as a form XObject instead of merging with PyPDF2,
+for deck check packets built on it, and for compact output.
+"""
+
+import io
+import os
+import sys
+
+import pytest
+from PyPDF2 import PdfReader
+from PyPDF2.generic import DictionaryObject, NameObject
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import text_to_pdf
+from src.utilities.pdf_forms import page_to_form, prune_resources
+from src.utilities.text_to_pdf import T1_TEMPLATE, make_packet_pdf, make_pdf
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def card(type, quantity=1, alignment="Neutral"):
+    return {"type": type, "quantity": quantity, "alignment": alignment, "brigade": ""}
+
+
+def drawn_content(page):
+    """A page's content stream followed by those of the forms it draws."""
+    content = page.get_contents().get_data()
+    for xobject in page["/Resources"]["/XObject"].values():
+        xobject = xobject.get_object()
+        if xobject["/Subtype"] == "/Form":
+            content += xobject.get_data()
+    return content
+
+
+DECK = {
+    "main_deck": {
+        "A Look Back": card("EE", 3),
+        "Daniel (CoW)": card("Hero", 2, "Good"),
+    },
+    "reserve": {"Ark": card("Artifact")},
+}
+
+
+def test_page_embedded_once_with_its_resources():
+    template_page = PdfReader(os.path.join(REPO_ROOT, T1_TEMPLATE)).pages[0]
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(850, 1100))
+    assert page_to_form(c, template_page, "sheet") == "sheet"
+    assert page_to_form(c, template_page, "sheet") == "sheet"
+    c.doForm("sheet")
+    c.showPage()
+    c.save()
+
+    page = PdfReader(io.BytesIO(buffer.getvalue())).pages[0]
+    (form,) = [ref.get_object() for ref in page["/Resources"]["/XObject"].values()]
+    assert form["/Subtype"] == "/Form"
+    assert list(form["/BBox"]) == [0, 0, 850, 1100]
+    assert set(form["/Resources"]) == set(template_page["/Resources"])
+
+
+def test_form_and_merge_engines_print_the_same_sheet(monkeypatch):
+    # Both engines draw the deck themselves rather than one placing the
+    # other's cached card layer.
+    monkeypatch.setattr(text_to_pdf, "CARD_LAYER_CACHE_SIZE", 0)
+    outputs = {
+        engine: PdfReader(
+            io.BytesIO(
+                make_pdf("type_1", DECK, name="Player", is_legal=True, engine=engine)
+            )
+        )
+        for engine in ("form", "merge")
+    }
+    form_text = [page.extract_text() for page in outputs["form"].pages]
+    merge_text = [page.extract_text() for page in outputs["merge"].pages]
+    assert form_text == merge_text
+    assert "3x A Look Back" in form_text[0]
+
+
+def test_unknown_engine_rejected():
+    with pytest.raises(ValueError):
+        make_pdf("type_1", DECK, engine="bogus")
+
+
+def test_packet_embeds_each_template_once():
+    sheets = [
+        {"deck_type": deck_type, "deck_data": DECK, "name": name, "event": "Nats"}
+        for deck_type, name in [("type_1", "Ann"), ("type_2", "Bo"), ("type_1", "Cy")]
+    ]
+    reader = PdfReader(io.BytesIO(make_packet_pdf(sheets)))
+
+    assert len(reader.pages) == 3
+    templates = [
+        {
+            ref.idnum
+            for name, ref in page["/Resources"]["/XObject"].items()
+            if "template_" in name
+        }
+        for page in reader.pages
+    ]
+    assert templates[0] == templates[2]
+    assert templates[0] != templates[1]
+    assert "Cy" in reader.pages[2].extract_text()
+
+
+def test_compact_sheet_prints_the_same_cards_in_fewer_text_objects():
+    deck = {
+        "main_deck": {
+            f"Hero {i}": card("Hero", 1, "Good" if i % 3 else "Evil") for i in range(9)
+        },
+        "reserve": {},
+    }
+    outputs = {
+        compact: PdfReader(
+            io.BytesIO(make_pdf("type_1", deck, show_alignment=True, compact=compact))
+        ).pages[0]
+        for compact in (False, True)
+    }
+    contents = {compact: drawn_content(page) for compact, page in outputs.items()}
+
+    for i in range(9):
+        assert f"1x Hero {i}" in outputs[True].extract_text()
+    assert contents[True].count(b"BT") < contents[False].count(b"BT")
+    # The whole section is one text object. Its cards are sorted by
+    # alignment, so it sets each color once, then resets to black.
+    (heroes,) = [
+        block for block in contents[True].split(b"ET") if b"Hero 0" in block
+    ]
+    assert heroes.count(b"Hero") == 9
+    assert heroes.count(b" rg") == 3
+
+
+def test_compact_form_drops_unused_resources():
+    template_page = PdfReader(os.path.join(REPO_ROOT, T1_TEMPLATE)).pages[0]
+    unused = {"/Unused": template_page["/Resources"]["/XObject"]["/X1"]}
+    resources = prune_resources(
+        DictionaryObject(
+            {
+                NameObject("/XObject"): DictionaryObject(
+                    {**template_page["/Resources"]["/XObject"], **unused}
+                ),
+                NameObject("/ProcSet"): template_page["/Resources"].get(
+                    "/ProcSet", NameObject("/PDF")
+                ),
+            }
+        ),
+        template_page.get_contents().get_data(),
+    )
+    assert "/Unused" not in resources["/XObject"]
+    assert set(resources["/XObject"]) == set(template_page["/Resources"]["/XObject"])
+    assert "/ProcSet" in resources
+
+
+def test_compact_packet_is_smaller():
+    sheets = [{"deck_type": "type_1", "deck_data": DECK, "name": "Ann"}]
+    assert len(make_packet_pdf(sheets, compact=True)) < len(make_packet_pdf(sheets))
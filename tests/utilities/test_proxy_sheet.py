@@ -0,0 +1,98 @@
+"""Tests for the printable proxy sheet: copies expanded onto a 3 x 3 grid,
+each unique card image embedded once."""
+
+import io
+import os
+import sys
+import threading
+
+import pytest
+from PyPDF2 import PdfReader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import proxy_sheet
+from src.utilities.proxy_sheet import CARDS_PER_PAGE, make_proxy_pdf
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    # Card images are looked up relative to the repo root.
+    monkeypatch.chdir(REPO_ROOT)
+
+
+def card(imagefile, quantity=1, type="Hero"):
+    return {
+        "type": type,
+        "quantity": quantity,
+        "alignment": "Good",
+        "brigade": "",
+        "imagefile": imagefile,
+    }
+
+
+def image_xobjects(pdf_bytes):
+    """Object numbers of every distinct image the PDF embeds."""
+    images = set()
+    for page in PdfReader(io.BytesIO(pdf_bytes)).pages:
+        for form in page["/Resources"].get("/XObject", {}).values():
+            resources = form.get_object().get("/Resources", {})
+            for image in resources.get("/XObject", {}).values():
+                images.add(image.idnum)
+    return images
+
+
+def test_each_card_image_is_embedded_once():
+    deck = {
+        "main_deck": {"Adam (FoM)": card("001-Adam", quantity=10)},
+        "reserve": {"Buckler": card("001-Buckler", type="Artifact")},
+    }
+    pdf_bytes = make_proxy_pdf(deck)
+
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    assert len(reader.pages) == 2  # 11 copies, 9 per page
+    assert len(image_xobjects(pdf_bytes)) == 2
+
+
+def test_reserve_can_be_left_out():
+    deck = {
+        "main_deck": {"Adam (FoM)": card("001-Adam", quantity=CARDS_PER_PAGE)},
+        "reserve": {"Buckler": card("001-Buckler", type="Artifact")},
+    }
+    pdf_bytes = make_proxy_pdf(deck, include_reserve=False)
+
+    assert len(PdfReader(io.BytesIO(pdf_bytes)).pages) == 1
+    assert len(image_xobjects(pdf_bytes)) == 1
+
+
+def test_missing_image_gets_a_labelled_placeholder():
+    deck = {"main_deck": {"No Such Card": card("No-Such-Card")}, "reserve": {}}
+    pdf_bytes = make_proxy_pdf(deck)
+
+    page = PdfReader(io.BytesIO(pdf_bytes)).pages[0]
+    assert "No Such Card" in page.extract_text()
+    assert not image_xobjects(pdf_bytes)
+
+
+def test_empty_deck_is_rejected():
+    with pytest.raises(AssertionError):
+        make_proxy_pdf({"main_deck": {}, "reserve": {}})
+
+
+def test_card_images_prepared_on_the_shared_decode_pool(monkeypatch):
+    threads = set()
+    encode_card_image = proxy_sheet._encode_card_image
+
+    def recording_encode_card_image(image_path):
+        threads.add(threading.current_thread().name)
+        return encode_card_image(image_path)
+
+    monkeypatch.setattr(proxy_sheet, "_encode_card_image", recording_encode_card_image)
+    deck = {
+        "main_deck": {"Adam (FoM)": card("001-Adam", quantity=3)},
+        "reserve": {"Buckler": card("001-Buckler", type="Artifact")},
+    }
+    make_proxy_pdf(deck)
+    assert threads and all(name.startswith("card-decode") for name in threads)
@@ -0,0 +1,48 @@
+"""Tests for parse_reference, the one-time parser behind Lost Soul ordering
+and the Daniel-reference checks used by the AoD count."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities.references import (
+    BIBLE_BOOKS,
+    UNKNOWN_BOOK,
+    cites_book,
+    parse_reference,
+)
+
+
+def book(name):
+    return BIBLE_BOOKS.index(name)
+
+
+def test_numbered_books_resolve_to_the_right_book():
+    assert parse_reference("II Kings 4:8-37")[:3] == (book("II Kings"), 4, 8)
+    assert parse_reference("I Kings 20:42")[:3] == (book("I Kings"), 20, 42)
+    assert parse_reference("III John 6")[:3] == (book("III John"), 0, 0)
+    assert parse_reference("Psalm 22:1")[:3] == (book("Psalms"), 22, 1)
+
+
+def test_extra_references_are_parsed():
+    assert parse_reference("Matthew 2:6/Micah 5:2") == (
+        book("Matthew"), 2, 6, ((book("Micah"), 5, 2),)
+    )
+    assert parse_reference("Hebrews 1:9 (Psalm 45:7)")[3] == ((book("Psalms"), 45, 7),)
+
+
+def test_unknown_and_empty_references():
+    assert parse_reference("Old Testament") == (UNKNOWN_BOOK, 0, 0, ())
+    assert parse_reference("") == (UNKNOWN_BOOK, 0, 0, ())
+
+
+def test_book_followed_by_text_still_matches_by_prefix():
+    assert parse_reference("Genesis (Promo)")[0] == book("Genesis")
+
+
+def test_cites_book_checks_every_reference():
+    assert cites_book({"reference": "Daniel 3:6"}, "Daniel")
+    assert cites_book({"reference": "Matthew 24:15 (Daniel 9:27)"}, "Daniel")
+    assert not cites_book({"reference": "Genesis 1:1"}, "Daniel")
+    assert not cites_book({"reference": ""}, "Daniel")
@@ -0,0 +1,60 @@
+"""Tests for draw_seal, the vector legality seal drawn on deck check PDFs."""
+
+import io
+import os
+import sys
+
+import pytest
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities.seal import draw_seal
+
+
+def _render(seals):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(300, 300))
+    for valid, deck_format in seals:
+        draw_seal(c, 10, 10, 65, valid=valid, deck_format=deck_format)
+        c.showPage()
+    c.save()
+    buffer.seek(0)
+    return PdfReader(buffer)
+
+
+def _forms(page):
+    return {
+        name: xobject.get_object()
+        for name, xobject in page["/Resources"]["/XObject"].items()
+    }
+
+
+def test_seal_is_a_vector_form_with_its_alpha_states():
+    reader = _render([(True, "Type 1")])
+    (form,) = _forms(reader.pages[0]).values()
+    assert form["/Subtype"] == "/Form"
+    assert "/ExtGState" in form["/Resources"]
+    assert "/Image" not in str(form["/Resources"])
+    assert "LEGAL" in reader.pages[0].extract_text()
+
+
+def test_one_form_per_validity_and_format():
+    reader = _render([(True, "Type 1"), (True, "Type 1"), (False, "Type 2")])
+    first, second, third = (
+        {name: ref.idnum for name, ref in page["/Resources"]["/XObject"].items()}
+        for page in reader.pages
+    )
+    assert first == second
+    assert first.keys() != third.keys()
+
+
+def test_seal_alpha_states_live_in_its_own_resources():
+    reader = _render([(False, "Type 2")])
+    (form,) = _forms(reader.pages[0]).values()
+    states = form["/Resources"]["/ExtGState"]
+    assert float(states["/SealAlpha35"]["/ca"]) == pytest.approx(35 / 255, abs=1e-5)
+    content = form.get_data()
+    for alpha in (210, 180, 35):
+        assert f"/SealAlpha{alpha} gs".encode() in content
@@ -404,3 +404,48 @@ def test_pdf_and_webp_default_to_type_sort():
     classic = ["type", "alignment", "brigade", "name"]
     assert inspect.signature(make_pdf).parameters["sort_by"].default == classic
     assert inspect.signature(make_webp).parameters["sort_by"].default == classic
+
+
+def test_precomputed_sort_keys_match_computed_order():
+    # Card database records carry "sort_keys"; sorting with them must give the
+    # same order as deriving every key from the card on the fly.
+    from src.utilities.card_database import load_card_database
+
+    database = load_card_database()
+    names = sorted(database)[::97]
+    with_keys = {
+        name: dict(database[name], raw_brigade=database[name]["brigade"])
+        for name in names
+    }
+    without_keys = {
+        name: {k: v for k, v in data.items() if k != "sort_keys"}
+        for name, data in with_keys.items()
+    }
+    for sort_by in ("default", ["type", "alignment", "brigade", "name"]):
+        assert [n for n, _ in sort_cards(with_keys, sort_by)] == [
+            n for n, _ in sort_cards(without_keys, sort_by)
+        ]
+
+
+def test_unknown_sort_field_rejected_when_compiled():
+    import pytest
+
+    from src.utilities.sort import compile_sort_key
+
+    with pytest.raises(ValueError, match="Unknown sort field: color"):
+        compile_sort_key(["type", "color"])
+    # Rejected even when there is nothing to sort.
+    with pytest.raises(ValueError):
+        sort_cards({}, "color")
+
+
+def test_compiled_sort_key_is_shared_per_spec():
+    from src.utilities.sort import compile_sort_key
+
+    assert compile_sort_key(["type", "name"]) is compile_sort_key(["type", "name"])
+    assert compile_sort_key("default") is compile_sort_key("default")
+
+
+def test_empty_sort_spec_keeps_input_order():
+    cards = {"Zeal": card(type="GE"), "Ark": card(type="Artifact"), "Moses": card()}
+    assert [name for name, _ in sort_cards(cards, [])] == ["Zeal", "Ark", "Moses"]
@@ -1,14 +1,13 @@
-"""Guard the section limits against template drift.
+"""Guard the measured template layouts against template drift.
 
-T1_SECTION_LIMITS / T2_SECTION_LIMITS must equal the number of ruled writing
-lines each section physically has on the deck-check template. Those constants
-are hand-maintained against a binary PDF, so nothing otherwise catches the
-case where a new template is dropped in and the numbers are not re-measured —
-the failure mode is silent: cards either vanish off the page or get pushed to
-an overflow page that was not needed.
+Section limits and draw positions are measured from the deck-check template
+PDFs themselves (src/utilities/template_layouts.py). A template whose ruled
+lines or labels can no longer be recognised would otherwise fail silently:
+cards either vanish off the page or get pushed to an overflow page that was
+not needed.
 
-These tests read the geometry back out of the templates themselves, so
-swapping in a new sheet fails loudly here instead of in a player's hands.
+The expected line counts below are those of the shipped v2 templates, so a
+new sheet that changes them fails loudly here instead of in a player's hands.
 """
 
 import os
@@ -18,77 +17,108 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 import pytest
 
-from src.utilities.text_to_pdf import (
-    T1_RESERVE_LINE_LIMIT,
-    T1_SECTION_LIMITS,
+from src.utilities.template_geometry import section_line_counts
+from src.utilities.template_layouts import (
+    DECK_TEMPLATES,
     T1_TEMPLATE,
-    T2_RESERVE_LINE_LIMIT,
-    T2_SECTION_LIMITS,
     T2_TEMPLATE,
+    template_for_deck_type,
+    template_layout,
 )
-from tests.utilities.template_geometry import section_line_counts
+from src.utilities.text_to_pdf import SHEET_SECTIONS
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 
-
-def _measure(template):
-    return section_line_counts(os.path.join(REPO_ROOT, template))
-
-
-@pytest.fixture(scope="module")
-def t1_geometry():
-    return _measure(T1_TEMPLATE)
-
-
-@pytest.fixture(scope="module")
-def t2_geometry():
-    return _measure(T2_TEMPLATE)
-
-
-def test_t1_templates_exist():
-    for template in (T1_TEMPLATE, T2_TEMPLATE):
+# Ruled writing lines per section on the v2 sheets. They keep the same total
+# line count as v1 but redistribute it: Dominants and Lost Souls were heavily
+# over-allocated (21 lines each on T1) while Heroes/Evil Characters and the
+# Enhancement sections were starved, which is what forced most overflow pages.
+V2_LINE_COUNTS = {
+    T1_TEMPLATE: {
+        "Dominant": 9,
+        "Hero": 24,
+        "GE": 21,
+        "Lost Soul": 9,
+        "Evil Character": 24,
+        "EE": 21,
+        "Artifact": 16,
+        "Fortress": 13,
+        "Misc": 10,
+        "Reserve": 10,
+    },
+    T2_TEMPLATE: {
+        "Dominant": 19,
+        "Hero": 21,
+        "GE": 13,
+        "Lost Soul": 19,
+        "Evil Character": 21,
+        "EE": 13,
+        "Artifact": 13,
+        "Fortress": 11,
+        "Misc": 6,
+        "Reserve": 20,
+    },
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def repo_cwd():
+    """Template paths in the registry are relative to the repository root."""
+    previous = os.getcwd()
+    os.chdir(REPO_ROOT)
+    yield
+    os.chdir(previous)
+
+
+def test_templates_exist():
+    for template in set(DECK_TEMPLATES.values()):
         assert os.path.exists(os.path.join(REPO_ROOT, template)), template
 
 
-@pytest.mark.parametrize("section", sorted(T1_SECTION_LIMITS))
-def test_t1_section_limit_matches_template(section, t1_geometry):
-    """Every T1 limit equals the ruled lines that section has on the sheet."""
-    assert t1_geometry[section] == T1_SECTION_LIMITS[section], (
-        f"T1 '{section}': template has {t1_geometry[section]} ruled lines but "
-        f"T1_SECTION_LIMITS says {T1_SECTION_LIMITS[section]}. Re-measure the "
-        f"template and update the constant."
-    )
+def test_unknown_deck_type_is_rejected():
+    with pytest.raises(AssertionError):
+        template_for_deck_type("type_3")
 
 
-@pytest.mark.parametrize("section", sorted(T2_SECTION_LIMITS))
-def test_t2_section_limit_matches_template(section, t2_geometry):
-    """Every T2 limit equals the ruled lines that section has on the sheet."""
-    assert t2_geometry[section] == T2_SECTION_LIMITS[section], (
-        f"T2 '{section}': template has {t2_geometry[section]} ruled lines but "
-        f"T2_SECTION_LIMITS says {T2_SECTION_LIMITS[section]}. Re-measure the "
-        f"template and update the constant."
+@pytest.mark.parametrize("template", sorted(V2_LINE_COUNTS))
+def test_section_limits_match_template(template):
+    """Every limit equals the ruled lines that section has on the sheet."""
+    layout = template_layout(template)
+    assert layout.limits == section_line_counts(template)
+    assert layout.limits == V2_LINE_COUNTS[template], (
+        f"{template}: measured {layout.limits}. The template changed; check "
+        f"the new sheet by hand and update V2_LINE_COUNTS."
     )
 
 
-def test_reserve_line_limits_match_templates(t1_geometry, t2_geometry):
-    """The Reserve boxes hold exactly the number of lines the code assumes."""
-    assert t1_geometry["Reserve"] == T1_RESERVE_LINE_LIMIT
-    assert t2_geometry["Reserve"] == T2_RESERVE_LINE_LIMIT
-
-
-def test_reserve_boxes_hold_a_full_legal_reserve(t1_geometry, t2_geometry):
+def test_reserve_boxes_hold_a_full_legal_reserve():
     """
     A legal reserve must fit on the sheet: 10 cards for T1/paragon, 20 for T2.
     If a template ever shrinks these, reserve cards get routed to an overflow
-    page (T2) or drawn off the bottom edge (T1).
+    page.
     """
-    assert t1_geometry["Reserve"] >= 10
-    assert t2_geometry["Reserve"] >= 20
+    assert template_layout(template_for_deck_type("type_1")).limits["Reserve"] >= 10
+    assert template_layout(template_for_deck_type("type_2")).limits["Reserve"] >= 20
+
+
+@pytest.mark.parametrize("template", sorted(V2_LINE_COUNTS))
+def test_every_section_has_a_position(template):
+    """Lists and counts are located for every section, inside the page."""
+    layout = template_layout(template)
+    for section in SHEET_SECTIONS + ["Reserve"]:
+        for x, y in (layout.lists[section], layout.counts[section]):
+            assert 0 < x < layout.width and 0 < y < layout.height
+        # A section's count sits in its heading, above its first card line.
+        assert layout.counts[section][1] < layout.lists[section][1]
+
+
+def test_layouts_are_measured_once():
+    assert template_layout(T1_TEMPLATE) is template_layout(T1_TEMPLATE)
 
 
-def test_every_section_is_measurable(t1_geometry, t2_geometry):
-    """A silently-empty measurement would make the assertions above vacuous."""
-    for geometry, limits in ((t1_geometry, T1_SECTION_LIMITS),
-                             (t2_geometry, T2_SECTION_LIMITS)):
-        assert set(limits).issubset(geometry)
-        assert all(geometry[section] > 0 for section in limits)
+def test_t2_header_is_offset_from_t1():
+    """The v2 T2 sheet's header block sits 5pt right of and below T1's."""
+    t1 = template_layout(T1_TEMPLATE).labels
+    t2 = template_layout(T2_TEMPLATE).labels
+    for label, (x, y) in t1.items():
+        assert t2[label] == pytest.approx((x + 5, y + 5))
@@ -0,0 +1,129 @@
+"""Tests for build_sheet_layout, the single bucket/sort/count pass that the
+deck check sheet draws from. The printed section totals must always agree
+with the cards listed in each section. Also covers the per-process template
+cache make_pdf merges onto and the card layer cache that lets a regenerated
+sheet redraw only its header.
+"""
+
+import io
+import os
+import sys
+
+from PyPDF2 import PageObject, PdfReader
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities import text_to_pdf
+from src.utilities.text_to_pdf import (
+    SHEET_SECTIONS,
+    T1_TEMPLATE,
+    build_sheet_layout,
+    load_template,
+    make_pdf,
+    template_copy,
+)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+def card(type, quantity=1, alignment="Neutral"):
+    return {"type": type, "quantity": quantity, "alignment": alignment}
+
+
+def test_cards_bucketed_sorted_and_totalled_per_section():
+    main_deck = {
+        "B Hero": card("Hero", 2, "Good"),
+        "A Hero": card("Hero", 1, "Good"),
+        "Ark": card("Artifact", 1),
+        "Altar": card("Curse", 3, "Evil"),
+        "Token": card("Hero Token", 1, "Good"),
+    }
+    layout = build_sheet_layout(main_deck, {}, "name")
+
+    assert [name for name, _ in layout["sections"]["Hero"]] == ["A Hero", "B Hero"]
+    assert [name for name, _ in layout["sections"]["Artifact"]] == ["Altar", "Ark"]
+    assert [name for name, _ in layout["sections"]["Misc"]] == ["Token"]
+    assert layout["section_totals"]["Hero"] == 3
+    assert layout["section_totals"]["Artifact"] == 4
+    assert layout["total"] == 8
+    assert layout["alignment_totals"] == {"Good": 4, "Evil": 3, "Neutral": 1}
+
+
+def test_section_totals_match_listed_cards():
+    # A card with no type is listed under Misc, so it must only be counted
+    # there (not also in the single-type sections).
+    main_deck = {
+        "Untyped": card("", 2),
+        "Hero": card("Hero", 1),
+        "Lost Soul": card("Lost Soul", 1),
+    }
+    layout = build_sheet_layout(main_deck, {}, "name")
+    for label in SHEET_SECTIONS:
+        listed = sum(data["quantity"] for _, data in layout["sections"][label])
+        assert layout["section_totals"][label] == listed
+    assert layout["section_totals"]["Misc"] == 2
+    assert layout["section_totals"]["Hero"] == 1
+
+
+def test_reserve_sorted_and_totalled():
+    reserve = {"Zeal": card("GE", 2), "Angel": card("Hero", 1)}
+    layout = build_sheet_layout({}, reserve, "name")
+    assert [name for name, _ in layout["reserve"]] == ["Angel", "Zeal"]
+    assert layout["reserve_total"] == 3
+
+
+def test_template_parsed_once_and_never_mutated():
+    template = os.path.join(REPO_ROOT, T1_TEMPLATE)
+    template_page, width, height = load_template(template)
+    assert load_template(template)[0] is template_page
+    original = template_page.get_contents().get_data()
+    original_resources = dict(template_page["/Resources"])
+
+    page = template_copy(template_page)
+    page.merge_page(PageObject.create_blank_page(width=width, height=height))
+
+    assert template_page.get_contents().get_data() == original
+    assert dict(template_page["/Resources"]) == original_resources
+    assert (float(page.mediabox.width), float(page.mediabox.height)) == (width, height)
+
+
+def test_sheet_header_drawn_over_the_deck_listing():
+    deck = {"main_deck": {"Ark": card("Artifact", 2)}, "reserve": {}}
+    pdf = PdfReader(io.BytesIO(make_pdf("type_1", deck, name="Ann", event="Regionals")))
+    text = pdf.pages[0].extract_text()
+    assert "Ann" in text and "Regionals" in text and "2x Ark" in text
+
+
+def test_card_layer_drawn_twice_then_reused(monkeypatch):
+    """The first sheet draws the deck, the second records it, later ones reuse it."""
+    drawn = []
+    draw_card_layer = text_to_pdf.draw_card_layer
+
+    def counting_draw_card_layer(*args, **kwargs):
+        drawn.append(args[1])
+        return draw_card_layer(*args, **kwargs)
+
+    monkeypatch.setattr(text_to_pdf, "draw_card_layer", counting_draw_card_layer)
+    deck = {"main_deck": {"Ark": card("Artifact", 2)}, "reserve": {}}
+
+    texts = []
+    for name in ("Ann", "Anne", "Anna"):
+        pdf = PdfReader(io.BytesIO(make_pdf("type_1", deck, name=name)))
+        texts.append(pdf.pages[0].extract_text())
+    assert len(drawn) == 2
+    assert all(name in text for name, text in zip(("Ann", "Anne", "Anna"), texts))
+    assert all("2x Ark" in text for text in texts)
+
+    make_pdf("type_1", {"main_deck": {"Ark": card("Artifact", 3)}, "reserve": {}})
+    make_pdf("type_1", deck, show_alignment=True)
+    assert len(drawn) == 4
+
+
+def test_card_layer_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(text_to_pdf, "CARD_LAYER_CACHE_SIZE", 2)
+    for quantity in (1, 2, 3):
+        deck = {"main_deck": {"Ark": card("Artifact", quantity)}, "reserve": {}}
+        make_pdf("type_1", deck)
+        make_pdf("type_1", deck)
+    assert len(text_to_pdf._card_layers) == 2
+    assert all(layer is not None for layer in text_to_pdf._card_layers.values())
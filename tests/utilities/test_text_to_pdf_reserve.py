@@ -1,7 +1,7 @@
 """Tests for split_reserve_by_line_count, the helper that prevents the T2
 deck-check PDF from silently drawing reserve cards off the bottom of the
 page. The T2 template's Reserve box only has room for a fixed number of
-printed lines (T2_RESERVE_LINE_LIMIT); anything beyond that must be routed
+printed lines (its measured Reserve limit); anything beyond that must be routed
 to the OVERFLOW page instead of being lost past the physical page edge.
 """
 
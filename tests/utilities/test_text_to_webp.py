@@ -0,0 +1,211 @@
+"""Tests for deck images (make_webp) built from card images."""
+
+import io
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.utilities.text_to_webp import (
+    RESERVE_PADDING,
+    SEPARATOR_HEIGHT,
+    layout_deck_grid,
+    make_webp,
+)
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    # Card images are looked up relative to the repo root.
+    monkeypatch.chdir(REPO_ROOT)
+
+
+def card(imagefile, quantity=1, type="Hero"):
+    return {
+        "type": type,
+        "quantity": quantity,
+        "alignment": "Good",
+        "brigade": "",
+        "imagefile": imagefile,
+    }
+
+
+DECK = {
+    "main_deck": {
+        "Adam (FoM)": card("001-Adam", quantity=3),
+        "Buckler": card("001-Buckler", type="Artifact"),
+    },
+    "reserve": {},
+}
+
+
+def render(**kwargs):
+    with Image.open(io.BytesIO(make_webp("type_1", DECK, **kwargs))) as image:
+        return image.size
+
+
+def test_size_preset_scales_the_deck_image():
+    full_width, full_height = render(n_card_columns=4)
+    quarter_width, quarter_height = render(n_card_columns=4, size="quarter")
+
+    assert quarter_width == pytest.approx(full_width / 4, abs=4)
+    assert quarter_height == pytest.approx(full_height / 4, abs=4)
+
+
+def test_card_width_picks_a_level():
+    assert render(n_card_columns=4, card_width=150) == render(
+        n_card_columns=4, size="half"
+    )
+
+
+def test_card_width_from_json_is_coerced():
+    assert render(n_card_columns=4, card_width="150") == render(
+        n_card_columns=4, size="half"
+    )
+
+
+@pytest.mark.parametrize("card_width", [0, -100, "wide", [150]])
+def test_invalid_card_width_is_rejected(card_width):
+    with pytest.raises(AssertionError):
+        render(card_width=card_width)
+
+
+def test_unknown_size_is_rejected():
+    with pytest.raises(AssertionError):
+        render(size="tiny")
+
+
+def test_reserve_and_counts_share_one_canvas_encoded_once(monkeypatch):
+    saves = []
+    original_save = Image.Image.save
+    monkeypatch.setattr(
+        Image.Image,
+        "save",
+        lambda image, *args, **kwargs: saves.append(image.size)
+        or original_save(image, *args, **kwargs),
+    )
+    deck = {**DECK, "reserve": {"Buckler": card("001-Buckler", type="Artifact")}}
+    webp_bytes = make_webp(
+        "type_1",
+        deck,
+        n_card_columns=4,
+        m_count_value=2.5,
+        is_legal=True,
+        size="quarter",
+    )
+
+    main = layout_deck_grid(deck, "main_deck", 4, level="quarter")
+    reserve = layout_deck_grid(deck, "reserve", 4, level="quarter")
+    separator = SEPARATOR_HEIGHT // 4 + RESERVE_PADDING // 4
+    with Image.open(io.BytesIO(webp_bytes)) as image:
+        assert image.size == (main.width, main.height + separator + reserve.height)
+    assert saves == [image.size]
+
+
+def test_empty_main_deck_makes_no_image():
+    assert make_webp("type_1", {"main_deck": {}, "reserve": {}}) is None
+
+
+def test_taller_card_image_does_not_spill_into_separator(card_image_folder):
+    for name, height in [("Short", 140), ("Tall", 160)]:
+        Image.new("RGB", (100, height), "white").save(
+            card_image_folder / f"{name}.webp", lossless=True
+        )
+    deck = {
+        "main_deck": {"A": card("Short"), "B": card("Tall", type="Lost Soul")},
+        "reserve": {},
+    }
+
+    webp_bytes = make_webp("type_1", deck, m_count_value=1.0, sort_by="name")
+
+    with Image.open(io.BytesIO(webp_bytes)) as image:
+        assert image.height == 140 + 2 * SEPARATOR_HEIGHT
+        # Just below the cards, under the second (taller) card: separator bar,
+        # not card.
+        assert max(image.convert("RGB").getpixel((150, 140))) < 60
+
+
+@pytest.mark.parametrize(
+    "image_format, pil_format",
+    [("webp", "WEBP"), ("jpeg", "JPEG"), ("png", "PNG")],
+)
+@pytest.mark.parametrize("profile", ["preview", "balanced", "archival"])
+def test_every_format_encodes_with_every_profile(image_format, pil_format, profile):
+    image_bytes = make_webp(
+        "type_1", DECK, size="quarter", image_format=image_format, profile=profile
+    )
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        assert image.format == pil_format
+
+
+def test_unknown_format_or_profile_is_rejected():
+    with pytest.raises(AssertionError):
+        make_webp("type_1", DECK, image_format="gif")
+    with pytest.raises(AssertionError):
+        make_webp("type_1", DECK, profile="fastest")
+
+
+def test_numpy_compositor_draws_the_same_pixels():
+    pytest.importorskip("numpy")
+    deck = {**DECK, "reserve": {"Buckler": card("001-Buckler", type="Artifact")}}
+
+    def pixels(compositor):
+        png_bytes = make_webp(
+            "type_1",
+            deck,
+            n_card_columns=3,
+            m_count_value=2.0,
+            is_legal=True,
+            size="quarter",
+            image_format="png",
+            compositor=compositor,
+        )
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            return image.size, image.convert("RGB").tobytes()
+
+    assert pixels("numpy") == pixels("pil")
+
+
+def test_stacked_layout_has_one_tile_per_distinct_card():
+    grid = layout_deck_grid(DECK, "main_deck", 4, level="quarter", layout="stacked")
+    assert sorted(card_key for card_key, _ in grid.cards) == ["Adam (FoM)", "Buckler"]
+
+    stacked_height = render(n_card_columns=1, size="quarter", layout="stacked")[1]
+    grid_height = render(n_card_columns=1, size="quarter")[1]
+    assert stacked_height < grid_height
+
+
+def test_stacked_layout_badges_cards_with_several_copies():
+    def badge_corner(deck):
+        png_bytes = make_webp(
+            "type_1", deck, size="quarter", image_format="png", layout="stacked"
+        )
+        grid = layout_deck_grid(deck, "main_deck", 10, level="quarter")
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            return image.convert("RGB").crop(
+                (
+                    grid.card_width // 2,
+                    grid.card_height // 2,
+                    grid.card_width,
+                    grid.card_height - grid.card_overlap,
+                )
+            )
+
+    single = {"main_deck": {"Adam (FoM)": card("001-Adam")}, "reserve": {}}
+    triple = {"main_deck": {"Adam (FoM)": card("001-Adam", quantity=3)}, "reserve": {}}
+    assert badge_corner(single).tobytes() != badge_corner(triple).tobytes()
+
+
+def test_unknown_layout_is_rejected():
+    with pytest.raises(AssertionError):
+        make_webp("type_1", DECK, layout="fanned")
+
+
+def test_unknown_compositor_is_rejected():
+    with pytest.raises(AssertionError):
+        make_webp("type_1", DECK, compositor="cairo")